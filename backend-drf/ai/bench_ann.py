@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+from index_spec import parse_index_spec
+from rag_pipeline import load_index
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ANN 인덱스 recall/지연 시간 벤치마크 (flat 기준)")
+    parser.add_argument("--index-dir", help="벡터를 가져올 기존 flat 인덱스 경로 (없으면 합성 데이터 사용)")
+    parser.add_argument("--synthetic", type=int, default=200_000, help="합성 벡터 수")
+    parser.add_argument("--dimension", type=int, default=384, help="합성 벡터 차원")
+    parser.add_argument("--queries", type=int, default=1000, help="질의 수")
+    parser.add_argument("--top-k", type=int, default=10, help="검색 결과 수")
+    parser.add_argument(
+        "--spec",
+        action="append",
+        default=[],
+        help="비교할 인덱스 형식 (예: ivf:nlist=1024, ivfpq:nlist=1024,m=32, hnsw:m=32)",
+    )
+    parser.add_argument("--nprobe", default="1,4,16,64", help="IVF nprobe 값 목록")
+    parser.add_argument("--ef-search", default="16,64,256", help="HNSW efSearch 값 목록")
+    return parser.parse_args()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _synthetic_vectors(count: int, dimension: int, rng: np.random.Generator) -> np.ndarray:
+    # 실제 임베딩처럼 군집 구조를 갖도록 중심점 주변에 벡터를 흩뿌린다.
+    centers = rng.standard_normal((max(count // 500, 1), dimension)).astype("float32")
+    assignments = rng.integers(0, len(centers), size=count)
+    noise = rng.standard_normal((count, dimension)).astype("float32") * 0.6
+    return _normalize(centers[assignments] + noise)
+
+
+def _index_vectors(index_dir: Path) -> np.ndarray:
+    artifacts = load_index(index_dir)
+    index = artifacts.index
+    if isinstance(index, faiss.IndexIDMap2):
+        index = faiss.downcast_index(index.index)
+    if not isinstance(index, faiss.IndexFlat):
+        raise SystemExit("벡터 추출은 flat 인덱스에서만 지원합니다.")
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def _recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(row) & set(expected)) for row, expected in zip(found, truth))
+    return hits / truth.size
+
+
+def _timed_search(index: faiss.Index, queries: np.ndarray, top_k: int, params=None) -> tuple[np.ndarray, float]:
+    started = time.perf_counter()
+    _, indices = index.search(queries, top_k, params=params)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return indices, elapsed_ms / len(queries)
+
+
+def main() -> None:
+    args = parse_args()
+    rng = np.random.default_rng(42)
+    if args.index_dir:
+        vectors = _index_vectors(Path(args.index_dir))
+    else:
+        vectors = _synthetic_vectors(args.synthetic, args.dimension, rng)
+    query_rows = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    queries = _normalize(vectors[query_rows] + rng.standard_normal(vectors[query_rows].shape).astype("float32") * 0.05)
+    dimension = vectors.shape[1]
+
+    flat = faiss.IndexFlatIP(dimension)
+    flat.add(vectors)
+    truth, flat_ms = _timed_search(flat, queries, args.top_k)
+    print(f"vectors={len(vectors)} dim={dimension} queries={len(queries)} top_k={args.top_k}")
+    print(f"{'spec':<48} {'param':>14} {'recall':>8} {'ms/query':>10} {'build s':>8}")
+    print(f"{'flat':<48} {'-':>14} {1.0:>8.3f} {flat_ms:>10.3f} {'-':>8}")
+
+    nprobes = [int(value) for value in args.nprobe.split(",") if value]
+    ef_searches = [int(value) for value in args.ef_search.split(",") if value]
+    for raw_spec in args.spec or ["ivf:nlist=1024", "ivfpq:nlist=1024,m=32", "hnsw:m=32"]:
+        spec = parse_index_spec(raw_spec)
+        started = time.perf_counter()
+        index = spec.create(dimension)
+        if spec.needs_training:
+            sample = vectors[rng.choice(len(vectors), size=min(spec.train_size, len(vectors)), replace=False)]
+            index.train(sample)
+        index.add(vectors)
+        build_seconds = time.perf_counter() - started
+        if spec.needs_training:
+            sweep = [(f"nprobe={value}", spec.search_parameters(nprobe=value)) for value in nprobes]
+        elif spec.kind == "hnsw":
+            sweep = [(f"efSearch={value}", spec.search_parameters(ef_search=value)) for value in ef_searches]
+        else:
+            sweep = [("-", None)]
+        for label, params in sweep:
+            found, per_query_ms = _timed_search(index, queries, args.top_k, params)
+            print(
+                f"{spec.build_signature:<48} {label:>14} {_recall(found, truth):>8.3f} "
+                f"{per_query_ms:>10.3f} {build_seconds:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
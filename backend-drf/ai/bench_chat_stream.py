@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+DEFAULT_QUESTIONS = [
+    "근비대에 영향을 주는 주요 변수는 무엇인가요?",
+    "최대산소섭취량을 높이는 훈련 방법은?",
+    "젖산역치와 무산소성 역치의 차이는?",
+    "크레아틴 보충이 근력에 미치는 영향은?",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="/chat/ask 대비 /chat/ask/stream 첫 응답 시간(TTFB) 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="백엔드 주소 (FastAPI/DRF 공통)")
+    parser.add_argument("--user-id", default=os.getenv("BENCH_USER_ID"), help="로그인 아이디")
+    parser.add_argument("--password", default=os.getenv("BENCH_PASSWORD"), help="로그인 비밀번호")
+    parser.add_argument("--questions", help="질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--requests", type=int, default=40, help="엔드포인트별 전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    return parser.parse_args()
+
+
+def _load_questions(path: str | None) -> list[str]:
+    # 검색 벤치마크와 달리 인덱스/모델 없이 HTTP만 쓰므로 ai 모듈을 불러오지 않는다.
+    if not path:
+        return DEFAULT_QUESTIONS
+    with open(path, encoding="utf-8") as file:
+        return [line.strip() for line in file if line.strip()]
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+async def _login(client: httpx.AsyncClient, user_id: str, password: str) -> str:
+    response = await client.post("/auth/login", json={"user_id": user_id, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _ask(client: httpx.AsyncClient, question: str) -> tuple[float, float]:
+    started = time.perf_counter()
+    response = await client.post("/chat/ask", json={"message": question})
+    response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    # 전체 답변이 만들어진 뒤에야 본문이 오므로 첫 글자와 완료 시점이 같다.
+    return elapsed, elapsed
+
+
+async def _ask_stream(client: httpx.AsyncClient, question: str) -> tuple[float, float]:
+    started = time.perf_counter()
+    first_token = None
+    async with client.stream("POST", "/chat/ask/stream", json={"message": question}) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if first_token is None and line.startswith("event: delta"):
+                first_token = time.perf_counter() - started
+            if line.startswith("event: error"):
+                raise RuntimeError("스트리밍 응답 오류")
+    total = time.perf_counter() - started
+    return first_token if first_token is not None else total, total
+
+
+async def _run(args: argparse.Namespace, path: str, questions: list[str], token: str) -> list[tuple[float, float]]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    call = _ask_stream if path.endswith("stream") else _ask
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=args.timeout, limits=limits) as client:
+
+        async def one(number: int) -> tuple[float, float]:
+            async with semaphore:
+                return await call(client, questions[number % len(questions)])
+
+        return await asyncio.gather(*(one(number) for number in range(args.requests)))
+
+
+def _report(path: str, timings: list[tuple[float, float]], wall: float) -> None:
+    first = [value * 1000 for value, _ in timings]
+    total = [value * 1000 for _, value in timings]
+    print(
+        f"{path:>17} {statistics.median(first):>9.0f} {_percentile(first, 95):>9.0f} "
+        f"{statistics.median(total):>10.0f} {_percentile(total, 95):>10.0f} {len(timings) / wall:>8.2f}"
+    )
+
+
+async def main() -> None:
+    args = parse_args()
+    if not args.user_id or not args.password:
+        raise SystemExit("--user-id/--password (또는 BENCH_USER_ID/BENCH_PASSWORD)를 지정하세요.")
+    questions = _load_questions(args.questions)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        token = await _login(client, args.user_id, args.password)
+    print(f"요청 {args.requests}건, 동시 {args.concurrency}건")
+    print(f"{'endpoint':>17} {'TTFB p50':>9} {'TTFB p95':>9} {'total p50':>10} {'total p95':>10} {'req/s':>8}")
+    for path in ("/chat/ask", "/chat/ask/stream"):
+        started = time.perf_counter()
+        timings = await _run(args, path, questions, token)
+        _report(path, timings, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from document_loader import _read_csv
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CSV 로더 벤치마크 (iterrows 방식 대비)")
+    parser.add_argument("--csv", help="측정할 CSV 경로 (없으면 합성 데이터 생성)")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="합성 CSV 행 수")
+    parser.add_argument("--output", default="/tmp/ss-ai-bench.csv", help="합성 CSV 저장 경로")
+    parser.add_argument(
+        "--legacy-rows",
+        type=int,
+        default=50_000,
+        help="iterrows 방식으로 측정할 행 수 (전체 시간은 행 수 비율로 추정)",
+    )
+    return parser.parse_args()
+
+
+def _generate_csv(path: Path, rows: int) -> None:
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        {
+            "subject_id": np.arange(1, rows + 1),
+            "sex": rng.choice(["M", "F"], size=rows),
+            "age": rng.integers(18, 65, size=rows),
+            "vo2max": rng.normal(42, 8, size=rows).round(1),
+            "resting_hr": rng.integers(45, 90, size=rows),
+            "squat_1rm_kg": rng.normal(110, 30, size=rows).round(1),
+            "protocol": rng.choice(["HIIT", "지속주", "저항운동", "복합"], size=rows),
+        }
+    )
+    df.to_csv(path, index=False)
+
+
+def _legacy_read_csv(df: pd.DataFrame) -> str:
+    lines = []
+    for _, row in df.iterrows():
+        parts = [f"{col}: {row[col]}" for col in df.columns]
+        lines.append(" | ".join(parts))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    args = parse_args()
+    path = Path(args.csv) if args.csv else Path(args.output)
+    if not args.csv:
+        _generate_csv(path, args.rows)
+
+    started = time.perf_counter()
+    documents = 0
+    chars = 0
+    for document in _read_csv(path):
+        documents += 1
+        chars += len(document.text)
+    vectorized_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    df = pd.read_csv(path)
+    read_seconds = time.perf_counter() - started
+    sample = df.head(args.legacy_rows)
+    started = time.perf_counter()
+    _legacy_read_csv(sample)
+    legacy_seconds = (time.perf_counter() - started) * len(df) / max(len(sample), 1) + read_seconds
+
+    print(f"파일 {path} ({path.stat().st_size / 1024 / 1024:.1f} MiB, {len(df)}행 x {len(df.columns)}열)")
+    print(f"iterrows (추정, {len(sample)}행 측정): {legacy_seconds:>8.2f}초 ({len(df) / legacy_seconds:,.0f}행/초)")
+    print(f"벡터화 + 청크 읽기:        {vectorized_seconds:>8.2f}초 ({len(df) / vectorized_seconds:,.0f}행/초)")
+    print(f"속도 향상: {legacy_seconds / vectorized_seconds:.1f}x, 문서 {documents}개, 평균 {chars / max(documents, 1):.0f}자")
+
+
+if __name__ == "__main__":
+    main()
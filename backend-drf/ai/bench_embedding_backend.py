@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from embedding_backends import DEFAULT_BACKEND, EMBEDDING_BACKENDS
+from model_registry import get_model
+from rag_pipeline import embed_texts, load_index
+
+
+def parse_args() -> argparse.Namespace:
+    default_index_dir = Path(__file__).resolve().parent / "index"
+    parser = argparse.ArgumentParser(description="임베딩 백엔드별 CPU 처리량과 PyTorch 대비 임베딩 차이 벤치마크")
+    parser.add_argument("--index-dir", default=str(default_index_dir), help="샘플 청크를 가져올 인덱스 경로")
+    parser.add_argument("--model", help="임베딩 모델 (기본: 인덱스에 기록된 모델)")
+    parser.add_argument("--backends", default=",".join(EMBEDDING_BACKENDS), help="비교할 백엔드 목록")
+    parser.add_argument("--samples", type=int, default=512, help="측정에 쓸 청크 수")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--top-k", type=int, default=4, help="이웃 일치율을 잴 k")
+    return parser.parse_args()
+
+
+def _top_k(embeddings: np.ndarray, k: int) -> np.ndarray:
+    scores = embeddings @ embeddings.T
+    np.fill_diagonal(scores, -np.inf)
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def main() -> None:
+    args = parse_args()
+    artifacts = load_index(Path(args.index_dir))
+    model_name = args.model or artifacts.model_name
+    texts = [chunk.text for _, chunk in artifacts.chunks.items()][: args.samples]
+    if not texts:
+        raise SystemExit("인덱스에 청크가 없습니다.")
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    if DEFAULT_BACKEND not in backends:
+        backends.insert(0, DEFAULT_BACKEND)
+
+    results: dict[str, tuple[float, np.ndarray]] = {}
+    for backend in backends:
+        try:
+            model = get_model(model_name, backend)
+        except (ImportError, RuntimeError, ValueError) as exc:
+            print(f"{backend}: 건너뜀 ({exc})")
+            continue
+        embed_texts(model, texts[: args.batch_size], is_query=False, batch_size=args.batch_size)
+        started = time.perf_counter()
+        embeddings = embed_texts(model, texts, is_query=False, batch_size=args.batch_size)
+        results[backend] = (len(texts) / (time.perf_counter() - started), embeddings)
+
+    _, reference = results[DEFAULT_BACKEND]
+    reference_neighbors = _top_k(reference, args.top_k)
+    print(f"모델 {model_name}, 청크 {len(texts)}개, 배치 {args.batch_size}")
+    print(f"{'backend':>11} {'texts/s':>9} {'speedup':>8} {'cos mean':>9} {'cos p1':>8} {'cos min':>8} {f'top{args.top_k} 일치':>9}")
+    for backend, (throughput, embeddings) in results.items():
+        # 두 임베딩 모두 정규화되어 있으므로 내적이 곧 코사인 유사도다.
+        cosine = np.sum(reference * embeddings, axis=1)
+        neighbors = _top_k(embeddings, args.top_k)
+        overlap = np.mean(
+            [len(set(left) & set(right)) / args.top_k for left, right in zip(reference_neighbors, neighbors)]
+        )
+        print(
+            f"{backend:>11} {throughput:>9.1f} {throughput / results[DEFAULT_BACKEND][0]:>7.2f}x "
+            f"{cosine.mean():>9.5f} {np.percentile(cosine, 1):>8.5f} {cosine.min():>8.5f} {overlap:>9.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
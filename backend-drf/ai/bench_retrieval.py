@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+from retrieval_service import RetrievalService
+
+DEFAULT_QUESTIONS = [
+    "근비대에 영향을 주는 주요 변수는 무엇인가요?",
+    "최대산소섭취량을 높이는 훈련 방법은?",
+    "젖산역치와 무산소성 역치의 차이는?",
+    "고강도 인터벌 트레이닝의 생리적 적응은?",
+    "ACL 재건술 후 재활 단계별 운동은?",
+    "크레아틴 보충이 근력에 미치는 영향은?",
+    "회복을 위한 수면 시간 권장량은?",
+    "플라이오메트릭 훈련의 부상 위험 요인은?",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    default_index_dir = Path(__file__).resolve().parent / "index"
+    parser = argparse.ArgumentParser(description="검색 지연 시간 벤치마크")
+    parser.add_argument("--index-dir", default=str(default_index_dir), help="인덱스 경로")
+    parser.add_argument("--questions", help="질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--top-k", type=int, default=4, help="검색 결과 수")
+    parser.add_argument("--runs", type=int, default=200, help="측정 횟수")
+    parser.add_argument("--budget-ms", type=float, default=20.0, help="p95 허용 지연 (ms)")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="질의 임베딩/검색 결과 캐시 크기 (기본 0: 같은 질문 반복이 캐시 적중으로 측정되지 않도록 끔)",
+    )
+    return parser.parse_args()
+
+
+def _load_questions(path: str | None) -> list[str]:
+    if not path:
+        return DEFAULT_QUESTIONS
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [line.strip() for line in lines if line.strip()]
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+def main() -> None:
+    args = parse_args()
+    questions = _load_questions(args.questions)
+    service = RetrievalService(Path(args.index_dir), cache_size=args.cache_size)
+    if not service.warm():
+        raise SystemExit("인덱스가 없습니다. ingest.py로 먼저 인덱스를 생성하세요.")
+    for question in questions:
+        service.search(question, top_k=args.top_k)
+
+    latencies: list[float] = []
+    for run in range(args.runs):
+        question = questions[run % len(questions)]
+        started = time.perf_counter()
+        service.search(question, top_k=args.top_k)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    p50 = statistics.median(latencies)
+    p95 = _percentile(latencies, 95)
+    p99 = _percentile(latencies, 99)
+    print(f"runs={args.runs} top_k={args.top_k} version={service.version}")
+    print(f"p50={p50:.2f}ms p95={p95:.2f}ms p99={p99:.2f}ms max={max(latencies):.2f}ms")
+    if p95 > args.budget_ms:
+        raise SystemExit(f"p95 {p95:.2f}ms가 예산 {args.budget_ms:.2f}ms를 초과했습니다.")
+
+
+if __name__ == "__main__":
+    main()
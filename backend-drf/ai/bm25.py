@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+TERM_STARTS_FILE = "bm25.term_starts.npy"
+POSTINGS_FILE = "bm25.postings.npy"
+FREQUENCIES_FILE = "bm25.frequencies.npy"
+WEIGHTS_FILE = "bm25.weights.npy"
+DOC_IDS_FILE = "bm25.doc_ids.npy"
+DOC_LENGTHS_FILE = "bm25.doc_lengths.npy"
+VOCAB_FILE = "bm25.vocab.bin"
+VOCAB_OFFSETS_FILE = "bm25.vocab_offsets.npy"
+META_FILE = "bm25.json"
+LEGACY_ARRAYS_FILE = "bm25.npz"
+LEGACY_TERMS_FILE = "bm25.terms.json"
+TOKEN_RE = re.compile(r"[가-힣]+|[a-z0-9]+(?:[.\-][a-z0-9]+)*")
+HANGUL_RE = re.compile(r"[가-힣]+")
+# 형태소 분석기 없이 어절 끝의 조사를 떼어 "근비대의/근비대는"이 같은 어간으로 모이게 한다. 긴 조사부터 확인한다.
+JOSA_SUFFIXES = sorted(
+    [
+        "으로써", "으로서", "에서는", "에게서", "이라는", "으로는", "에서도",
+        "으로", "에서", "에게", "까지", "부터", "보다", "처럼", "만큼", "이나", "이며", "라는", "과의", "와의", "에는",
+        "의", "은", "는", "이", "가", "을", "를", "에", "와", "과", "도", "만", "로",
+    ],
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_josa(word: str) -> str:
+    for suffix in JOSA_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[: -len(suffix)]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    # 영문/숫자 용어(VO2max, ACL, HIIT)는 소문자 그대로, 한글 어절은 조사를 떼고 음절 bigram을 더해
+    # 띄어쓰기가 달라도("근 비대"/"근비대") 부분 일치가 점수에 반영되게 한다.
+    tokens: list[str] = []
+    for word in TOKEN_RE.findall(text.lower()):
+        if not HANGUL_RE.fullmatch(word):
+            tokens.append(word)
+            continue
+        if word in JOSA_SUFFIXES:
+            continue
+        stem = _strip_josa(word)
+        tokens.append(stem)
+        if len(stem) >= 3:
+            tokens.extend(stem[position : position + 2] for position in range(len(stem) - 1))
+    return tokens
+
+
+def _load_array(path: Path) -> np.ndarray:
+    array_ = np.load(path, mmap_mode="r")
+    return array_ if array_.size else np.load(path)
+
+
+class Vocabulary:
+    # 정렬된 용어를 UTF-8로 이어 붙여 두고 이진 탐색으로 용어 번호를 찾는다. 저장본은 mmap으로 열어 어휘를 메모리에 올리지 않는다.
+    def __init__(self, blob: mmap.mmap | bytes, offsets: np.ndarray) -> None:
+        self._blob = blob
+        self._offsets = offsets
+
+    @classmethod
+    def from_terms(cls, terms: list[str]) -> Vocabulary:
+        encoded = [term.encode("utf-8") for term in terms]
+        offsets = np.zeros(len(encoded) + 1, dtype="int64")
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets)
+
+    @classmethod
+    def open(cls, directory: Path) -> Vocabulary:
+        blob: mmap.mmap | bytes = b""
+        vocab_path = directory / VOCAB_FILE
+        if vocab_path.stat().st_size:
+            with vocab_path.open("rb") as file:
+                blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(blob, _load_array(directory / VOCAB_OFFSETS_FILE))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, position: int) -> str:
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        start, stop = int(self._offsets[position]), int(self._offsets[position + 1])
+        return bytes(self._blob[start:stop]).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[position] for position in range(len(self)))
+
+    def get(self, term: str) -> int | None:
+        position = bisect_left(self, term)
+        return position if position < len(self) and self[position] == term else None
+
+    def write(self, directory: Path) -> None:
+        (directory / VOCAB_FILE).write_bytes(bytes(self._blob))
+        np.save(directory / VOCAB_OFFSETS_FILE, self._offsets)
+
+
+class BM25Index:
+    def __init__(
+        self,
+        terms: Vocabulary,
+        term_starts: np.ndarray,
+        postings: np.ndarray,
+        frequencies: np.ndarray,
+        doc_ids: np.ndarray,
+        doc_lengths: np.ndarray,
+        *,
+        next_id: int,
+        k1: float = 1.2,
+        b: float = 0.75,
+        weights: np.ndarray | None = None,
+    ) -> None:
+        self.terms = terms
+        self.term_starts = term_starts
+        self.postings = postings
+        self.frequencies = frequencies
+        self.doc_ids = doc_ids
+        self.doc_lengths = doc_lengths
+        self.next_id = next_id
+        self.k1 = k1
+        self.b = b
+        # 저장된 인덱스는 가중치도 저장본을 mmap으로 쓰고, 새로 만든 인덱스만 계산한다.
+        self.weights = weights if weights is not None else self._weights()
+
+    def __len__(self) -> int:
+        return int(self.doc_ids.size)
+
+    def _weights(self) -> np.ndarray:
+        # 질의 때는 포스팅 가중치를 더하기만 하도록 idf와 문서 길이 정규화를 미리 곱해 둔다.
+        if not self.postings.size:
+            return np.zeros(0, dtype="float32")
+        doc_count = len(self)
+        document_frequency = np.diff(self.term_starts)
+        idf = np.log1p((doc_count - document_frequency + 0.5) / (document_frequency + 0.5))
+        posting_idf = np.repeat(idf, document_frequency)
+        lengths = self.doc_lengths[self.postings].astype("float64")
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(float(self.doc_lengths.mean()), 1.0))
+        frequencies = self.frequencies.astype("float64")
+        return (posting_idf * frequencies * (self.k1 + 1) / (frequencies + norm)).astype("float32")
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[tuple[int, str]],
+        *,
+        next_id: int,
+        base: BM25Index | None = None,
+        keep_ids: np.ndarray | None = None,
+    ) -> BM25Index:
+        # base가 있으면 keep_ids에 남은 문서의 포스팅은 그대로 쓰고, documents로 받은 새 문서만 토큰화한다.
+        builder = BM25Builder(base)
+        builder.add(documents)
+        return builder.build(next_id=next_id, keep_ids=keep_ids)
+
+    @classmethod
+    def _from_postings(
+        cls,
+        terms: list[str],
+        posting_terms: np.ndarray,
+        posting_docs: np.ndarray,
+        frequencies: np.ndarray,
+        doc_ids: np.ndarray,
+        doc_lengths: np.ndarray,
+        *,
+        next_id: int,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> BM25Index:
+        posting_terms = posting_terms.astype("int64")
+        counts = np.bincount(posting_terms, minlength=len(terms))
+        # 문서가 모두 빠진 용어는 어휘에서 제거해 증분 실행이 반복되어도 어휘가 계속 늘지 않게 한다.
+        used = np.flatnonzero(counts)
+        # 어휘를 정렬된 순서로 저장해야 이진 탐색으로 찾을 수 있으므로 용어 번호를 정렬 순서로 다시 매긴다.
+        used = used[sorted(range(len(used)), key=lambda position: terms[used[position]])]
+        renumbered = np.full(len(terms), -1, dtype="int64")
+        renumbered[used] = np.arange(len(used))
+        posting_terms = renumbered[posting_terms]
+        posting_docs = posting_docs.astype("int32")
+        order = np.lexsort((posting_docs, posting_terms))
+        term_starts = np.zeros(len(used) + 1, dtype="int64")
+        np.cumsum(counts[used], out=term_starts[1:])
+        return cls(
+            Vocabulary.from_terms([terms[term_id] for term_id in used.tolist()]),
+            term_starts,
+            posting_docs[order],
+            frequencies.astype("int32")[order],
+            doc_ids.astype("int64"),
+            doc_lengths.astype("int32"),
+            next_id=next_id,
+            k1=k1,
+            b=b,
+        )
+
+    def search(self, query: str, top_n: int) -> list[tuple[int, float]]:
+        slices = []
+        for term, count in Counter(tokenize(query)).items():
+            term_id = self.terms.get(term)
+            if term_id is not None:
+                slices.append((self.term_starts[term_id], self.term_starts[term_id + 1], count))
+        if not slices:
+            return []
+        docs = np.concatenate([self.postings[start:stop] for start, stop, _ in slices])
+        weights = np.concatenate([self.weights[start:stop] * count for start, stop, count in slices])
+        # 질의 용어의 포스팅만 모아 문서별로 합산하므로 전체 문서 수가 아닌 포스팅 길이에 비례한다.
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        top_n = min(top_n, scores.size)
+        best = np.argpartition(-scores, top_n - 1)[:top_n]
+        best = best[np.argsort(-scores[best])]
+        return [(int(self.doc_ids[unique_docs[position]]), float(scores[position])) for position in best]
+
+    def write(self, directory: Path) -> None:
+        # 배열마다 .npy로 따로 저장해 load에서 mmap으로 열 수 있게 한다(npz는 mmap이 되지 않는다).
+        self.terms.write(directory)
+        np.save(directory / TERM_STARTS_FILE, self.term_starts)
+        np.save(directory / POSTINGS_FILE, self.postings)
+        np.save(directory / FREQUENCIES_FILE, self.frequencies)
+        np.save(directory / WEIGHTS_FILE, self.weights)
+        np.save(directory / DOC_IDS_FILE, self.doc_ids)
+        np.save(directory / DOC_LENGTHS_FILE, self.doc_lengths)
+        meta = {"next_id": self.next_id, "k1": self.k1, "b": self.b}
+        (directory / META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: Path) -> BM25Index | None:
+        if not (directory / META_FILE).exists():
+            return cls._load_legacy(directory)
+        meta = json.loads((directory / META_FILE).read_text(encoding="utf-8"))
+        return cls(
+            Vocabulary.open(directory),
+            _load_array(directory / TERM_STARTS_FILE),
+            _load_array(directory / POSTINGS_FILE),
+            _load_array(directory / FREQUENCIES_FILE),
+            _load_array(directory / DOC_IDS_FILE),
+            _load_array(directory / DOC_LENGTHS_FILE),
+            next_id=int(meta["next_id"]),
+            k1=float(meta["k1"]),
+            b=float(meta["b"]),
+            weights=_load_array(directory / WEIGHTS_FILE),
+        )
+
+    @classmethod
+    def _load_legacy(cls, directory: Path) -> BM25Index | None:
+        # 이전 형식(bm25.npz, 저장 순서 어휘)은 메모리에 읽어 어휘를 정렬하고, 다음 저장부터 새 형식으로 기록된다.
+        if not (directory / LEGACY_ARRAYS_FILE).exists():
+            return None
+        meta = json.loads((directory / LEGACY_TERMS_FILE).read_text(encoding="utf-8"))
+        with np.load(directory / LEGACY_ARRAYS_FILE) as arrays:
+            term_starts = arrays["term_starts"]
+            return cls._from_postings(
+                meta["terms"],
+                np.repeat(np.arange(len(meta["terms"])), np.diff(term_starts)),
+                arrays["postings"],
+                arrays["frequencies"],
+                arrays["doc_ids"],
+                arrays["doc_lengths"],
+                next_id=int(meta["next_id"]),
+                k1=float(meta.get("k1", 1.2)),
+                b=float(meta.get("b", 0.75)),
+            )
+
+
+class BM25Builder:
+    # 인덱싱 배치마다 새 청크를 토큰화해 포스팅을 배치별 numpy 배열로 쌓아 두고, 저장 시 base와 합쳐 BM25Index를 만든다.
+    # 저장 시점에 새 청크 본문을 다시 읽어 토큰화하지 않고, 토큰 목록도 배치 하나 분량만 메모리에 둔다.
+    def __init__(self, base: BM25Index | None = None) -> None:
+        self.base = base if base is not None and len(base) else None
+        self.base_next_id = base.next_id if base is not None else 0
+        self.terms: list[str] = list(self.base.terms) if self.base is not None else []
+        self.term_ids = {term: position for position, term in enumerate(self.terms)}
+        # (용어 번호, 배치 안 문서 위치, 빈도, 문서 id, 문서 길이)
+        self._batches: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+
+    def add(self, documents: Iterable[tuple[int, str]]) -> None:
+        posting_terms: list[int] = []
+        posting_docs: list[int] = []
+        frequencies: list[int] = []
+        doc_ids: list[int] = []
+        doc_lengths: list[int] = []
+        for chunk_id, text in documents:
+            tokens = tokenize(text)
+            for term, frequency in Counter(tokens).items():
+                term_id = self.term_ids.get(term)
+                if term_id is None:
+                    term_id = self.term_ids[term] = len(self.terms)
+                    self.terms.append(term)
+                posting_terms.append(term_id)
+                posting_docs.append(len(doc_ids))
+                frequencies.append(frequency)
+            doc_ids.append(chunk_id)
+            doc_lengths.append(len(tokens))
+        if doc_ids:
+            self._batches.append(
+                (
+                    np.asarray(posting_terms, dtype="int32"),
+                    np.asarray(posting_docs, dtype="int32"),
+                    np.asarray(frequencies, dtype="int32"),
+                    np.asarray(doc_ids, dtype="int64"),
+                    np.asarray(doc_lengths, dtype="int32"),
+                )
+            )
+
+    def doc_ids(self) -> np.ndarray:
+        if not self._batches:
+            return np.zeros(0, dtype="int64")
+        return np.concatenate([batch[3] for batch in self._batches])
+
+    def build(self, *, next_id: int, keep_ids: np.ndarray | None = None) -> BM25Index:
+        # 포스팅을 청크 id 기준으로 모은 뒤 keep_ids에 없는 문서(삭제된 청크)를 걸러내고 문서 위치를 다시 매긴다.
+        posting_terms: list[np.ndarray] = []
+        posting_chunks: list[np.ndarray] = []
+        frequencies: list[np.ndarray] = []
+        doc_ids: list[np.ndarray] = []
+        doc_lengths: list[np.ndarray] = []
+        if self.base is not None:
+            base = self.base
+            posting_terms.append(np.repeat(np.arange(len(base.terms)), np.diff(base.term_starts)))
+            posting_chunks.append(base.doc_ids[base.postings])
+            frequencies.append(np.asarray(base.frequencies))
+            doc_ids.append(np.asarray(base.doc_ids))
+            doc_lengths.append(np.asarray(base.doc_lengths))
+        for batch_terms, batch_docs, batch_frequencies, batch_ids, batch_lengths in self._batches:
+            posting_terms.append(batch_terms)
+            posting_chunks.append(batch_ids[batch_docs])
+            frequencies.append(batch_frequencies)
+            doc_ids.append(batch_ids)
+            doc_lengths.append(batch_lengths)
+        all_terms = np.concatenate(posting_terms).astype("int64") if posting_terms else np.zeros(0, dtype="int64")
+        all_chunks = np.concatenate(posting_chunks) if posting_chunks else np.zeros(0, dtype="int64")
+        all_frequencies = np.concatenate(frequencies) if frequencies else np.zeros(0, dtype="int32")
+        all_ids = np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype="int64")
+        all_lengths = np.concatenate(doc_lengths) if doc_lengths else np.zeros(0, dtype="int32")
+        if keep_ids is not None:
+            kept = np.isin(all_ids, keep_ids)
+            all_ids = all_ids[kept]
+            all_lengths = all_lengths[kept]
+            posting_kept = np.isin(all_chunks, all_ids)
+            all_terms = all_terms[posting_kept]
+            all_chunks = all_chunks[posting_kept]
+            all_frequencies = all_frequencies[posting_kept]
+        order = np.argsort(all_ids, kind="stable")
+        positions = order[np.searchsorted(all_ids, all_chunks, sorter=order)] if all_chunks.size else all_chunks
+        return BM25Index._from_postings(
+            self.terms,
+            all_terms,
+            positions,
+            all_frequencies,
+            all_ids,
+            all_lengths,
+            next_id=next_id,
+        )
+
+
+def reciprocal_rank_fusion(rankings: Iterable[list[int]], *, k: int = 60) -> list[int]:
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
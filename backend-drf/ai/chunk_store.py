@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import tempfile
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+import numpy as np
+
+from dedupe import simhash
+
+IDS_FILE = "chunks.ids.npy"
+STARTS_FILE = "chunks.starts.npy"
+LENGTHS_FILE = "chunks.lengths.npy"
+SOURCE_IDS_FILE = "chunks.source_ids.npy"
+SOURCES_FILE = "chunks.sources.json"
+TEXT_FILE = "chunks.text.bin"
+FINGERPRINTS_FILE = "chunks.simhash.npy"
+
+
+@dataclass
+class DocumentChunk:
+    text: str
+    source: str
+
+
+def _load_array(path: Path) -> np.ndarray:
+    array_ = np.load(path, mmap_mode="r")
+    return array_ if array_.size else np.load(path)
+
+
+class ChunkStore:
+    def __init__(self, directory: Path) -> None:
+        self._ids = _load_array(directory / IDS_FILE)
+        self._starts = _load_array(directory / STARTS_FILE)
+        self._lengths = _load_array(directory / LENGTHS_FILE)
+        self._source_ids = _load_array(directory / SOURCE_IDS_FILE)
+        self._sources: list[str] = json.loads((directory / SOURCES_FILE).read_text(encoding="utf-8"))
+        # 근접 중복 제거용 SimHash 지문. 이전 형식 저장본에는 없으며 다음 저장 때 채워진다.
+        fingerprints_path = directory / FINGERPRINTS_FILE
+        self._fingerprints = _load_array(fingerprints_path) if fingerprints_path.exists() else None
+        text_path = directory / TEXT_FILE
+        self._blob: mmap.mmap | bytes = b""
+        if text_path.stat().st_size:
+            with text_path.open("rb") as file:
+                self._blob = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def exists(directory: Path) -> bool:
+        return (directory / IDS_FILE).exists()
+
+    def __len__(self) -> int:
+        return int(self._ids.size)
+
+    def max_id(self) -> int:
+        return int(self._ids[-1]) if self._ids.size else -1
+
+    def ids(self) -> np.ndarray:
+        return np.asarray(self._ids, dtype="int64")
+
+    def _position(self, chunk_id: int) -> int | None:
+        position = int(np.searchsorted(self._ids, chunk_id))
+        if position < self._ids.size and int(self._ids[position]) == chunk_id:
+            return position
+        return None
+
+    def _chunk_at(self, position: int) -> DocumentChunk:
+        start = int(self._starts[position])
+        end = start + int(self._lengths[position])
+        text = self._blob[start:end].decode("utf-8")
+        return DocumentChunk(text=text, source=self._sources[int(self._source_ids[position])])
+
+    def get(self, chunk_id: int) -> DocumentChunk | None:
+        position = self._position(chunk_id)
+        return self._chunk_at(position) if position is not None else None
+
+    def items(self) -> Iterator[tuple[int, DocumentChunk]]:
+        for position in range(self._ids.size):
+            yield int(self._ids[position]), self._chunk_at(position)
+
+    def fingerprint_at(self, position: int) -> int | None:
+        return int(self._fingerprints[position]) if self._fingerprints is not None else None
+
+    def fingerprints(self, chunk_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # (지문, 저장된 지문이 있는지)를 chunk_ids 순서로 돌려준다. 본문을 읽지 않고 배열에서 한 번에 찾는다.
+        found = np.zeros(len(chunk_ids), dtype="uint64")
+        if self._fingerprints is None or not self._ids.size:
+            return found, np.zeros(len(chunk_ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(self._ids, chunk_ids), self._ids.size - 1)
+        known = self._ids[positions] == chunk_ids
+        found[known] = self._fingerprints[positions[known]]
+        return found, known
+
+
+class ChunkStoreWriter:
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self._ids = array("q")
+        self._starts = array("q")
+        self._lengths = array("q")
+        self._source_ids = array("i")
+        self._fingerprints = array("Q")
+        self._sources: dict[str, int] = {}
+        self._offset = 0
+        self._text_file = (directory / TEXT_FILE).open("wb")
+
+    def append(self, chunk_id: int, chunk: DocumentChunk, *, fingerprint: int | None = None) -> None:
+        # 지문을 모르는 청크(중복 제거를 끈 실행, 이전 형식 저장본)만 여기서 계산한다.
+        self._fingerprints.append(simhash(chunk.text) if fingerprint is None else fingerprint)
+        encoded = chunk.text.encode("utf-8")
+        self._text_file.write(encoded)
+        self._ids.append(chunk_id)
+        self._starts.append(self._offset)
+        self._lengths.append(len(encoded))
+        self._source_ids.append(self._sources.setdefault(chunk.source, len(self._sources)))
+        self._offset += len(encoded)
+
+    def close(self) -> None:
+        self._text_file.close()
+        ids = np.frombuffer(self._ids, dtype="int64")
+        order = np.argsort(ids, kind="stable")
+        # 본문은 쓴 순서 그대로 두고 id 순으로 정렬한 오프셋만 저장해 이진 탐색으로 찾는다.
+        np.save(self.directory / IDS_FILE, ids[order])
+        np.save(self.directory / STARTS_FILE, np.frombuffer(self._starts, dtype="int64")[order])
+        np.save(self.directory / LENGTHS_FILE, np.frombuffer(self._lengths, dtype="int64")[order])
+        np.save(self.directory / SOURCE_IDS_FILE, np.frombuffer(self._source_ids, dtype="int32")[order])
+        np.save(self.directory / FINGERPRINTS_FILE, np.frombuffer(self._fingerprints, dtype="uint64")[order])
+        sources = sorted(self._sources, key=self._sources.__getitem__)
+        (self.directory / SOURCES_FILE).write_text(json.dumps(sources, ensure_ascii=False), encoding="utf-8")
+
+
+class ChunkTable:
+    # 새로 추가한 청크 본문은 임시 파일에 이어 쓰고 오프셋만 들고 있어, 인덱싱 중 메모리가 추가한 청크 수만큼 늘지 않는다.
+    def __init__(self, base: ChunkStore | None = None) -> None:
+        self._base = base
+        self._removed: set[int] = set()
+        self._spool: BinaryIO | None = None
+        self._spool_offset = 0
+        self._spool_dirty = False
+        self._added_ids = array("q")
+        self._added_starts = array("q")
+        self._added_lengths = array("q")
+        self._added_source_ids = array("i")
+        self._added_fingerprints = array("Q")
+        self._added_fingerprint_known = array("b")
+        self._added_sources: dict[str, int] = {}
+        self._added_source_names: list[str] = []
+        self._added_count = 0
+        # 청크 id는 보통 증가하는 순서로 추가되므로 그대로 이진 탐색하고, 순서가 어긋난 경우에만 정렬 순서를 따로 만든다.
+        self._added_order: np.ndarray | None = None
+        self._added_sorted = True
+
+    def __len__(self) -> int:
+        base_count = len(self._base) - len(self._removed) if self._base is not None else 0
+        return base_count + self._added_count
+
+    def __setitem__(self, chunk_id: int, chunk: DocumentChunk) -> None:
+        self.add(chunk_id, chunk)
+
+    def add(self, chunk_id: int, chunk: DocumentChunk, *, fingerprint: int | None = None) -> None:
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile()
+        encoded = chunk.text.encode("utf-8")
+        self._spool.write(encoded)
+        self._spool_dirty = True
+        if self._added_ids and chunk_id <= self._added_ids[-1]:
+            self._added_sorted = False
+        self._added_order = None
+        source_id = self._added_sources.get(chunk.source)
+        if source_id is None:
+            source_id = self._added_sources[chunk.source] = len(self._added_source_names)
+            self._added_source_names.append(chunk.source)
+        self._added_ids.append(chunk_id)
+        self._added_starts.append(self._spool_offset)
+        self._added_lengths.append(len(encoded))
+        self._added_source_ids.append(source_id)
+        self._added_fingerprints.append(fingerprint or 0)
+        self._added_fingerprint_known.append(fingerprint is not None)
+        self._spool_offset += len(encoded)
+        self._added_count += 1
+
+    def _added_position(self, chunk_id: int) -> int | None:
+        if not self._added_ids:
+            return None
+        ids = np.frombuffer(self._added_ids, dtype="int64")
+        if self._added_sorted:
+            position = int(np.searchsorted(ids, chunk_id))
+        else:
+            if self._added_order is None:
+                self._added_order = np.argsort(ids, kind="stable")
+            rank = int(np.searchsorted(ids, chunk_id, sorter=self._added_order))
+            position = int(self._added_order[rank]) if rank < ids.size else ids.size
+        # 삭제한 청크는 길이를 -1로 표시해 둔다.
+        if position < ids.size and int(ids[position]) == chunk_id and self._added_lengths[position] >= 0:
+            return position
+        return None
+
+    def _added_chunk(self, position: int) -> DocumentChunk:
+        if self._spool_dirty:
+            self._spool.flush()
+            self._spool_dirty = False
+        start = self._added_starts[position]
+        text = os.pread(self._spool.fileno(), self._added_lengths[position], start).decode("utf-8")
+        return DocumentChunk(text=text, source=self._added_source_names[self._added_source_ids[position]])
+
+    def get(self, chunk_id: int) -> DocumentChunk | None:
+        position = self._added_position(chunk_id)
+        if position is not None:
+            return self._added_chunk(position)
+        if self._base is None or chunk_id in self._removed:
+            return None
+        return self._base.get(chunk_id)
+
+    def pop(self, chunk_id: int, default: DocumentChunk | None = None) -> DocumentChunk | None:
+        position = self._added_position(chunk_id)
+        if position is not None:
+            chunk = self._added_chunk(position)
+            self._added_lengths[position] = -1
+            self._added_count -= 1
+            return chunk
+        if self._base is None or chunk_id in self._removed:
+            return default
+        chunk = self._base.get(chunk_id)
+        if chunk is None:
+            return default
+        self._removed.add(chunk_id)
+        return chunk
+
+    def _live_added_ids(self) -> np.ndarray:
+        if not self._added_ids:
+            return np.zeros(0, dtype="int64")
+        ids = np.frombuffer(self._added_ids, dtype="int64")
+        return ids[np.frombuffer(self._added_lengths, dtype="int64") >= 0]
+
+    def max_id(self) -> int:
+        base_max = self._base.max_id() if self._base is not None else -1
+        added = self._live_added_ids()
+        return max(base_max, int(added.max())) if added.size else base_max
+
+    def ids(self) -> np.ndarray:
+        added = self._live_added_ids()
+        if self._base is None:
+            return np.sort(added)
+        base_ids = self._base.ids()
+        if self._removed:
+            removed = np.fromiter(self._removed, dtype="int64", count=len(self._removed))
+            base_ids = base_ids[~np.isin(base_ids, removed)]
+        return np.sort(np.concatenate([base_ids, added]))
+
+    def fingerprints(self, chunk_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # 저장본에서 읽은 청크의 지문만 돌려준다. 이번 실행에서 추가한 청크는 known이 False다.
+        if self._base is None:
+            return np.zeros(len(chunk_ids), dtype="uint64"), np.zeros(len(chunk_ids), dtype=bool)
+        found, known = self._base.fingerprints(chunk_ids)
+        if self._removed:
+            known &= ~np.isin(chunk_ids, np.fromiter(self._removed, dtype="int64", count=len(self._removed)))
+        return found, known
+
+    def _items_with_fingerprints(self) -> Iterator[tuple[int, DocumentChunk, int | None]]:
+        if self._base is not None:
+            for position, (chunk_id, chunk) in enumerate(self._base.items()):
+                if chunk_id not in self._removed:
+                    yield chunk_id, chunk, self._base.fingerprint_at(position)
+        for position in range(len(self._added_ids)):
+            if self._added_lengths[position] >= 0:
+                fingerprint = self._added_fingerprints[position] if self._added_fingerprint_known[position] else None
+                yield self._added_ids[position], self._added_chunk(position), fingerprint
+
+    def items(self) -> Iterator[tuple[int, DocumentChunk]]:
+        for chunk_id, chunk, _ in self._items_with_fingerprints():
+            yield chunk_id, chunk
+
+    def write(self, directory: Path) -> None:
+        writer = ChunkStoreWriter(directory)
+        try:
+            for chunk_id, chunk, fingerprint in self._items_with_fingerprints():
+                writer.append(chunk_id, chunk, fingerprint=fingerprint)
+        finally:
+            writer.close()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import time
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+
+SAFE_NAME_RE = re.compile(r"[^0-9A-Za-z._-]+")
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class CacheStats:
+    model_name: str
+    entries: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class EmbeddingCache:
+    def __init__(self, cache_dir: Path, model_name: str, dimension: int, *, max_entries: int) -> None:
+        self.model_name = model_name
+        self.dimension = dimension
+        self.capacity = max(max_entries, 1)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = Lock()
+        namespace_dir = cache_dir / SAFE_NAME_RE.sub("_", model_name)
+        namespace_dir.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(namespace_dir / "index.sqlite"), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries "
+            "(key TEXT PRIMARY KEY, slot INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        vectors_path = namespace_dir / "vectors.f32"
+        layout = f"{self.capacity}x{self.dimension}"
+        row = self._db.execute("SELECT value FROM meta WHERE name = 'layout'").fetchone()
+        if row is None or row[0] != layout or not vectors_path.exists():
+            # 용량이나 차원이 바뀌면 기존 슬롯 배치를 믿을 수 없으므로 비우고 새로 만든다.
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('layout', ?)", (layout,))
+            self._db.commit()
+            mode = "w+"
+        else:
+            mode = "r+"
+        self._vectors = np.memmap(
+            vectors_path, dtype="float32", mode=mode, shape=(self.capacity, self.dimension)
+        )
+        self._size = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def make_key(text: str, *, prefix: str = "") -> str:
+        normalized = WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+        return hashlib.sha256(f"{prefix}{normalized}".encode("utf-8")).hexdigest()
+
+    def _lookup_slots(self, keys: list[str]) -> dict[str, int]:
+        slots: dict[str, int] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), 500):
+            batch = unique_keys[start : start + 500]
+            placeholders = ",".join("?" for _ in batch)
+            rows = self._db.execute(
+                f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            slots.update(rows)
+        return slots
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        with self._lock:
+            found = {key: np.array(self._vectors[slot]) for key, slot in self._lookup_slots(keys).items()}
+            if found:
+                now = time.time_ns()
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._db.commit()
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put_many(self, items: dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        with self._lock:
+            now = time.time_ns()
+            existing = self._lookup_slots(list(items))
+            new_keys = [key for key in items if key not in existing]
+            free = min(len(new_keys), self.capacity - self._size)
+            slots = list(range(self._size, self._size + free))
+            self._size += free
+            overflow = len(new_keys) - free
+            if overflow > 0:
+                evicted = self._db.execute(
+                    "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (overflow,)
+                ).fetchall()
+                self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in evicted])
+                slots.extend(slot for _, slot in evicted)
+                self.evictions += len(evicted)
+            assignments = dict(zip(new_keys, slots))
+            for key, slot in assignments.items():
+                self._vectors[slot] = items[key]
+            self._db.executemany(
+                "INSERT OR REPLACE INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                [(key, slot, now) for key, slot in assignments.items()],
+            )
+            self._vectors.flush()
+            self._db.commit()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                model_name=self.model_name,
+                entries=self._size,
+                capacity=self.capacity,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors.flush()
+            self._db.close()
+
+
+_lock = Lock()
+_cache_dir: Path | None = None
+_max_entries = 200_000
+_caches: dict[str, EmbeddingCache] = {}
+
+
+def configure_embedding_cache(cache_dir: Path | None, *, max_entries: int = 200_000) -> None:
+    global _cache_dir, _max_entries
+    with _lock:
+        for cache in _caches.values():
+            cache.close()
+        _caches.clear()
+        _cache_dir = cache_dir
+        _max_entries = max_entries
+
+
+def get_embedding_cache(model_name: str, dimension: int) -> EmbeddingCache | None:
+    with _lock:
+        if _cache_dir is None:
+            return None
+        cache = _caches.get(model_name)
+        if cache is None or cache.dimension != dimension:
+            cache = EmbeddingCache(_cache_dir, model_name, dimension, max_entries=_max_entries)
+            _caches[model_name] = cache
+        return cache
+
+
+def get_embedding_cache_stats() -> list[CacheStats]:
+    with _lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
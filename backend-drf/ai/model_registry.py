@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+from sentence_transformers import CrossEncoder, SentenceTransformer
+
+from embedding_backends import DEFAULT_BACKEND, backend_namespace, load_embedding_model
+
+
+@dataclass
+class ModelStats:
+    model_name: str
+    load_seconds: float
+    parameter_bytes: int
+    rss_delta_bytes: int | None
+
+
+_lock = Lock()
+_load_locks: dict[str, Lock] = {}
+_models: dict[str, SentenceTransformer] = {}
+_cross_encoders: dict[str, CrossEncoder] = {}
+_stats: dict[str, ModelStats] = {}
+
+
+def _current_rss_bytes() -> int | None:
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as file:
+            resident_pages = int(file.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _parameter_bytes(model: Any) -> int:
+    # CrossEncoder는 내부 transformers 모델을 .model로 들고 있고, onnx 백엔드는 torch 파라미터가 없다.
+    module = model.model if isinstance(model, CrossEncoder) else model
+    if not hasattr(module, "parameters"):
+        return 0
+    return sum(param.numel() * param.element_size() for param in module.parameters())
+
+
+def _load(key: str, factory: Callable[[], Any], registry: dict[str, Any], label: str) -> Any:
+    rss_before = _current_rss_bytes()
+    started = time.perf_counter()
+    model = factory()
+    load_seconds = time.perf_counter() - started
+    rss_after = _current_rss_bytes()
+    rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+    stats = ModelStats(
+        model_name=key,
+        load_seconds=load_seconds,
+        parameter_bytes=_parameter_bytes(model),
+        rss_delta_bytes=rss_delta,
+    )
+    with _lock:
+        registry[key] = model
+        _stats[key] = stats
+    logging.info(
+        "%s 로드 완료: %s (%.2fs, params=%.1fMB)",
+        label,
+        key,
+        load_seconds,
+        stats.parameter_bytes / (1024 * 1024),
+    )
+    return model
+
+
+def _get_or_load(key: str, factory: Callable[[], Any], registry: dict[str, Any], label: str) -> Any:
+    model = registry.get(key)
+    if model is not None:
+        return model
+    with _lock:
+        load_lock = _load_locks.setdefault(key, Lock())
+    with load_lock:
+        model = registry.get(key)
+        if model is None:
+            model = _load(key, factory, registry, label)
+    return model
+
+
+def get_model(model_name: str, backend: str = DEFAULT_BACKEND) -> SentenceTransformer:
+    return _get_or_load(
+        backend_namespace(model_name, backend),
+        lambda: load_embedding_model(model_name, backend),
+        _models,
+        "임베딩 모델",
+    )
+
+
+def get_cross_encoder(model_name: str) -> CrossEncoder:
+    return _get_or_load(model_name, lambda: CrossEncoder(model_name), _cross_encoders, "리랭크 모델")
+
+
+def warm_models(model_names: Iterable[str], backend: str = DEFAULT_BACKEND) -> list[ModelStats]:
+    for model_name in model_names:
+        get_model(model_name, backend)
+    return get_model_stats()
+
+
+def get_model_stats() -> list[ModelStats]:
+    with _lock:
+        return [ModelStats(**vars(stats)) for stats in _stats.values()]
@@ -1,112 +1,92 @@
 from __future__ import annotations
 
+import hashlib
 import json
-import re
-from dataclasses import dataclass
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 import faiss
 import numpy as np
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
-from pypdf import PdfReader
 from sentence_transformers import SentenceTransformer
 
-SUPPORTED_EXTENSIONS = {".txt", ".csv", ".pdf", ".md"}
-WHITESPACE_RE = re.compile(r"\s+")
+from bm25 import BM25Builder, BM25Index, reciprocal_rank_fusion
+from chunk_store import ChunkStore, ChunkTable, DocumentChunk
+from chunker import TokenChunker
+from dedupe import DEFAULT_MIN_JACCARD, NearDuplicateFilter, simhash
+from document_loader import iter_fetched_urls, iter_loaded_files, iter_source_files
+from embedding_backends import DEFAULT_BACKEND, backend_namespace
+from embedding_cache import EmbeddingCache, get_embedding_cache
+from index_spec import IndexSpec, parse_index_spec
+from model_registry import get_model
+
+CURRENT_POINTER = "CURRENT"
+KEEP_INDEX_VERSIONS = 2
+PIPELINE_STAGES = ("load", "chunk", "dedupe", "embed", "index")
+HYBRID_CANDIDATES = 2
+RRF_K = 60
+LEXICAL_BATCH_SIZE = 1024
+CSV_ROWS_MARKER = "#rows="
+
+T = TypeVar("T")
 
 
 @dataclass
-class DocumentChunk:
-    text: str
-    source: str
+class SourceRecord:
+    content_hash: str
+    chunk_ids: list[int]
+    # 이 소스의 청크가 중복으로 제외될 때 기준이 된 다른 소스. 기준 소스가 바뀌거나 사라지면 이 소스를 다시 인덱싱한다.
+    duplicate_of: list[str] = field(default_factory=list)
 
 
 @dataclass
 class IndexArtifacts:
     index: faiss.Index
-    chunks: list[DocumentChunk]
+    chunks: ChunkTable
     model_name: str
+    version: str | None = None
+    sources: dict[str, SourceRecord] = field(default_factory=dict)
+    build_options: dict[str, Any] = field(default_factory=dict)
+    next_id: int = 0
+    lexical: BM25Index | None = None
+    # 이번 실행에서 추가한 청크의 BM25 포스팅. 임베딩 배치마다 토큰화해 쌓고 build_lexical_index에서 lexical과 합친다.
+    lexical_builder: BM25Builder | None = field(default=None, repr=False)
+    pending: list[tuple[np.ndarray, np.ndarray]] = field(default_factory=list, repr=False)
+    # 중복 제거에서 계산한 지문 중 아직 청크 테이블에 추가되지 않은 청크의 것. 저장 시 청크와 함께 기록된다.
+    pending_fingerprints: dict[int, int] = field(default_factory=dict, repr=False)
 
 
-def _clean_text(text: str) -> str:
-    return WHITESPACE_RE.sub(" ", text).strip()
-
-
-def _read_txt(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="ignore")
-
-
-def _read_md(path: Path) -> str:
-    return path.read_text(encoding="utf-8", errors="ignore")
-
-
-def _read_csv(path: Path) -> str:
-    df = pd.read_csv(path)
-    lines = []
-    for _, row in df.iterrows():
-        parts = [f"{col}: {row[col]}" for col in df.columns]
-        lines.append(" | ".join(parts))
-    return "\n".join(lines)
-
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
 
-def _read_pdf(path: Path) -> list[str]:
-    reader = PdfReader(str(path))
-    pages = []
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        pages.append(text)
-    return pages
+    @property
+    def per_second(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
 
 
-def _read_web(url: str) -> str:
-    response = requests.get(url, timeout=10)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-    for script in soup(["script", "style", "noscript"]):
-        script.decompose()
-    text = soup.get_text(separator=" ")
-    return text
+def _new_stages() -> dict[str, StageStats]:
+    return {name: StageStats() for name in PIPELINE_STAGES}
 
 
-def load_documents(paths: Iterable[Path], urls: Iterable[str]) -> list[DocumentChunk]:
-    chunks: list[DocumentChunk] = []
-    for path in paths:
-        if path.is_dir():
-            for file_path in path.rglob("*"):
-                if file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
-                    chunks.extend(load_documents([file_path], []))
-            continue
-        suffix = path.suffix.lower()
-        if suffix not in SUPPORTED_EXTENSIONS:
-            continue
-        if suffix == ".txt":
-            text = _read_txt(path)
-            chunks.append(DocumentChunk(text=text, source=str(path)))
-        elif suffix == ".md":
-            text = _read_md(path)
-            chunks.append(DocumentChunk(text=text, source=str(path)))
-        elif suffix == ".csv":
-            text = _read_csv(path)
-            chunks.append(DocumentChunk(text=text, source=str(path)))
-        elif suffix == ".pdf":
-            pages = _read_pdf(path)
-            for page_index, page_text in enumerate(pages, start=1):
-                source = f"{path}#page={page_index}"
-                chunks.append(DocumentChunk(text=page_text, source=source))
-
-    for url in urls:
-        text = _read_web(url)
-        chunks.append(DocumentChunk(text=text, source=url))
-
-    cleaned: list[DocumentChunk] = []
-    for chunk in chunks:
-        cleaned_text = _clean_text(chunk.text)
-        if cleaned_text:
-            cleaned.append(DocumentChunk(text=cleaned_text, source=chunk.source))
-    return cleaned
+@dataclass
+class UpdateStats:
+    added: int = 0
+    updated: int = 0
+    removed: int = 0
+    unchanged: int = 0
+    chunks_embedded: int = 0
+    duplicates: int = 0
+    sources_total: int = 0
+    sources_done: int = 0
+    documents: int = 0
+    stages: dict[str, StageStats] = field(default_factory=_new_stages)
 
 
 def chunk_text(text: str, max_chars: int = 1000, overlap: int = 200) -> list[str]:
@@ -127,65 +107,754 @@ def chunk_text(text: str, max_chars: int = 1000, overlap: int = 200) -> list[str
     return chunks
 
 
+def chunk_options(
+    chunker: str = "chars",
+    *,
+    max_chars: int = 1000,
+    overlap: int = 200,
+    max_tokens: int = 0,
+    overlap_tokens: int = 64,
+) -> dict[str, Any]:
+    if chunker == "tokens":
+        return {"chunker": "tokens", "max_tokens": max_tokens, "overlap_tokens": overlap_tokens}
+    if chunker != "chars":
+        raise ValueError(f"지원하지 않는 청킹 방식입니다: {chunker}")
+    return {"max_chars": max_chars, "overlap": overlap}
+
+
+def _default_max_tokens(model: SentenceTransformer, model_name: str) -> int:
+    # 특수 토큰과 e5의 "passage: " 접두어를 뺀 나머지 입력 길이를 청크 하나에 채운다.
+    tokenizer = model.tokenizer
+    prefix_tokens = len(tokenizer("passage: ", add_special_tokens=False)["input_ids"]) if _is_e5_model(model_name) else 0
+    return model.max_seq_length - tokenizer.num_special_tokens_to_add() - prefix_tokens
+
+
+def embedding_backend_of(build_options: dict[str, Any]) -> str:
+    return build_options.get("embedding_backend", DEFAULT_BACKEND)
+
+
+def embedding_model(artifacts: IndexArtifacts) -> SentenceTransformer:
+    # 질의도 문서를 임베딩한 백엔드로 임베딩해야 같은 공간에서 비교된다.
+    return get_model(artifacts.model_name, embedding_backend_of(artifacts.build_options))
+
+
+def embedding_namespace(artifacts: IndexArtifacts) -> str:
+    return backend_namespace(artifacts.model_name, embedding_backend_of(artifacts.build_options))
+
+
+def make_chunker(model_name: str, build_options: dict[str, Any]) -> Callable[[str], list[str]]:
+    if build_options.get("chunker", "chars") != "tokens":
+        max_chars = build_options.get("max_chars", 1000)
+        overlap = build_options.get("overlap", 200)
+        return lambda text: chunk_text(text, max_chars=max_chars, overlap=overlap)
+    model = get_model(model_name, embedding_backend_of(build_options))
+    max_tokens = int(build_options.get("max_tokens", 0)) or _default_max_tokens(model, model_name)
+    return TokenChunker(
+        model.tokenizer,
+        max_tokens=max_tokens,
+        overlap_tokens=int(build_options.get("overlap_tokens", 64)),
+    )
+
+
 def _is_e5_model(model_name: str) -> bool:
     return "e5" in model_name.lower()
 
 
-def embed_texts(model: SentenceTransformer, texts: list[str], *, is_query: bool) -> np.ndarray:
+def _encode(model: SentenceTransformer, texts: list[str], *, batch_size: int) -> np.ndarray:
+    embeddings = model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+    return np.asarray(embeddings, dtype="float32")
+
+
+def embed_texts(
+    model: SentenceTransformer,
+    texts: list[str],
+    *,
+    is_query: bool,
+    batch_size: int = 32,
+    cache: EmbeddingCache | None = None,
+) -> np.ndarray:
     if _is_e5_model(model.name_or_path):
         prefix = "query: " if is_query else "passage: "
         texts = [prefix + text for text in texts]
-    embeddings = model.encode(texts, normalize_embeddings=True)
-    return np.asarray(embeddings, dtype="float32")
+    if cache is None:
+        return _encode(model, texts, batch_size=batch_size)
+    keys = [cache.make_key(text) for text in texts]
+    cached = cache.get_many(keys)
+    missing = [position for position, key in enumerate(keys) if key not in cached]
+    if missing:
+        computed = _encode(model, [texts[position] for position in missing], batch_size=batch_size)
+        fresh = {keys[position]: vector for position, vector in zip(missing, computed)}
+        cache.put_many(fresh)
+        cached.update(fresh)
+    return np.stack([cached[key] for key in keys]).astype("float32", copy=False)
+
+
+def build_faiss_index(dimension: int, spec: IndexSpec | None = None) -> faiss.Index:
+    return (spec or IndexSpec()).create(dimension)
+
+
+def build_id_index(dimension: int, spec: IndexSpec | None = None) -> faiss.Index:
+    # IVF 계열은 역리스트에 id를 직접 저장하므로 IndexIDMap2로 감싸지 않는다. 감싸면 remove_ids 후
+    # id 맵만 당겨지고 IVF 내부 라벨은 그대로여서 검색 결과 id가 다른 벡터를 가리킨다.
+    spec = spec or IndexSpec()
+    index = build_faiss_index(dimension, spec)
+    if spec.needs_training:
+        # 임의 id로도 remove_ids가 전체 역리스트를 훑지 않도록 해시 테이블 direct map을 둔다.
+        index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+    return faiss.IndexIDMap2(index)
+
+
+def has_id_mapping(index: faiss.Index, spec: IndexSpec) -> bool:
+    if spec.needs_training:
+        return isinstance(index, faiss.IndexIVF)
+    return isinstance(index, faiss.IndexIDMap2)
+
+
+def index_spec_of(artifacts: IndexArtifacts) -> IndexSpec:
+    return parse_index_spec(artifacts.build_options.get("index_spec"))
+
+
+def _record(stage: StageStats, items: int, started: float) -> None:
+    stage.items += items
+    stage.seconds += time.perf_counter() - started
+
+
+def _timed(items: Iterable[T], stage: StageStats) -> Iterator[T]:
+    # 다음 항목을 기다린 시간만 더하므로 앞 단계가 병목이면 이 값이 커진다.
+    iterator = iter(items)
+    while True:
+        started = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            _record(stage, 0, started)
+            return
+        _record(stage, 1, started)
+        yield item
+
+
+def iter_chunks(
+    documents: Iterable[DocumentChunk],
+    *,
+    chunker: Callable[[str], list[str]],
+    stage: StageStats | None = None,
+) -> Iterator[DocumentChunk]:
+    for doc in documents:
+        started = time.perf_counter()
+        pieces = chunker(doc.text)
+        if stage is not None:
+            _record(stage, len(pieces), started)
+        for chunk in pieces:
+            yield DocumentChunk(text=chunk, source=doc.source)
+
+
+def _reserve_id(artifacts: IndexArtifacts) -> int:
+    chunk_id = artifacts.next_id
+    artifacts.next_id += 1
+    return chunk_id
+
+
+def _with_ids(artifacts: IndexArtifacts, items: Iterable[T]) -> Iterator[tuple[int, T]]:
+    for item in items:
+        yield _reserve_id(artifacts), item
 
 
-def build_faiss_index(embeddings: np.ndarray) -> faiss.Index:
-    dimension = embeddings.shape[1]
-    index = faiss.IndexFlatIP(dimension)
-    index.add(embeddings)
-    return index
+def iter_unique_chunks(
+    artifacts: IndexArtifacts,
+    items: Iterable[T],
+    dedupe: NearDuplicateFilter,
+    in_flight: dict[int, DocumentChunk],
+    *,
+    chunk_of: Callable[[T], DocumentChunk],
+    stage: StageStats | None = None,
+    on_duplicate: Callable[[T, DocumentChunk], None] | None = None,
+) -> Iterator[tuple[int, T]]:
+    # 임베딩 전에 앞서 나온 청크와 거의 같은 청크(머리글/바닥글, 반복되는 안내문, 중복 행)를 버리고, 남은 청크에 id를 매긴다.
+    # 아직 인덱스에 추가되지 않은 청크는 in_flight에서, 추가된 청크는 청크 테이블에서 본문을 읽어 비교한다.
+    def lookup(chunk_id: int) -> str | None:
+        chunk = in_flight.get(chunk_id) or artifacts.chunks.get(chunk_id)
+        return chunk.text if chunk is not None else None
+
+    for item in items:
+        chunk = chunk_of(item)
+        started = time.perf_counter()
+        # CSV 행 묶음은 값 몇 개만 달라도 서로 다른 데이터이므로 본문이 완전히 같을 때만 버린다.
+        canonical, fingerprint = dedupe.find(chunk.text, lookup, exact=CSV_ROWS_MARKER in chunk.source)
+        if stage is not None:
+            _record(stage, 1, started)
+        if canonical is not None:
+            if on_duplicate is not None:
+                on_duplicate(item, in_flight.get(canonical) or artifacts.chunks.get(canonical))
+            continue
+        chunk_id = _reserve_id(artifacts)
+        dedupe.add(fingerprint, chunk_id)
+        artifacts.pending_fingerprints[chunk_id] = fingerprint
+        in_flight[chunk_id] = chunk
+        yield chunk_id, item
+
+
+def _batched(items: Iterable[T], batch_size: int) -> Iterator[list[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def create_index_artifacts(
+    model_name: str,
+    *,
+    build_options: dict[str, Any] | None = None,
+) -> IndexArtifacts:
+    model = get_model(model_name, embedding_backend_of(build_options or {}))
+    dimension = model.get_sentence_embedding_dimension()
+    spec = parse_index_spec((build_options or {}).get("index_spec"))
+    index = build_id_index(dimension, spec)
+    return IndexArtifacts(
+        index=index,
+        chunks=ChunkTable(),
+        model_name=model_name,
+        build_options=dict(build_options or {}),
+    )
+
+
+def flush_pending(artifacts: IndexArtifacts) -> None:
+    if not artifacts.pending:
+        return
+    spec = index_spec_of(artifacts)
+    vectors = np.vstack([embeddings for embeddings, _ in artifacts.pending])
+    if len(vectors) < spec.min_train_size:
+        logging.warning(
+            "학습 벡터(%d개)가 필요한 최소 개수(%d)보다 적어 flat 인덱스로 대체합니다.",
+            len(vectors),
+            spec.min_train_size,
+        )
+        artifacts.index = build_id_index(vectors.shape[1])
+        artifacts.build_options["index_spec"] = str(IndexSpec())
+    else:
+        artifacts.index.train(vectors)
+    for embeddings, ids in artifacts.pending:
+        artifacts.index.add_with_ids(embeddings, ids)
+    artifacts.pending = []
+
+
+def _add_batch(
+    artifacts: IndexArtifacts,
+    chunk_ids: list[int],
+    batch: list[DocumentChunk],
+    *,
+    model: SentenceTransformer,
+    cache: EmbeddingCache | None,
+    spec: IndexSpec,
+    stages: dict[str, StageStats],
+) -> None:
+    started = time.perf_counter()
+    embeddings = embed_texts(model, [doc.text for doc in batch], is_query=False, cache=cache)
+    _record(stages["embed"], len(batch), started)
+    started = time.perf_counter()
+    ids = np.asarray(chunk_ids, dtype="int64")
+    if artifacts.index.is_trained:
+        artifacts.index.add_with_ids(embeddings, ids)
+    else:
+        # 학습이 필요한 IVF 계열은 학습 표본(train_size)만큼만 모아 두었다가 학습 후 이어서 추가한다.
+        artifacts.pending.append((embeddings, ids))
+        if sum(len(pending_ids) for _, pending_ids in artifacts.pending) >= spec.train_size:
+            flush_pending(artifacts)
+    for chunk_id, doc in zip(chunk_ids, batch):
+        artifacts.chunks.add(chunk_id, doc, fingerprint=artifacts.pending_fingerprints.pop(chunk_id, None))
+    if artifacts.lexical_builder is None:
+        artifacts.lexical_builder = BM25Builder(artifacts.lexical)
+    artifacts.lexical_builder.add((chunk_id, doc.text) for chunk_id, doc in zip(chunk_ids, batch))
+    _record(stages["index"], len(batch), started)
+
+
+def add_documents(
+    artifacts: IndexArtifacts,
+    documents: Iterable[DocumentChunk],
+    *,
+    batch_size: int = 256,
+    stages: dict[str, StageStats] | None = None,
+    dedupe: NearDuplicateFilter | None = None,
+) -> list[int]:
+    stages = stages if stages is not None else _new_stages()
+    model = embedding_model(artifacts)
+    cache = get_embedding_cache(embedding_namespace(artifacts), artifacts.index.d)
+    spec = index_spec_of(artifacts)
+    chunks = iter_chunks(
+        documents,
+        chunker=make_chunker(artifacts.model_name, artifacts.build_options),
+        stage=stages["chunk"],
+    )
+    in_flight: dict[int, DocumentChunk] = {}
+    if dedupe is not None:
+        numbered = iter_unique_chunks(
+            artifacts, chunks, dedupe, in_flight, chunk_of=lambda doc: doc, stage=stages["dedupe"]
+        )
+    else:
+        numbered = _with_ids(artifacts, chunks)
+    added_ids: list[int] = []
+    # 배치 단위로 임베딩해 바로 인덱스에 추가하므로 전체 임베딩 행렬을 한 번에 들고 있지 않는다.
+    for batch in _batched(numbered, max(batch_size, 1)):
+        chunk_ids = [chunk_id for chunk_id, _ in batch]
+        _add_batch(artifacts, chunk_ids, [doc for _, doc in batch], model=model, cache=cache, spec=spec, stages=stages)
+        for chunk_id in chunk_ids:
+            in_flight.pop(chunk_id, None)
+        added_ids.extend(chunk_ids)
+    return added_ids
+
+
+def remove_source(artifacts: IndexArtifacts, source: str) -> int:
+    record = artifacts.sources.pop(source, None)
+    if record is None or not record.chunk_ids:
+        return 0
+    artifacts.index.remove_ids(np.asarray(record.chunk_ids, dtype="int64"))
+    for chunk_id in record.chunk_ids:
+        artifacts.chunks.pop(chunk_id, None)
+    return len(record.chunk_ids)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _record_source(artifacts: IndexArtifacts, chunk_source: str) -> str:
+    # CSV/PDF 청크의 출처(path#rows=..., path#page=...)를 sources.json의 소스 키(파일 경로)로 되돌린다.
+    if chunk_source in artifacts.sources:
+        return chunk_source
+    return chunk_source.split("#", 1)[0]
+
+
+def _dependent_sources(artifacts: IndexArtifacts, changed: set[str], present: set[str]) -> set[str]:
+    # 바뀌었거나 사라진 소스를 기준으로 청크가 중복 제외된 소스를, 더 따라갈 소스가 없을 때까지 모은다.
+    dependents: set[str] = set()
+    frontier = set(changed)
+    while frontier:
+        found = {
+            source
+            for source, record in artifacts.sources.items()
+            if source in present
+            and source not in changed
+            and source not in dependents
+            and frontier.intersection(record.duplicate_of)
+        }
+        dependents |= found
+        frontier = found
+    return dependents
+
+
+def _index_sources(
+    artifacts: IndexArtifacts,
+    sources: Iterable[tuple[str, str, list[DocumentChunk]]],
+    stats: UpdateStats,
+    *,
+    batch_size: int,
+    progress: Callable[[UpdateStats], None] | None = None,
+    dedupe: NearDuplicateFilter | None = None,
+) -> None:
+    stages = stats.stages
+    model = embedding_model(artifacts)
+    cache = get_embedding_cache(embedding_namespace(artifacts), artifacts.index.d)
+    spec = index_spec_of(artifacts)
+    chunker = make_chunker(artifacts.model_name, artifacts.build_options)
+
+    def tagged_chunks() -> Iterator[tuple[str, DocumentChunk]]:
+        for source, content_hash, documents in _timed(sources, stages["load"]):
+            if source in artifacts.sources:
+                stats.updated += 1
+            else:
+                stats.added += 1
+            remove_source(artifacts, source)
+            artifacts.sources[source] = SourceRecord(content_hash=content_hash, chunk_ids=[])
+            stats.documents += len(documents)
+            chunks = iter_chunks(documents, chunker=chunker, stage=stages["chunk"])
+            for chunk in chunks:
+                yield source, chunk
+
+    def link_duplicate(item: tuple[str, DocumentChunk], canonical: DocumentChunk) -> None:
+        source = item[0]
+        canonical_source = _record_source(artifacts, canonical.source)
+        duplicate_of = artifacts.sources[source].duplicate_of
+        if canonical_source != source and canonical_source not in duplicate_of:
+            duplicate_of.append(canonical_source)
+
+    in_flight: dict[int, DocumentChunk] = {}
+    if dedupe is not None:
+        numbered = iter_unique_chunks(
+            artifacts,
+            tagged_chunks(),
+            dedupe,
+            in_flight,
+            chunk_of=lambda item: item[1],
+            stage=stages["dedupe"],
+            on_duplicate=link_duplicate,
+        )
+    else:
+        numbered = _with_ids(artifacts, tagged_chunks())
+
+    # 로드 → 청킹 → 중복 제거 → 임베딩 → 인덱스 추가가 제너레이터로 이어져, 임베딩이 다음 배치를 요구할 때만 앞 단계가 진행된다.
+    # 작은 파일이 많아도 여러 소스의 청크를 한 배치로 묶어 임베딩한다.
+    for batch in _batched(numbered, max(batch_size, 1)):
+        chunk_ids = [chunk_id for chunk_id, _ in batch]
+        _add_batch(
+            artifacts, chunk_ids, [chunk for _, (_, chunk) in batch], model=model, cache=cache, spec=spec, stages=stages
+        )
+        for chunk_id, (source, _) in batch:
+            artifacts.sources[source].chunk_ids.append(chunk_id)
+            in_flight.pop(chunk_id, None)
+        stats.chunks_embedded += len(chunk_ids)
+        stats.duplicates = dedupe.removed if dedupe is not None else 0
+        if progress is not None:
+            progress(stats)
+
+
+def update_index(
+    artifacts: IndexArtifacts,
+    paths: Iterable[Path],
+    urls: Iterable[str],
+    *,
+    batch_size: int = 256,
+    workers: int | None = None,
+    fetch_workers: int = 8,
+    per_host: int = 2,
+    progress: Callable[[UpdateStats], None] | None = None,
+    dedupe_distance: int | None = 4,
+    dedupe_jaccard: float = DEFAULT_MIN_JACCARD,
+) -> UpdateStats:
+    stats = UpdateStats()
+    seen: set[str] = set()
+    content_hashes: dict[str, str] = {}
+    changed_paths: list[Path] = []
+    unchanged_paths: dict[str, Path] = {}
+    for file_path in iter_source_files(paths):
+        source = str(file_path)
+        seen.add(source)
+        content_hash = _hash_file(file_path)
+        record = artifacts.sources.get(source)
+        if record is not None and record.content_hash == content_hash:
+            unchanged_paths[source] = file_path
+            continue
+        content_hashes[source] = content_hash
+        changed_paths.append(file_path)
+    new_urls = [url for url in dict.fromkeys(urls) if url not in seen]
+    present = seen | set(new_urls)
+    removed = {source for source in artifacts.sources if source not in present}
+    # 중복으로 제외된 청크는 기준 소스의 청크로만 검색되므로, 기준 소스가 바뀌거나 사라지면 그 소스를 다시 인덱싱한다.
+    forced = _dependent_sources(artifacts, set(content_hashes) | removed, present)
+    for source in sorted(forced & unchanged_paths.keys()):
+        file_path = unchanged_paths.pop(source)
+        content_hashes[source] = artifacts.sources[source].content_hash
+        changed_paths.append(file_path)
+    stats.unchanged += len(unchanged_paths)
+    dedupe = None
+    if dedupe_distance is not None:
+        dedupe = NearDuplicateFilter(max_distance=dedupe_distance, min_jaccard=dedupe_jaccard)
+        # 증분 실행에서는 그대로 유지되는 파일의 청크를 먼저 등록해, 새 문서의 청크가 기존 청크와 겹치는지도 확인한다.
+        # 지문은 청크 저장소에 저장된 값을 쓰고, 지문이 없는 이전 형식 저장본의 청크만 본문을 읽어 계산한다.
+        kept_ids = np.fromiter(
+            (chunk_id for source in unchanged_paths for chunk_id in artifacts.sources[source].chunk_ids),
+            dtype="int64",
+        )
+        fingerprints, known = artifacts.chunks.fingerprints(kept_ids)
+        for chunk_id, fingerprint, has_fingerprint in zip(kept_ids.tolist(), fingerprints.tolist(), known.tolist()):
+            if not has_fingerprint:
+                chunk = artifacts.chunks.get(chunk_id)
+                if chunk is None:
+                    continue
+                fingerprint = simhash(chunk.text)
+            dedupe.add(fingerprint, chunk_id)
+    seen.update(new_urls)
+    stats.sources_total = len(changed_paths) + len(new_urls)
+    if progress is not None:
+        progress(stats)
+    reindexed: set[str] = set()
+
+    def changed_sources(
+        file_paths: list[Path],
+        url_list: list[str],
+        forced_urls: set[str],
+    ) -> Iterator[tuple[str, str, list[DocumentChunk]]]:
+        # 파싱은 여러 프로세스에서 진행하고, 끝난 순서대로 받아 청킹/임베딩으로 넘긴다.
+        for source, documents in iter_loaded_files(file_paths, workers=workers):
+            stats.sources_done += 1
+            reindexed.add(source)
+            yield source, content_hashes[source], documents
+        for url, documents in iter_fetched_urls(url_list, workers=fetch_workers, per_host=per_host):
+            stats.sources_done += 1
+            content_hash = _hash_text("\n".join(doc.text for doc in documents))
+            record = artifacts.sources.get(url)
+            if record is not None and record.content_hash == content_hash and url not in forced_urls:
+                stats.unchanged += 1
+                continue
+            reindexed.add(url)
+            yield url, content_hash, documents
+
+    def index(sources: Iterable[tuple[str, str, list[DocumentChunk]]]) -> None:
+        _index_sources(artifacts, sources, stats, batch_size=batch_size, progress=progress, dedupe=dedupe)
+
+    index(changed_sources(changed_paths, new_urls, forced))
+    # URL은 내려받은 뒤에야 바뀌었는지 알 수 있으므로, 바뀐 URL을 기준으로 삼던 파일은 한 번 더 모아 다시 인덱싱한다.
+    late = _dependent_sources(artifacts, reindexed | removed, present) - reindexed
+    if late:
+        late_paths = [unchanged_paths.pop(source) for source in sorted(late) if source in unchanged_paths]
+        for file_path in late_paths:
+            content_hashes[str(file_path)] = artifacts.sources[str(file_path)].content_hash
+        late_urls = [url for url in new_urls if url in late]
+        # 앞에서 유지로 센 소스를 다시 인덱싱하므로 유지 수에서 빼고 전체 수에 더한다.
+        stats.unchanged -= len(late_paths) + len(late_urls)
+        stats.sources_total += len(late_paths) + len(late_urls)
+        index(changed_sources(late_paths, late_urls, set(late_urls)))
+    stats.duplicates = dedupe.removed if dedupe is not None else 0
+    for source in removed:
+        remove_source(artifacts, source)
+        stats.removed += 1
+    started = time.perf_counter()
+    flush_pending(artifacts)
+    _record(stats.stages["index"], 0, started)
+    return stats
 
 
 def build_index(
-    documents: list[DocumentChunk],
+    documents: Iterable[DocumentChunk],
     *,
     model_name: str = "intfloat/multilingual-e5-small",
     max_chars: int = 1000,
     overlap: int = 200,
+    batch_size: int = 256,
+    index_spec: str = "flat",
+    chunker: str = "chars",
+    max_tokens: int = 0,
+    overlap_tokens: int = 64,
+    dedupe_distance: int | None = 4,
+    dedupe_jaccard: float = DEFAULT_MIN_JACCARD,
+    embedding_backend: str = DEFAULT_BACKEND,
 ) -> IndexArtifacts:
-    model = SentenceTransformer(model_name)
-    chunked_docs: list[DocumentChunk] = []
-    for doc in documents:
-        for chunk in chunk_text(doc.text, max_chars=max_chars, overlap=overlap):
-            chunked_docs.append(DocumentChunk(text=chunk, source=doc.source))
-    texts = [doc.text for doc in chunked_docs]
-    embeddings = embed_texts(model, texts, is_query=False)
-    index = build_faiss_index(embeddings)
-    return IndexArtifacts(index=index, chunks=chunked_docs, model_name=model_name)
+    build_options = chunk_options(
+        chunker,
+        max_chars=max_chars,
+        overlap=overlap,
+        max_tokens=max_tokens,
+        overlap_tokens=overlap_tokens,
+    )
+    build_options["index_spec"] = str(parse_index_spec(index_spec))
+    if embedding_backend != DEFAULT_BACKEND:
+        build_options["embedding_backend"] = embedding_backend
+    artifacts = create_index_artifacts(model_name, build_options=build_options)
+    dedupe = None
+    if dedupe_distance is not None:
+        dedupe = NearDuplicateFilter(max_distance=dedupe_distance, min_jaccard=dedupe_jaccard)
+    add_documents(artifacts, documents, batch_size=batch_size, dedupe=dedupe)
+    flush_pending(artifacts)
+    artifacts.lexical = build_lexical_index(artifacts)
+    if dedupe is not None:
+        logging.info("근접 중복 청크 %d/%d개 제외", dedupe.removed, dedupe.checked)
+    return artifacts
+
+
+def build_lexical_index(artifacts: IndexArtifacts) -> BM25Index:
+    builder = artifacts.lexical_builder or BM25Builder(artifacts.lexical)
+    artifacts.lexical_builder = None
+    # 청크 id는 계속 증가하므로 이전 빌드(next_id 미만)와 배치마다 토큰화한 청크는 그대로 쓰고, 어느 쪽에도 없는 청크
+    # (BM25 없이 저장된 이전 인덱스 등)만 여기서 토큰화한다. 삭제된 청크의 포스팅은 keep_ids로 걸러낸다.
+    chunk_ids = artifacts.chunks.ids()
+    missing = chunk_ids[(chunk_ids >= builder.base_next_id) & ~np.isin(chunk_ids, builder.doc_ids())]
+    for batch in _batched(missing.tolist(), LEXICAL_BATCH_SIZE):
+        builder.add((chunk_id, artifacts.chunks.get(chunk_id).text) for chunk_id in batch)
+    return builder.build(next_id=artifacts.next_id, keep_ids=chunk_ids)
+
+
+def _comparable_options(build_options: dict[str, Any]) -> dict[str, Any]:
+    comparable = dict(build_options)
+    comparable["index_spec"] = parse_index_spec(build_options.get("index_spec")).build_signature
+    return comparable
+
+
+def is_compatible(artifacts: IndexArtifacts, model_name: str, build_options: dict[str, Any]) -> bool:
+    return (
+        has_id_mapping(artifacts.index, index_spec_of(artifacts))
+        and artifacts.model_name == model_name
+        and _comparable_options(artifacts.build_options) == _comparable_options(build_options)
+    )
+
+
+def resolve_index_dir(index_dir: Path) -> Path:
+    pointer_path = index_dir / CURRENT_POINTER
+    if pointer_path.exists():
+        version = pointer_path.read_text(encoding="utf-8").strip()
+        if version:
+            return index_dir / version
+    return index_dir
+
+
+def current_index_version(index_dir: Path) -> str | None:
+    pointer_path = index_dir / CURRENT_POINTER
+    if pointer_path.exists():
+        return pointer_path.read_text(encoding="utf-8").strip() or None
+    index_path = index_dir / "index.faiss"
+    if index_path.exists():
+        return f"legacy-{index_path.stat().st_mtime_ns}"
+    return None
+
+
+def _prune_index_versions(output_dir: Path, current: str) -> None:
+    versions = sorted(
+        path.name for path in output_dir.iterdir() if path.is_dir() and path.name.startswith("v")
+    )
+    stale = [name for name in versions if name != current][: max(len(versions) - KEEP_INDEX_VERSIONS, 0)]
+    for name in stale:
+        shutil.rmtree(output_dir / name, ignore_errors=True)
 
 
-def save_index(artifacts: IndexArtifacts, output_dir: Path) -> None:
+def save_index(artifacts: IndexArtifacts, output_dir: Path) -> str:
+    flush_pending(artifacts)
     output_dir.mkdir(parents=True, exist_ok=True)
-    index_path = output_dir / "index.faiss"
+    version = datetime.utcnow().strftime("v%Y%m%dT%H%M%S%f")
+    version_dir = output_dir / version
+    version_dir.mkdir()
+    index_path = version_dir / "index.faiss"
     faiss.write_index(artifacts.index, str(index_path))
-    metadata = {
+    artifacts.chunks.write(version_dir)
+    artifacts.lexical = build_lexical_index(artifacts)
+    artifacts.lexical.write(version_dir)
+    manifest = {
         "model_name": artifacts.model_name,
-        "chunks": [
-            {"text": chunk.text, "source": chunk.source}
-            for chunk in artifacts.chunks
-        ],
+        "build_options": artifacts.build_options,
+        "next_id": artifacts.next_id,
     }
-    metadata_path = output_dir / "metadata.json"
-    metadata_path.write_text(json.dumps(metadata, ensure_ascii=False, indent=2), encoding="utf-8")
+    (version_dir / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    sources = {
+        source: {"content_hash": record.content_hash, "chunk_ids": record.chunk_ids}
+        | ({"duplicate_of": record.duplicate_of} if record.duplicate_of else {})
+        for source, record in artifacts.sources.items()
+    }
+    with (version_dir / "sources.json").open("w", encoding="utf-8") as file:
+        json.dump(sources, file, ensure_ascii=False)
+    # 새 버전을 모두 기록한 뒤 포인터만 원자적으로 교체해 읽는 쪽이 반쯤 쓰인 인덱스를 보지 않게 한다.
+    pointer_tmp = output_dir / f"{CURRENT_POINTER}.tmp"
+    pointer_tmp.write_text(version, encoding="utf-8")
+    os.replace(pointer_tmp, output_dir / CURRENT_POINTER)
+    _prune_index_versions(output_dir, version)
+    artifacts.version = version
+    return version
+
+
+def _load_legacy_chunks(metadata_path: Path) -> ChunkTable:
+    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+    chunks = ChunkTable()
+    for position, chunk in enumerate(metadata["chunks"]):
+        chunks[int(chunk.get("id", position))] = DocumentChunk(text=chunk["text"], source=chunk["source"])
+    return chunks
 
 
-def load_index(index_dir: Path) -> IndexArtifacts:
-    index_path = index_dir / "index.faiss"
-    metadata_path = index_dir / "metadata.json"
-    index = faiss.read_index(str(index_path))
-    metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
-    chunks = [DocumentChunk(**chunk) for chunk in metadata["chunks"]]
-    return IndexArtifacts(index=index, chunks=chunks, model_name=metadata["model_name"])
+def _parse_sources(raw_sources: dict[str, Any]) -> dict[str, SourceRecord]:
+    return {
+        source: SourceRecord(
+            content_hash=record["content_hash"],
+            chunk_ids=[int(chunk_id) for chunk_id in record["chunk_ids"]],
+            duplicate_of=list(record.get("duplicate_of", [])),
+        )
+        for source, record in raw_sources.items()
+    }
+
+
+def load_index(index_dir: Path, *, with_sources: bool = False) -> IndexArtifacts:
+    version = current_index_version(index_dir)
+    base_dir = resolve_index_dir(index_dir)
+    index = faiss.read_index(str(base_dir / "index.faiss"))
+    manifest_path = base_dir / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    if ChunkStore.exists(base_dir):
+        chunks = ChunkTable(ChunkStore(base_dir))
+        model_name = manifest["model_name"]
+    else:
+        # 이전 형식(metadata.json)은 전체를 읽어 메모리에 올린다.
+        metadata_path = base_dir / "metadata.json"
+        chunks = _load_legacy_chunks(metadata_path)
+        model_name = manifest.get("model_name") or json.loads(metadata_path.read_text(encoding="utf-8"))["model_name"]
+    artifacts = IndexArtifacts(
+        index=index,
+        chunks=chunks,
+        model_name=model_name,
+        version=version,
+        build_options=manifest.get("build_options", {}),
+        next_id=max(chunks.max_id() + 1, int(manifest.get("next_id", 0))),
+        lexical=BM25Index.load(base_dir),
+    )
+    if with_sources:
+        sources_path = base_dir / "sources.json"
+        if sources_path.exists():
+            artifacts.sources = _parse_sources(json.loads(sources_path.read_text(encoding="utf-8")))
+        else:
+            artifacts.sources = _parse_sources(manifest.get("sources", {}))
+    return artifacts
+
+
+def embed_queries(artifacts: IndexArtifacts, queries: list[str]) -> np.ndarray:
+    model = embedding_model(artifacts)
+    # 질의를 한 번의 encode 배치로 임베딩한다.
+    return embed_texts(model, queries, is_query=True, batch_size=max(len(queries), 1))
+
+
+def search_embeddings(
+    artifacts: IndexArtifacts,
+    queries: list[str],
+    query_embeddings: np.ndarray,
+    *,
+    top_k: int = 4,
+    nprobe: int | None = None,
+    ef_search: int | None = None,
+    hybrid: bool = True,
+) -> list[list[DocumentChunk]]:
+    if not queries:
+        return []
+    lexical = artifacts.lexical if hybrid else None
+    candidates = top_k * HYBRID_CANDIDATES if lexical is not None else top_k
+    # 쌓은 질의 행렬로 index.search를 한 번만 호출한다.
+    params = index_spec_of(artifacts).search_parameters(nprobe=nprobe, ef_search=ef_search)
+    _, indices = artifacts.index.search(query_embeddings, candidates, params=params)
+    results = []
+    for query, row in zip(queries, indices):
+        ranking = [int(idx) for idx in row if idx >= 0]
+        if lexical is not None:
+            # 용어가 정확히 일치하는 청크(근육/약물명, 검사 약어)를 BM25 순위로 보강해 RRF로 합친다.
+            lexical_ranking = [chunk_id for chunk_id, _ in lexical.search(query, candidates)]
+            ranking = reciprocal_rank_fusion([ranking, lexical_ranking], k=RRF_K)
+        chunks = (artifacts.chunks.get(chunk_id) for chunk_id in ranking)
+        results.append([chunk for chunk in chunks if chunk is not None][:top_k])
+    return results
+
+
+def search_many(
+    artifacts: IndexArtifacts,
+    queries: list[str],
+    *,
+    top_k: int = 4,
+    nprobe: int | None = None,
+    ef_search: int | None = None,
+    hybrid: bool = True,
+) -> list[list[DocumentChunk]]:
+    if not queries:
+        return []
+    return search_embeddings(
+        artifacts,
+        queries,
+        embed_queries(artifacts, queries),
+        top_k=top_k,
+        nprobe=nprobe,
+        ef_search=ef_search,
+        hybrid=hybrid,
+    )
 
 
 def search(
@@ -193,13 +862,8 @@ def search(
     query: str,
     *,
     top_k: int = 4,
+    nprobe: int | None = None,
+    ef_search: int | None = None,
+    hybrid: bool = True,
 ) -> list[DocumentChunk]:
-    model = SentenceTransformer(artifacts.model_name)
-    query_embedding = embed_texts(model, [query], is_query=True)
-    scores, indices = artifacts.index.search(query_embedding, top_k)
-    results = []
-    for idx in indices[0]:
-        if idx < 0 or idx >= len(artifacts.chunks):
-            continue
-        results.append(artifacts.chunks[idx])
-    return results
+    return search_many(artifacts, [query], top_k=top_k, nprobe=nprobe, ef_search=ef_search, hybrid=hybrid)[0]
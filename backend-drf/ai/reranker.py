@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from threading import Lock, Thread
+
+from chunk_store import DocumentChunk
+from model_registry import get_cross_encoder
+
+DEFAULT_RERANK_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+EMA_WEIGHT = 0.2
+PROBE_AFTER_SKIPS = 20
+
+
+@dataclass
+class RerankStats:
+    model_name: str
+    reranked: int
+    partial: int
+    skipped: int
+    pair_ms: float
+
+
+class Reranker:
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANK_MODEL,
+        *,
+        candidates: int = 20,
+        batch_size: int = 16,
+        max_latency_ms: float = 150.0,
+    ) -> None:
+        self.model_name = model_name
+        self.candidates = max(candidates, 1)
+        self.batch_size = max(batch_size, 1)
+        self.max_latency_ms = max_latency_ms
+        self._lock = Lock()
+        self._pair_ms: float | None = None
+        self._skips_in_row = 0
+        self._ready = False
+        self._warm_started = False
+        self.reranked = 0
+        self.partial = 0
+        self.skipped = 0
+
+    def warm(self) -> None:
+        # 모델을 올리고 한 배치를 실제로 돌려 쌍당 지연 시간 추정치를 만들어 둔다.
+        model = get_cross_encoder(self.model_name)
+        pairs = [("워밍업 질의", "워밍업 문서")] * self.batch_size
+        started = time.perf_counter()
+        model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        self._observe(len(pairs), time.perf_counter() - started)
+        self._ready = True
+
+    def start_warmup(self) -> None:
+        # 모델 로드와 첫 측정은 요청 경로 밖의 스레드에서 한 번만 진행한다.
+        with self._lock:
+            if self._ready or self._warm_started:
+                return
+            self._warm_started = True
+        Thread(target=self._warm_in_background, daemon=True).start()
+
+    def _warm_in_background(self) -> None:
+        try:
+            self.warm()
+        except Exception:
+            logging.exception("리랭크 모델 워밍업 실패: %s", self.model_name)
+            # 다음 요청에서 다시 시도할 수 있게 한다.
+            with self._lock:
+                self._warm_started = False
+
+    def _observe(self, pairs: int, seconds: float) -> None:
+        pair_ms = seconds * 1000 / max(pairs, 1)
+        with self._lock:
+            previous = self._pair_ms
+            self._pair_ms = pair_ms if previous is None else previous + EMA_WEIGHT * (pair_ms - previous)
+
+    def rerank(self, query: str, chunks: list[DocumentChunk], *, top_k: int) -> tuple[list[DocumentChunk], bool]:
+        # 리랭크를 건너뛰고 1차 순위를 그대로 돌려준 경우 두 번째 값이 False다. 호출 쪽은 이 결과를 캐시하지 않는다.
+        if len(chunks) <= 1:
+            return chunks[:top_k], True
+        if not self._ready:
+            # 모델 로드와 쌍당 지연 측정이 끝나기 전에는 예산 안에 끝날지 알 수 없으므로 1차 검색 순위를 그대로 쓴다.
+            self.start_warmup()
+            with self._lock:
+                self.skipped += 1
+            return chunks[:top_k], False
+        pair_ms = self._pair_ms
+        # 첫 배치조차 예산 안에 끝나지 않을 것으로 보이면 1차 검색 순위를 그대로 쓴다.
+        # 일시적인 부하로 추정치가 커진 채 굳지 않도록 연속으로 건너뛴 횟수가 쌓이면 한 번은 실제로 측정한다.
+        if pair_ms is not None and pair_ms * min(self.batch_size, len(chunks)) > self.max_latency_ms:
+            with self._lock:
+                probe = self._skips_in_row >= PROBE_AFTER_SKIPS
+                self._skips_in_row = 0 if probe else self._skips_in_row + 1
+                if probe:
+                    self._pair_ms = None
+                else:
+                    self.skipped += 1
+            if not probe:
+                return chunks[:top_k], False
+        model = get_cross_encoder(self.model_name)
+        started = time.perf_counter()
+        scores: list[float] = []
+        # 1차 순위가 높은 후보부터 배치 단위로 점수를 매기고, 다음 배치가 예산을 넘길 것 같으면 멈춘다.
+        for start in range(0, len(chunks), self.batch_size):
+            batch = chunks[start : start + self.batch_size]
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if scores and self._pair_ms is not None and elapsed_ms + self._pair_ms * len(batch) > self.max_latency_ms:
+                break
+            batch_started = time.perf_counter()
+            batch_scores = model.predict(
+                [(query, chunk.text) for chunk in batch],
+                batch_size=self.batch_size,
+                show_progress_bar=False,
+            )
+            self._observe(len(batch), time.perf_counter() - batch_started)
+            scores.extend(float(score) for score in batch_scores)
+        scored = sorted(range(len(scores)), key=lambda position: scores[position], reverse=True)
+        reranked = [chunks[position] for position in scored] + chunks[len(scores) :]
+        with self._lock:
+            self._skips_in_row = 0
+            self.reranked += 1
+            if len(scores) < len(chunks):
+                self.partial += 1
+        return reranked[:top_k], True
+
+    def stats(self) -> RerankStats:
+        with self._lock:
+            return RerankStats(
+                model_name=self.model_name,
+                reranked=self.reranked,
+                partial=self.partial,
+                skipped=self.skipped,
+                pair_ms=round(self._pair_ms or 0.0, 3),
+            )
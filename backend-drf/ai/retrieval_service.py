@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+import time
+from pathlib import Path
+from threading import Lock, Thread
+
+import numpy as np
+
+from query_cache import QueryCache, QueryCacheStats, normalize_query
+from rag_pipeline import (
+    DocumentChunk,
+    IndexArtifacts,
+    current_index_version,
+    embed_queries,
+    embedding_model,
+    embedding_namespace,
+    load_index,
+    search_embeddings,
+)
+from reranker import Reranker, RerankStats
+
+
+class RetrievalService:
+    def __init__(
+        self,
+        index_dir: Path,
+        *,
+        check_interval: float = 5.0,
+        cache_size: int = 1024,
+        cache_ttl_seconds: float | None = None,
+        reranker: Reranker | None = None,
+    ) -> None:
+        self.index_dir = index_dir
+        self.check_interval = check_interval
+        self.reranker = reranker
+        # 질의 임베딩은 모델이 같으면 인덱스가 바뀌어도 재사용하고, 검색 결과는 인덱스 버전별로 캐시한다.
+        self._embeddings = QueryCache("query_embeddings", max_entries=cache_size, ttl_seconds=cache_ttl_seconds)
+        self._results = QueryCache("search_results", max_entries=cache_size, ttl_seconds=cache_ttl_seconds)
+        self._lock = Lock()
+        self._artifacts: IndexArtifacts | None = None
+        self._last_check = 0.0
+        self._reloading = False
+
+    @property
+    def version(self) -> str | None:
+        artifacts = self._artifacts
+        return artifacts.version if artifacts else None
+
+    def current_version(self) -> str | None:
+        # 검색 없이 버전만 보는 호출(응답 캐시)도 check_interval마다 CURRENT를 확인해 인덱스 교체를 알아차린다.
+        self._maybe_reload()
+        return self.version
+
+    def warm(self) -> bool:
+        artifacts = self._ensure_loaded()
+        if artifacts is None:
+            return False
+        embedding_model(artifacts)
+        if self.reranker is not None:
+            self.reranker.warm()
+        return True
+
+    def refresh(self) -> None:
+        with self._lock:
+            self._last_check = 0.0
+        self._maybe_reload()
+
+    def cache_stats(self) -> list[QueryCacheStats]:
+        return [self._embeddings.stats(), self._results.stats()]
+
+    def rerank_stats(self) -> RerankStats | None:
+        return self.reranker.stats() if self.reranker is not None else None
+
+    def search(
+        self,
+        query: str,
+        *,
+        top_k: int = 4,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+        hybrid: bool = True,
+        rerank: bool = True,
+    ) -> list[DocumentChunk]:
+        return self.search_many(
+            [query], top_k=top_k, nprobe=nprobe, ef_search=ef_search, hybrid=hybrid, rerank=rerank
+        )[0]
+
+    def search_many(
+        self,
+        queries: list[str],
+        *,
+        top_k: int = 4,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+        hybrid: bool = True,
+        rerank: bool = True,
+    ) -> list[list[DocumentChunk]]:
+        artifacts = self._ensure_loaded()
+        if artifacts is None:
+            return [[] for _ in queries]
+        self._maybe_reload()
+        reranker = self.reranker if rerank else None
+        normalized = [normalize_query(query) for query in queries]
+        reranked = reranker is not None
+        keys = [(artifacts.version, query, top_k, nprobe, ef_search, hybrid, reranked) for query in normalized]
+        results: list[list[DocumentChunk] | None] = [self._results.get(key) for key in keys]
+        missing = [position for position, result in enumerate(results) if result is None]
+        if missing:
+            missing_queries = [normalized[position] for position in missing]
+            embeddings = self._query_embeddings(artifacts, missing_queries)
+            found = search_embeddings(
+                artifacts,
+                missing_queries,
+                embeddings,
+                top_k=max(reranker.candidates, top_k) if reranker is not None else top_k,
+                nprobe=nprobe,
+                ef_search=ef_search,
+                hybrid=hybrid,
+            )
+            cacheable = [True] * len(found)
+            if reranker is not None:
+                # 후보를 넉넉히 가져와 cross-encoder로 다시 매겨 상위 top_k만 남긴다.
+                # 워밍업 중이거나 예산 초과로 리랭크를 건너뛴 결과는 리랭크 키로 캐시하지 않아, 모델이 준비된 뒤 다시 매기게 한다.
+                reranked_results = [
+                    reranker.rerank(query, chunks, top_k=top_k) for query, chunks in zip(missing_queries, found)
+                ]
+                found = [chunks for chunks, _ in reranked_results]
+                cacheable = [done for _, done in reranked_results]
+            for position, result, cache in zip(missing, found, cacheable):
+                if cache:
+                    self._results.put(keys[position], result)
+                results[position] = result
+        return [list(result) for result in results if result is not None]
+
+    def _query_embeddings(self, artifacts: IndexArtifacts, queries: list[str]) -> np.ndarray:
+        keys = [(embedding_namespace(artifacts), query) for query in queries]
+        vectors = [self._embeddings.get(key) for key in keys]
+        missing = [position for position, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = embed_queries(artifacts, [queries[position] for position in missing])
+            for position, vector in zip(missing, computed):
+                self._embeddings.put(keys[position], vector)
+                vectors[position] = vector
+        return np.stack(vectors)
+
+    def _ensure_loaded(self) -> IndexArtifacts | None:
+        artifacts = self._artifacts
+        if artifacts is not None:
+            return artifacts
+        with self._lock:
+            if self._artifacts is None and current_index_version(self.index_dir) is not None:
+                self._artifacts = load_index(self.index_dir)
+                self._last_check = time.monotonic()
+            return self._artifacts
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._reloading or now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            version = current_index_version(self.index_dir)
+            if version is None or version == self.version:
+                return
+            self._reloading = True
+        Thread(target=self._reload, args=(version,), daemon=True).start()
+
+    def _reload(self, version: str) -> None:
+        try:
+            artifacts = load_index(self.index_dir)
+            # 검색 모델을 미리 올려 교체 직후 첫 질의가 모델 로드를 기다리지 않게 한다.
+            embedding_model(artifacts)
+            with self._lock:
+                self._artifacts = artifacts
+            # 결과 키에 버전이 들어 있어 이전 결과가 다시 쓰이지는 않지만, 메모리를 바로 돌려받도록 비운다.
+            self._results.clear()
+            logging.info("검색 인덱스 교체 완료: %s", artifacts.version or version)
+        except Exception:
+            logging.exception("검색 인덱스 재로드 실패: %s", version)
+        finally:
+            with self._lock:
+                self._reloading = False
@@ -1,6 +1,52 @@
+from threading import Thread
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreAppConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self) -> None:
+        from .llm_client import configure_llm_client
+        from .prompt_cache import configure_prompt_cache
+        from .response_cache import configure_response_cache
+        from .retrieval import configure_retrieval
+
+        configure_retrieval(
+            cache_size=settings.RETRIEVAL_CACHE_SIZE,
+            cache_ttl_seconds=settings.RETRIEVAL_CACHE_TTL_SECONDS,
+            rerank_model=settings.RERANK_MODEL if settings.RERANK_ENABLED else None,
+            rerank_candidates=settings.RERANK_CANDIDATES,
+            rerank_batch_size=settings.RERANK_BATCH_SIZE,
+            rerank_max_latency_ms=settings.RERANK_MAX_LATENCY_MS,
+            embedding_backend=settings.EMBEDDING_BACKEND,
+        )
+        configure_llm_client(
+            timeout_seconds=settings.OPENAI_TIMEOUT_SECONDS,
+            connect_timeout_seconds=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry_seconds=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            http2=settings.OPENAI_HTTP2,
+        )
+        configure_response_cache(
+            enabled=settings.RESPONSE_CACHE_ENABLED,
+            model_name=settings.RESPONSE_CACHE_MODEL,
+            threshold=settings.RESPONSE_CACHE_THRESHOLD,
+            max_entries=settings.RESPONSE_CACHE_SIZE,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+        configure_prompt_cache(
+            backend=settings.PROMPT_CACHE_BACKEND,
+            max_entries=settings.PROMPT_CACHE_SIZE,
+            ttl_seconds=settings.PROMPT_CACHE_TTL_SECONDS,
+            redis_url=settings.PROMPT_CACHE_REDIS_URL,
+        )
+        if settings.RETRIEVAL_WARMUP:
+            from .retrieval import warm_embedding_models, warm_retrieval
+
+            query_models = [settings.RESPONSE_CACHE_MODEL] if settings.RESPONSE_CACHE_ENABLED else []
+            Thread(target=warm_embedding_models, args=(query_models,), daemon=True).start()
+            Thread(target=warm_retrieval, daemon=True).start()
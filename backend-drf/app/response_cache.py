@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from itertools import count
+from threading import Lock
+from typing import Any, Callable
+
+import numpy as np
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_question(question: str) -> str:
+    return WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", question)).strip().lower()
+
+
+@dataclass
+class CachedAnswer:
+    answer: str
+    reference: str
+    tokens: int
+
+
+@dataclass
+class LlmCacheStats:
+    name: str
+    entries: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    tokens_saved: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    embedding: np.ndarray
+    value: CachedAnswer
+    stored_at: float
+
+
+class SemanticResponseCache:
+    # 질문 임베딩의 코사인 유사도가 threshold 이상인 이전 답변을 돌려준다. 모델(namespace)마다 따로 찾고,
+    # 전체 항목 수는 max_entries로 제한해 가장 오래 쓰지 않은 항목부터 지운다.
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray],
+        *,
+        threshold: float = 0.95,
+        max_entries: int = 1024,
+        ttl_seconds: float | None = 86400,
+    ) -> None:
+        self.embed = embed
+        self.threshold = threshold
+        self.capacity = max(max_entries, 0)
+        self.ttl_seconds = ttl_seconds or None
+        self._lock = Lock()
+        self._ids = count()
+        self._entries: OrderedDict[int, tuple[str, _Entry]] = OrderedDict()
+        self._matrices: dict[str, tuple[list[int], np.ndarray]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.tokens_saved = 0
+
+    def _namespace_matrix(self, namespace: str) -> tuple[list[int], np.ndarray]:
+        # 항목이 바뀔 때만 namespace별 임베딩 행렬을 다시 쌓아 조회는 행렬-벡터 곱 한 번으로 끝낸다.
+        cached = self._matrices.get(namespace)
+        if cached is None:
+            ids = [entry_id for entry_id, (name, _) in self._entries.items() if name == namespace]
+            vectors = [self._entries[entry_id][1].embedding for entry_id in ids]
+            matrix = np.stack(vectors) if vectors else np.zeros((0, 0), dtype="float32")
+            cached = self._matrices[namespace] = (ids, matrix)
+        return cached
+
+    def _remove(self, entry_id: int) -> None:
+        namespace, _ = self._entries.pop(entry_id)
+        self._matrices.pop(namespace, None)
+
+    def lookup(self, namespace: str, question: str) -> tuple[CachedAnswer | None, np.ndarray]:
+        embedding = np.asarray(self.embed(normalize_question(question)), dtype="float32")
+        with self._lock:
+            ids, matrix = self._namespace_matrix(namespace)
+            if ids:
+                scores = matrix @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    entry_id = ids[best]
+                    entry = self._entries[entry_id][1]
+                    if self.ttl_seconds is not None and time.monotonic() - entry.stored_at > self.ttl_seconds:
+                        self._remove(entry_id)
+                        self.expirations += 1
+                    else:
+                        self._entries.move_to_end(entry_id)
+                        self.hits += 1
+                        self.tokens_saved += entry.value.tokens
+                        return entry.value, embedding
+            self.misses += 1
+        return None, embedding
+
+    def store(self, namespace: str, embedding: np.ndarray, value: CachedAnswer) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._entries[next(self._ids)] = (namespace, _Entry(embedding, value, time.monotonic()))
+            self._matrices.pop(namespace, None)
+            while len(self._entries) > self.capacity:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._matrices.clear()
+
+    def stats(self, name: str) -> LlmCacheStats:
+        with self._lock:
+            return LlmCacheStats(
+                name=name,
+                entries=len(self._entries),
+                capacity=self.capacity,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                tokens_saved=self.tokens_saved,
+            )
+
+
+_lock = Lock()
+_cache: SemanticResponseCache | None = None
+_cache_options: dict[str, Any] = {}
+
+
+def configure_response_cache(
+    *,
+    enabled: bool,
+    model_name: str,
+    threshold: float,
+    max_entries: int,
+    ttl_seconds: float,
+) -> None:
+    # 캐시가 처음 쓰일 때 적용되므로 서버 시작 시 호출한다.
+    _cache_options.clear()
+    if enabled:
+        _cache_options.update(
+            model_name=model_name,
+            threshold=threshold,
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+
+def get_response_cache() -> SemanticResponseCache | None:
+    global _cache
+    if not _cache_options:
+        return None
+    if _cache is not None:
+        return _cache
+    with _lock:
+        if _cache is None:
+            from .retrieval import embed_query
+
+            model_name = _cache_options["model_name"]
+            _cache = SemanticResponseCache(
+                lambda text: embed_query(model_name, text),
+                threshold=_cache_options["threshold"],
+                max_entries=_cache_options["max_entries"],
+                ttl_seconds=_cache_options["ttl_seconds"],
+            )
+    return _cache
+
+
+def response_cache_stats() -> list[dict[str, Any]]:
+    if _cache is None:
+        return []
+    stats = _cache.stats("chat_semantic")
+    return [{**asdict(stats), "hit_rate": round(stats.hit_rate, 4)}]
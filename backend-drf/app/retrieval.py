@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+import sys
+from pathlib import Path
+from dataclasses import asdict
+from threading import Lock
+from typing import Any, Callable, Iterable
+
+AI_DIR = Path(__file__).resolve().parents[1] / "ai"
+INDEX_DIR = AI_DIR / "index"
+
+_lock = Lock()
+_service: Any = None
+_service_options: dict[str, Any] = {}
+_rerank_options: dict[str, Any] = {}
+_embedding_backend: str | None = None
+_ingest_worker: Any = None
+
+
+def _ensure_ai_path() -> None:
+    # ai/ 스크립트는 모듈을 최상위 이름으로 import하므로 경로를 추가한 뒤 불러온다.
+    if str(AI_DIR) not in sys.path:
+        sys.path.insert(0, str(AI_DIR))
+
+
+def configure_retrieval(
+    *,
+    cache_size: int,
+    cache_ttl_seconds: float,
+    rerank_model: str | None = None,
+    rerank_candidates: int = 20,
+    rerank_batch_size: int = 16,
+    rerank_max_latency_ms: float = 150.0,
+    embedding_backend: str | None = None,
+) -> None:
+    # 검색 서비스가 처음 만들어질 때 적용되므로 서버 시작 시 호출한다.
+    global _embedding_backend
+    _embedding_backend = embedding_backend
+    _service_options.update(cache_size=cache_size, cache_ttl_seconds=cache_ttl_seconds or None)
+    _rerank_options.clear()
+    if rerank_model:
+        _rerank_options.update(
+            model_name=rerank_model,
+            candidates=rerank_candidates,
+            batch_size=rerank_batch_size,
+            max_latency_ms=rerank_max_latency_ms,
+        )
+
+
+def get_retrieval_service() -> Any:
+    global _service
+    if _service is not None:
+        return _service
+    with _lock:
+        if _service is None:
+            _ensure_ai_path()
+            from reranker import Reranker
+            from retrieval_service import RetrievalService
+
+            reranker = Reranker(**_rerank_options) if _rerank_options else None
+            if reranker is not None:
+                # 리랭크 모델은 검색 서비스를 만들 때 백그라운드에서 올려, 첫 요청이 모델 로드를 기다리지 않게 한다.
+                reranker.start_warmup()
+            _service = RetrievalService(INDEX_DIR, reranker=reranker, **_service_options)
+    return _service
+
+
+def warm_retrieval() -> None:
+    try:
+        if get_retrieval_service().warm():
+            logging.info("검색 인덱스 워밍업 완료")
+        else:
+            logging.info("검색 인덱스가 없어 워밍업을 건너뜁니다.")
+    except Exception:
+        logging.exception("검색 인덱스 워밍업 실패")
+
+
+def warm_embedding_models(query_models: Iterable[str] = ()) -> None:
+    # 인덱싱/검색 기본 임베딩 모델과 질의 임베딩용 모델(응답 캐시 등)을 첫 요청 전에 올려 둔다.
+    # 로드 시간과 메모리는 model_registry에 기록되어 retrieval_model_stats로 확인한다.
+    try:
+        _ensure_ai_path()
+        from ingest import IngestOptions
+        from model_registry import warm_models
+
+        warm_models([IngestOptions.model], _embedding_backend or IngestOptions.embedding_backend)
+        warm_models(query_models)
+    except Exception:
+        logging.exception("임베딩 모델 워밍업 실패")
+
+
+def refresh_retrieval() -> None:
+    if _service is not None:
+        _service.refresh()
+
+
+def retrieval_cache_stats() -> list[dict[str, Any]]:
+    if _service is None:
+        return []
+    return [{**asdict(stats), "hit_rate": round(stats.hit_rate, 4)} for stats in _service.cache_stats()]
+
+
+def retrieval_rerank_stats() -> dict[str, Any] | None:
+    stats = _service.rerank_stats() if _service is not None else None
+    return asdict(stats) if stats is not None else None
+
+
+def retrieval_model_stats() -> list[dict[str, Any]]:
+    # 모델을 아직 한 번도 올리지 않았으면 통계 조회만으로 sentence_transformers를 import하지 않는다.
+    registry = sys.modules.get("model_registry")
+    if registry is None:
+        return []
+    return [asdict(stats) for stats in registry.get_model_stats()]
+
+
+def embed_query(model_name: str, text: str) -> Any:
+    # 검색 인덱스와 같은 model_registry를 써서 같은 모델이면 메모리에 한 번만 올린다.
+    _ensure_ai_path()
+    from model_registry import get_model
+    from rag_pipeline import embed_texts
+
+    return embed_texts(get_model(model_name), [text], is_query=True)[0]
+
+
+def _ingest_options(paths: Iterable[Path], urls: Iterable[str]) -> Any:
+    _ensure_ai_path()
+    from ingest import IngestOptions
+
+    # 검색은 인덱스에 기록된 백엔드를 따르므로 백엔드 설정은 인덱싱할 때만 반영된다.
+    return IngestOptions(
+        inputs=[str(path) for path in paths],
+        urls=list(urls),
+        output_dir=str(INDEX_DIR),
+        incremental=True,
+        embedding_backend=_embedding_backend or IngestOptions.embedding_backend,
+    )
+
+
+def run_ingest(
+    paths: Iterable[Path],
+    urls: Iterable[str],
+    *,
+    on_progress: Callable[[dict[str, Any]], None],
+) -> dict[str, Any]:
+    # 호출한 프로세스 안에서 바로 인덱싱한다. 임베딩 모델은 model_registry에 남아 다음 실행에서 재사용된다.
+    options = _ingest_options(paths, urls)
+    from ingest import run_ingest as run_ingest_job
+
+    return run_ingest_job(options, on_event=on_progress, log=logging.info)
+
+
+def get_ingest_worker() -> Any:
+    global _ingest_worker
+    if _ingest_worker is not None:
+        return _ingest_worker
+    with _lock:
+        if _ingest_worker is None:
+            _ensure_ai_path()
+            from ingest import IngestOptions
+            from ingest_worker import IngestWorker
+
+            _ingest_worker = IngestWorker(
+                warm_model=IngestOptions.model,
+                warm_backend=_embedding_backend or IngestOptions.embedding_backend,
+            )
+    return _ingest_worker
+
+
+def run_ingest_in_worker(
+    paths: Iterable[Path],
+    urls: Iterable[str],
+    *,
+    on_progress: Callable[[dict[str, Any]], None],
+) -> dict[str, Any]:
+    return get_ingest_worker().submit(_ingest_options(paths, urls), on_event=on_progress)
+
+
+def stop_ingest_worker() -> None:
+    if _ingest_worker is not None:
+        _ingest_worker.stop()
+
+
+def build_rag_messages(question: str, chunks: list[Any]) -> list[dict[str, str]]:
+    _ensure_ai_path()
+    from query import build_prompt, format_contexts
+
+    return build_prompt(question, format_contexts(chunks))
+
+
+def _display_source(source: str) -> str:
+    base_dir = str(AI_DIR.parent)
+    if source.startswith(base_dir):
+        return source[len(base_dir) :].lstrip("/")
+    return source
+
+
+def format_rag_references(chunks: list[Any]) -> str:
+    sources: list[str] = []
+    for chunk in chunks:
+        source = _display_source(chunk.source)
+        if source not in sources:
+            sources.append(source)
+    return " ".join(sources)
@@ -217,6 +217,18 @@ class AdminTrafficStatsSerializer(serializers.Serializer):
     buckets = AdminTrafficBucketSerializer(many=True)
 
 
+class LlmCacheStatsSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    entries = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    evictions = serializers.IntegerField()
+    expirations = serializers.IntegerField()
+    tokens_saved = serializers.IntegerField()
+    hit_rate = serializers.FloatField()
+
+
 class LlmUsageSerializer(serializers.Serializer):
     provider = serializers.CharField()
     model = serializers.CharField()
@@ -226,6 +238,20 @@ class LlmUsageSerializer(serializers.Serializer):
     prompt_tokens = serializers.IntegerField()
     completion_tokens = serializers.IntegerField()
     last_updated = serializers.DateTimeField(allow_null=True)
+    caches = LlmCacheStatsSerializer(many=True)
+
+
+class LlmPoolStatsSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    http2 = serializers.BooleanField()
+    max_connections = serializers.IntegerField()
+    connections_open = serializers.IntegerField()
+    connections_idle = serializers.IntegerField()
+    requests_in_flight = serializers.IntegerField()
+    requests_waiting = serializers.IntegerField()
+    requests = serializers.IntegerField()
+    connections_created = serializers.IntegerField()
+    connections_reused = serializers.IntegerField()
 
 
 class LearnStatusSerializer(serializers.Serializer):
@@ -234,5 +260,31 @@ class LearnStatusSerializer(serializers.Serializer):
     message = serializers.CharField()
 
 
+class RetrievalCacheStatsSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    entries = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
+    evictions = serializers.IntegerField()
+    expirations = serializers.IntegerField()
+    hit_rate = serializers.FloatField()
+
+
+class RerankStatsSerializer(serializers.Serializer):
+    model_name = serializers.CharField()
+    reranked = serializers.IntegerField()
+    partial = serializers.IntegerField()
+    skipped = serializers.IntegerField()
+    pair_ms = serializers.FloatField()
+
+
+class ModelLoadStatsSerializer(serializers.Serializer):
+    model_name = serializers.CharField()
+    load_seconds = serializers.FloatField()
+    parameter_bytes = serializers.IntegerField()
+    rss_delta_bytes = serializers.IntegerField(allow_null=True)
+
+
 class WebDocumentPayloadSerializer(serializers.Serializer):
     url = serializers.URLField()
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
 import re
-import subprocess
-import sys
-import time
 import json
 from pathlib import Path
+from typing import Any
 
 from celery import shared_task
 from django.core.serializers.json import DjangoJSONEncoder
@@ -13,6 +11,7 @@ from django.core.serializers.json import DjangoJSONEncoder
 from .errors import AppError
 from .models import BackgroundJob, User
 from .quiz_logic import generate_quiz_for_user, quiz_to_response, run_quiz_job
+from .retrieval import run_ingest
 
 DOCS_ROOT = Path(__file__).resolve().parents[1] / "ai" / "docs"
 DOCS_WEB_URLS = DOCS_ROOT / "web" / "urls.txt"
@@ -55,19 +54,6 @@ def _has_supported_files() -> bool:
     return False
 
 
-def _simulate_progress(job_id: str, start: int, end: int, message: str, steps: int = 8) -> None:
-    _update_job(job_id, status="running", progress=start, message=message)
-    if steps <= 0:
-        _update_job(job_id, status="running", progress=end, message=message)
-        return
-    increment = max(1, (end - start) // steps)
-    current = start
-    while current < end:
-        time.sleep(0.35)
-        current = min(end, current + increment)
-        _update_job(job_id, status="running", progress=current, message=message)
-
-
 @shared_task(name="app.tasks.run_admin_generate_quiz")
 def run_admin_generate_quiz(job_id: str, target_user_id: str, admin_user_id: int) -> None:
     _update_job(job_id, status="running", progress=0)
@@ -125,23 +111,19 @@ def run_docs_learning_job(job_id: str) -> None:
             _update_job(job_id, status="failed", progress=100, message="학습할 문서가 없습니다.", error="학습할 문서가 없습니다.")
             return
 
-        _simulate_progress(job_id, 0, 20, "문서/URL 수집 중", steps=6)
-        _simulate_progress(job_id, 20, 45, "문서 정제 및 청킹 중", steps=8)
-        _simulate_progress(job_id, 45, 80, "임베딩 생성 및 인덱스 구성 중", steps=10)
-
-        command = [sys.executable, "ai/ingest.py", "--input", str(DOCS_ROOT), "--output-dir", "ai/index"]
-        for url in urls:
-            command.extend(["--url", url])
-        subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).resolve().parents[1],
+        def report(event: dict[str, Any]) -> None:
+            _update_job(job_id, status="running", progress=min(int(event["progress"]), 99), message=event["message"])
+
+        result = run_ingest([DOCS_ROOT], urls, on_progress=report)
+        metrics = {key: value for key, value in result.items() if key not in {"event", "stage", "progress", "message"}}
+        _update_job(
+            job_id,
+            status="completed",
+            progress=100,
+            message=result.get("message", "학습 완료"),
+            result=metrics,
+            error="",
         )
-
-        _simulate_progress(job_id, 80, 100, "인덱스 저장 중", steps=6)
-        _update_job(job_id, status="completed", progress=100, message="학습 완료", error="")
     except Exception as exc:
         _update_job(job_id, status="failed", progress=100, message=f"학습 실패: {exc}", error=str(exc))
 
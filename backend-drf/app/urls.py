@@ -16,6 +16,7 @@ urlpatterns = [
     path("auth/coach/students/<str:student_user_id>", views_auth.coach_remove_student),
 
     path("chat/ask", views_chat.ask_chat),
+    path("chat/ask/stream", views_chat.ask_chat_stream),
     path("chat/history", views_chat.get_chat_history_dates),
     path("chat/history/<str:date_str>", views_chat.get_chat_history),
     path("chat/summarize", views_chat.summarize_day),
@@ -45,6 +46,10 @@ urlpatterns = [
     path("admin/docs/web", views_docs_admin.upload_web_document),
     path("admin/docs/learn", views_docs_admin.start_learning),
     path("admin/docs/learn/status", views_docs_admin.get_learning_status),
+    path("admin/docs/retrieval/cache", views_docs_admin.get_retrieval_cache_stats),
+    path("admin/docs/retrieval/rerank", views_docs_admin.get_retrieval_rerank_stats),
+    path("admin/docs/retrieval/models", views_docs_admin.get_retrieval_model_stats),
 
     path("admin/llm/usage", views_llm_admin.get_llm_usage),
+    path("admin/llm/pool", views_llm_admin.get_llm_pool_stats),
 ]
@@ -1,6 +1,9 @@
+import json
+import logging
 from datetime import datetime
 from pathlib import Path
 
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -8,7 +11,7 @@ from rest_framework.response import Response
 from .models import ChatRecord, ChatSummary
 from .permissions import IsAuthenticatedJWT
 from .serializers import ChatRequestSerializer
-from .services import generate_chat_answer, sanitize_chat_text, summarize_chat
+from .services import generate_chat_answer, sanitize_chat_text, stream_chat_answer, summarize_chat
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 RECORD_DIR = BASE_DIR / "chat" / "record"
@@ -61,20 +64,8 @@ def _current_date_str() -> str:
     return datetime.utcnow().strftime("%Y-%m-%d")
 
 
-@api_view(["POST"])
-@permission_classes([IsAuthenticatedJWT])
-def ask_chat(request):
-    serializer = ChatRequestSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
-
-    message = serializer.validated_data["message"]
-    try:
-        answer, reference = generate_chat_answer(message)
-    except Exception:
-        return Response({"detail": "ChatGPT 응답을 불러오지 못했습니다."}, status=status.HTTP_502_BAD_GATEWAY)
-
+def _append_chat_record(user, message: str, answer: str, reference: str) -> Path:
     date_str = _current_date_str()
-    user = request.user
     user_dir = RECORD_DIR / user.user_id
     _ensure_dir(user_dir)
     file_path = user_dir / f"{user.user_id}-{date_str}.txt"
@@ -87,9 +78,60 @@ def ask_chat(request):
         file.write("\n")
 
     ChatRecord.objects.create(user=user, file_path=str(file_path))
+    return file_path
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticatedJWT])
+def ask_chat(request):
+    serializer = ChatRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    message = serializer.validated_data["message"]
+    try:
+        answer, reference = generate_chat_answer(message)
+    except Exception:
+        return Response({"detail": "ChatGPT 응답을 불러오지 못했습니다."}, status=status.HTTP_502_BAD_GATEWAY)
+
+    file_path = _append_chat_record(request.user, message, answer, reference)
     return Response({"answer": answer, "reference": reference, "file_path": str(file_path)})
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticatedJWT])
+def ask_chat_stream(request):
+    # text/event-stream으로 답변 조각(delta)을 받는 즉시 보내고, 끝나면 정리된 전체 답변(done)을 보낸 뒤 기록한다.
+    serializer = ChatRequestSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    message = serializer.validated_data["message"]
+    user = request.user
+
+    def events():
+        try:
+            for event in stream_chat_answer(message):
+                if event["type"] == "delta":
+                    yield _sse("delta", {"text": event["text"]})
+                    continue
+                file_path = _append_chat_record(user, message, event["answer"], event["reference"])
+                yield _sse(
+                    "done",
+                    {"answer": event["answer"], "reference": event["reference"], "file_path": str(file_path)},
+                )
+        except Exception:
+            logging.exception("채팅 스트리밍 중 오류 발생")
+            yield _sse("error", {"detail": "ChatGPT 응답을 불러오지 못했습니다."})
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticatedJWT])
 def get_chat_history_dates(request):
@@ -8,7 +8,14 @@ from rest_framework.response import Response
 
 from .models import BackgroundJob
 from .permissions import IsAdminRole
-from .serializers import LearnStatusSerializer, WebDocumentPayloadSerializer
+from .retrieval import retrieval_cache_stats, retrieval_model_stats, retrieval_rerank_stats
+from .serializers import (
+    LearnStatusSerializer,
+    ModelLoadStatsSerializer,
+    RerankStatsSerializer,
+    RetrievalCacheStatsSerializer,
+    WebDocumentPayloadSerializer,
+)
 from .tasks import DOCS_FOLDERS, DOCS_ROOT, DOCS_WEB_URLS, run_docs_learning_job
 
 
@@ -97,3 +104,22 @@ def get_learning_status(request):
             "message": latest.message or "",
         }
     return Response(LearnStatusSerializer(payload).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def get_retrieval_cache_stats(request):
+    return Response(RetrievalCacheStatsSerializer(retrieval_cache_stats(), many=True).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def get_retrieval_rerank_stats(request):
+    stats = retrieval_rerank_stats()
+    return Response(RerankStatsSerializer(stats).data if stats is not None else None)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def get_retrieval_model_stats(request):
+    return Response(ModelLoadStatsSerializer(retrieval_model_stats(), many=True).data)
@@ -1,12 +1,17 @@
+from dataclasses import asdict
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 
 from django.conf import settings
 
+from .llm_client import llm_pool_stats
 from .llm_usage import get_usage_snapshot
 from .openai_usage import fetch_openai_usage
 from .permissions import IsAdminRole
-from .serializers import LlmUsageSerializer
+from .prompt_cache import prompt_cache_stats
+from .response_cache import response_cache_stats
+from .serializers import LlmPoolStatsSerializer, LlmUsageSerializer
 
 
 @api_view(["GET"])
@@ -25,5 +30,12 @@ def get_llm_usage(request):
         "prompt_tokens": snapshot.prompt_tokens,
         "completion_tokens": snapshot.completion_tokens,
         "last_updated": snapshot.updated_at,
+        "caches": response_cache_stats() + prompt_cache_stats(),
     }
     return Response(LlmUsageSerializer(payload).data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminRole])
+def get_llm_pool_stats(request):
+    return Response(LlmPoolStatsSerializer([asdict(stats) for stats in llm_pool_stats()], many=True).data)
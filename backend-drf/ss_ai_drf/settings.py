@@ -132,8 +132,35 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_TOKEN_BUDGET = _env_int("OPENAI_TOKEN_BUDGET", 128000)
 OPENAI_USAGE_ENDPOINT = os.getenv("OPENAI_USAGE_ENDPOINT", "https://api.openai.com/v1/usage")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_TIMEOUT_SECONDS = _env_int("OPENAI_TIMEOUT_SECONDS", 60)
+OPENAI_LONG_TIMEOUT_SECONDS = _env_int("OPENAI_LONG_TIMEOUT_SECONDS", 180)
+OPENAI_CONNECT_TIMEOUT_SECONDS = _env_int("OPENAI_CONNECT_TIMEOUT_SECONDS", 5)
+OPENAI_MAX_CONNECTIONS = _env_int("OPENAI_MAX_CONNECTIONS", 100)
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = _env_int("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20)
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = _env_int("OPENAI_KEEPALIVE_EXPIRY_SECONDS", 30)
+OPENAI_HTTP2 = _env_bool("OPENAI_HTTP2", True)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+RETRIEVAL_WARMUP = _env_bool("RETRIEVAL_WARMUP", False)
+RAG_CHAT_ENABLED = _env_bool("RAG_CHAT_ENABLED", False)
+RAG_TOP_K = _env_int("RAG_TOP_K", 4)
+RETRIEVAL_CACHE_SIZE = _env_int("RETRIEVAL_CACHE_SIZE", 1024)
+RETRIEVAL_CACHE_TTL_SECONDS = _env_int("RETRIEVAL_CACHE_TTL_SECONDS", 0)
+RERANK_ENABLED = _env_bool("RERANK_ENABLED", False)
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1")
+RERANK_CANDIDATES = _env_int("RERANK_CANDIDATES", 20)
+RERANK_BATCH_SIZE = _env_int("RERANK_BATCH_SIZE", 16)
+RERANK_MAX_LATENCY_MS = _env_int("RERANK_MAX_LATENCY_MS", 150)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+RESPONSE_CACHE_ENABLED = _env_bool("RESPONSE_CACHE_ENABLED", False)
+RESPONSE_CACHE_MODEL = os.getenv("RESPONSE_CACHE_MODEL", "intfloat/multilingual-e5-small")
+RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.95"))
+RESPONSE_CACHE_SIZE = _env_int("RESPONSE_CACHE_SIZE", 1024)
+RESPONSE_CACHE_TTL_SECONDS = _env_int("RESPONSE_CACHE_TTL_SECONDS", 86400)
+PROMPT_CACHE_BACKEND = os.getenv("PROMPT_CACHE_BACKEND", "redis")
+PROMPT_CACHE_SIZE = _env_int("PROMPT_CACHE_SIZE", 256)
+PROMPT_CACHE_TTL_SECONDS = _env_int("PROMPT_CACHE_TTL_SECONDS", 86400)
+PROMPT_CACHE_REDIS_URL = os.getenv("PROMPT_CACHE_REDIS_URL", "redis://redis:6379/2")
 
 CORS_ALLOWED_ORIGINS = _env_json_list("CORS_ALLOW_ORIGINS", [])
 _cors_regex = os.getenv("CORS_ALLOW_ORIGIN_REGEX", r"^https?://(localhost|127\\.0\\.0\\.1)(:\\d+)?$")
@@ -159,6 +186,11 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 CELERY_ENABLE_UTC = True
+CELERY_INGEST_QUEUE = os.getenv("CELERY_INGEST_QUEUE", "ingest")
+# 문서 학습은 임베딩 모델을 메모리에 유지하는 전용 워커(-Q ingest -c 1)에서만 처리한다.
+CELERY_TASK_ROUTES = {
+    "app.tasks.run_docs_learning_job": {"queue": CELERY_INGEST_QUEUE},
+}
 CELERY_BEAT_SCHEDULE = {
     "cron-quiz-job-every-5-minutes": {
         "task": "app.tasks.run_periodic_quiz_job",
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from chunker import split_sentences
+from document_loader import load_documents
+from ingest import _directory_size
+from model_registry import get_model
+from rag_pipeline import build_index, make_chunker, save_index, search
+
+
+def parse_args() -> argparse.Namespace:
+    default_docs_dir = Path(__file__).resolve().parent / "docs"
+    parser = argparse.ArgumentParser(description="청킹 방식 비교 벤치마크 (chars vs tokens: 인덱스 크기/검색 적중률)")
+    parser.add_argument("--input", action="append", default=[], help="파일 또는 디렉터리 경로")
+    parser.add_argument("--model", default="intfloat/multilingual-e5-small", help="임베딩 모델 이름")
+    parser.add_argument("--max-chars", type=int, default=1000, help="chars 방식 청크 최대 길이")
+    parser.add_argument("--overlap", type=int, default=200, help="chars 방식 청크 겹침 길이")
+    parser.add_argument("--max-tokens", type=int, default=0, help="tokens 방식 청크 최대 토큰 수 (0이면 모델 입력 길이)")
+    parser.add_argument("--overlap-tokens", type=int, default=64, help="tokens 방식 청크 겹침 토큰 수")
+    parser.add_argument("--queries", type=int, default=200, help="질의로 쓸 문장 수 (문서에서 무작위 추출)")
+    parser.add_argument("--min-query-chars", type=int, default=30, help="질의로 쓸 문장의 최소 길이")
+    parser.add_argument("--top-k", type=int, default=4, help="적중 판정에 쓸 검색 결과 수")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if not args.input:
+        args.input = [str(default_docs_dir)]
+    return args
+
+
+def _sample_queries(texts: list[str], count: int, min_chars: int, seed: int) -> list[str]:
+    # 문서 안의 문장을 질의로 쓰고, 그 문장을 그대로 포함한 청크가 top-k 안에 있으면 적중으로 본다.
+    sentences = sorted({sentence for text in texts for sentence, _ in split_sentences(text) if len(sentence) >= min_chars})
+    return random.Random(seed).sample(sentences, min(count, len(sentences)))
+
+
+def main() -> None:
+    args = parse_args()
+    documents = load_documents([Path(path_str) for path_str in args.input], [])
+    if not documents:
+        raise SystemExit("비교할 문서가 없습니다.")
+    queries = _sample_queries([doc.text for doc in documents], args.queries, args.min_query_chars, args.seed)
+    tokenizer = get_model(args.model).tokenizer
+
+    print(f"문서 {len(documents)}개, 질의 {len(queries)}개, top-{args.top_k}")
+    print(
+        f"{'chunker':>8} {'chunks':>8} {'avg_tok':>8} {'max_tok':>8} {'fill':>6} "
+        f"{'index_MiB':>10} {'build_s':>8} {'hit@k':>7}"
+    )
+    token_window = make_chunker(args.model, {"chunker": "tokens", "max_tokens": args.max_tokens}).max_tokens
+    for chunker in ("chars", "tokens"):
+        started = time.perf_counter()
+        artifacts = build_index(
+            documents,
+            model_name=args.model,
+            max_chars=args.max_chars,
+            overlap=args.overlap,
+            chunker=chunker,
+            max_tokens=args.max_tokens,
+            overlap_tokens=args.overlap_tokens,
+        )
+        build_seconds = time.perf_counter() - started
+        with tempfile.TemporaryDirectory() as temp_dir:
+            save_index(artifacts, Path(temp_dir))
+            index_bytes = _directory_size(Path(temp_dir))
+
+        texts = [chunk.text for _, chunk in artifacts.chunks.items()]
+        token_counts = [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+        hits = 0
+        for query in queries:
+            results = search(artifacts, query, top_k=args.top_k)
+            hits += any(query in chunk.text for chunk in results)
+        avg_tokens = sum(token_counts) / max(len(token_counts), 1)
+        print(
+            f"{chunker:>8} {len(texts):>8} {avg_tokens:>8.0f} {max(token_counts, default=0):>8} "
+            f"{avg_tokens / token_window:>6.0%} {index_bytes / 1024 / 1024:>10.2f} {build_seconds:>8.2f} "
+            f"{hits / max(len(queries), 1):>7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+from document_loader import iter_fetched_urls, iter_loaded_files, iter_source_files
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="문서 병렬 로딩 벤치마크 (작업자 수별 소요 시간/가속비)")
+    parser.add_argument("--input", action="append", default=[], help="파일 또는 디렉터리 경로 (pdf/csv/txt/md 혼합)")
+    parser.add_argument("--url", action="append", default=[], help="웹페이지 URL")
+    parser.add_argument("--workers", help="비교할 파싱 프로세스 수 목록 (기본: 1,2,4,...,CPU 코어 수)")
+    parser.add_argument("--fetch-workers", default="1,8", help="비교할 URL 수집 스레드 수 목록")
+    parser.add_argument("--per-host", type=int, default=2, help="호스트별 동시 요청 수")
+    parser.add_argument("--generate", type=int, default=0, help="입력 대신 사용할 합성 csv/txt/md 파일 수")
+    parser.add_argument("--generate-dir", default="/tmp/ss-ai-bench-docs", help="합성 파일 저장 경로")
+    return parser.parse_args()
+
+
+def _default_worker_counts() -> list[int]:
+    cpu_count = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpu_count:
+        counts.append(counts[-1] * 2)
+    if cpu_count > 1:
+        counts.append(cpu_count)
+    return counts
+
+
+def _generate_documents(directory: Path, count: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    sentence = "문서 로딩 벤치마크용 문장입니다. Parallel loading benchmark sentence. "
+    for number in range(count):
+        kind = number % 3
+        if kind == 0:
+            rows = "\n".join(f"{row},항목 {row},{sentence}" for row in range(2000))
+            (directory / f"doc{number}.csv").write_text(f"id,name,description\n{rows}\n", encoding="utf-8")
+        elif kind == 1:
+            (directory / f"doc{number}.txt").write_text(sentence * 5000, encoding="utf-8")
+        else:
+            (directory / f"doc{number}.md").write_text(f"# 제목 {number}\n\n" + sentence * 5000, encoding="utf-8")
+
+
+def _time_files(paths: list[Path], workers: int) -> tuple[float, int, int]:
+    started = time.perf_counter()
+    documents = 0
+    chars = 0
+    for _, loaded in iter_loaded_files(paths, workers=workers):
+        documents += len(loaded)
+        chars += sum(len(doc.text) for doc in loaded)
+    return time.perf_counter() - started, documents, chars
+
+
+def _time_urls(urls: list[str], workers: int, per_host: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    documents = sum(len(loaded) for _, loaded in iter_fetched_urls(urls, workers=workers, per_host=per_host))
+    return time.perf_counter() - started, documents
+
+
+def main() -> None:
+    args = parse_args()
+    inputs = [Path(path_str) for path_str in args.input]
+    if args.generate:
+        generate_dir = Path(args.generate_dir)
+        _generate_documents(generate_dir, args.generate)
+        inputs.append(generate_dir)
+    if not inputs and not args.url:
+        inputs.append(Path(__file__).resolve().parent / "docs")
+    paths = list(iter_source_files(inputs))
+    worker_counts = [int(value) for value in args.workers.split(",")] if args.workers else _default_worker_counts()
+
+    if paths:
+        print(f"파일 {len(paths)}개, CPU 코어 {os.cpu_count()}개")
+        print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'documents':>10} {'chars':>12}")
+        baseline = None
+        for workers in worker_counts:
+            elapsed, documents, chars = _time_files(paths, workers)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {documents:>10} {chars:>12}")
+
+    if args.url:
+        print(f"URL {len(args.url)}개, 호스트별 동시 요청 {args.per_host}개")
+        print(f"{'threads':>8} {'seconds':>9} {'speedup':>8} {'documents':>10}")
+        baseline = None
+        for workers in [int(value) for value in args.fetch_workers.split(",")]:
+            elapsed, documents = _time_urls(args.url, workers, args.per_host)
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {baseline / elapsed:>7.2f}x {documents:>10}")
+
+
+if __name__ == "__main__":
+    main()
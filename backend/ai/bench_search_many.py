@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from bench_retrieval import _load_questions
+from retrieval_service import RetrievalService
+
+
+def parse_args() -> argparse.Namespace:
+    default_index_dir = Path(__file__).resolve().parent / "index"
+    parser = argparse.ArgumentParser(description="다중 질의 배치 검색 처리량 벤치마크 (search 반복 호출 대비)")
+    parser.add_argument("--index-dir", default=str(default_index_dir), help="인덱스 경로")
+    parser.add_argument("--questions", help="질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--top-k", type=int, default=4, help="검색 결과 수")
+    parser.add_argument("--batch-sizes", default="1,2,4,8,16,32,64,128,256", help="비교할 배치 크기 목록")
+    parser.add_argument("--queries", type=int, default=512, help="배치 크기마다 처리할 전체 질의 수")
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="질의 임베딩/검색 결과 캐시 크기 (기본 0: 같은 질문 반복이 캐시 적중으로 측정되지 않도록 끔)",
+    )
+    return parser.parse_args()
+
+
+def _queries_per_second(service: RetrievalService, queries: list[str], batch_size: int, top_k: int) -> float:
+    started = time.perf_counter()
+    for start in range(0, len(queries), batch_size):
+        service.search_many(queries[start : start + batch_size], top_k=top_k)
+    return len(queries) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    args = parse_args()
+    questions = _load_questions(args.questions)
+    queries = [questions[number % len(questions)] for number in range(args.queries)]
+    service = RetrievalService(Path(args.index_dir), cache_size=args.cache_size)
+    if not service.warm():
+        raise SystemExit("인덱스가 없습니다. ingest.py로 먼저 인덱스를 생성하세요.")
+    service.search_many(questions, top_k=args.top_k)
+
+    started = time.perf_counter()
+    for query in queries:
+        service.search(query, top_k=args.top_k)
+    baseline = len(queries) / (time.perf_counter() - started)
+
+    print(f"질의 {len(queries)}개, top_k={args.top_k}, version={service.version}")
+    print(f"{'batch':>6} {'queries/s':>10} {'speedup':>8}")
+    print(f"{'search':>6} {baseline:>10.1f} {1:>7.2f}x")
+    for batch_size in [int(value) for value in args.batch_sizes.split(",")]:
+        rate = _queries_per_second(service, queries, batch_size, args.top_k)
+        print(f"{batch_size:>6} {rate:>10.1f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
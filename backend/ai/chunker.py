@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？…])\s+")
+
+
+@dataclass
+class _Unit:
+    text: str
+    tokens: int
+    paragraph_start: bool
+
+
+def split_sentences(text: str) -> list[tuple[str, bool]]:
+    sentences: list[tuple[str, bool]] = []
+    for paragraph in PARAGRAPH_RE.split(text):
+        parts = [part.strip() for part in SENTENCE_END_RE.split(paragraph) if part.strip()]
+        sentences.extend((part, index == 0) for index, part in enumerate(parts))
+    return sentences
+
+
+class TokenChunker:
+    def __init__(self, tokenizer: Any, *, max_tokens: int, overlap_tokens: int = 64) -> None:
+        self.tokenizer = tokenizer
+        self.max_tokens = max(max_tokens, 1)
+        self.overlap_tokens = min(max(overlap_tokens, 0), self.max_tokens // 2)
+
+    def _units(self, text: str) -> list[_Unit]:
+        sentences = split_sentences(text)
+        if not sentences:
+            return []
+        # 문장마다 한 번만 토큰화해 길이를 기록하고, 이후 묶기/겹침 계산은 이 길이만으로 처리한다.
+        encoded = self.tokenizer([sentence for sentence, _ in sentences], add_special_tokens=False)["input_ids"]
+        units: list[_Unit] = []
+        for (sentence, paragraph_start), input_ids in zip(sentences, encoded):
+            if len(input_ids) <= self.max_tokens:
+                units.append(_Unit(sentence, len(input_ids), paragraph_start))
+                continue
+            units.extend(self._split_long_sentence(sentence, paragraph_start))
+        return units
+
+    def _split_long_sentence(self, sentence: str, paragraph_start: bool) -> list[_Unit]:
+        offsets = self.tokenizer(sentence, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"]
+        units: list[_Unit] = []
+        for start in range(0, len(offsets), self.max_tokens):
+            window = offsets[start : start + self.max_tokens]
+            piece = sentence[window[0][0] : window[-1][1]].strip()
+            if piece:
+                units.append(_Unit(piece, len(window), paragraph_start and start == 0))
+        return units
+
+    @staticmethod
+    def _join(units: list[_Unit]) -> str:
+        parts: list[str] = []
+        for index, unit in enumerate(units):
+            if index:
+                parts.append("\n\n" if unit.paragraph_start else " ")
+            parts.append(unit.text)
+        return "".join(parts)
+
+    def chunk(self, text: str) -> list[str]:
+        chunks: list[str] = []
+        window: list[_Unit] = []
+        window_tokens = 0
+        for unit in self._units(text):
+            if window and window_tokens + unit.tokens > self.max_tokens:
+                chunks.append(self._join(window))
+                # 직전 청크 끝의 문장을 overlap_tokens 이내로 다음 청크 앞에 이어 붙인다.
+                carry: list[_Unit] = []
+                carry_tokens = 0
+                for previous in reversed(window):
+                    if carry_tokens + previous.tokens > self.overlap_tokens:
+                        break
+                    carry.insert(0, previous)
+                    carry_tokens += previous.tokens
+                while carry and carry_tokens + unit.tokens > self.max_tokens:
+                    carry_tokens -= carry.pop(0).tokens
+                window = carry
+                window_tokens = carry_tokens
+            window.append(unit)
+            window_tokens += unit.tokens
+        if window:
+            chunks.append(self._join(window))
+        return chunks
+
+    def __call__(self, text: str) -> list[str]:
+        return self.chunk(text)
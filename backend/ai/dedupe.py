@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+import numpy as np
+
+WHITESPACE_RE = re.compile(r"\s+")
+FINGERPRINT_BITS = 64
+DEFAULT_MIN_JACCARD = 0.9
+SHINGLE_PRIME = np.uint64(1_000_003)
+_BIT_POSITIONS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+
+
+def _mix(values: np.ndarray) -> np.ndarray:
+    # splitmix64 마무리 단계로 롤링 해시의 비트를 고르게 섞는다. uint64 곱셈은 2^64로 나눈 나머지로 감긴다.
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def shingle_hashes(text: str, *, shingle_size: int = 5) -> np.ndarray:
+    normalized = WHITESPACE_RE.sub(" ", text).strip().lower()
+    codes = np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    if not len(codes):
+        return np.zeros(0, dtype=np.uint64)
+    width = min(shingle_size, len(codes))
+    count = len(codes) - width + 1
+    # 글자 n-gram(shingle)마다 다항식 해시를 한 번에 계산한다.
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        hashes = hashes * SHINGLE_PRIME + codes[offset : offset + count]
+    return np.unique(hashes)
+
+
+def jaccard(left: np.ndarray, right: np.ndarray) -> float:
+    if not left.size and not right.size:
+        return 1.0
+    shared = np.intersect1d(left, right, assume_unique=True).size
+    return shared / (left.size + right.size - shared)
+
+
+def _fingerprint(hashes: np.ndarray) -> int:
+    count = len(hashes)
+    if not count:
+        return 0
+    bits = (_mix(hashes)[:, None] >> _BIT_POSITIONS) & np.uint64(1)
+    majority = bits.sum(axis=0) * 2 > count
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def simhash(text: str, *, shingle_size: int = 5) -> int:
+    return _fingerprint(shingle_hashes(text, shingle_size=shingle_size))
+
+
+class NearDuplicateFilter:
+    # SimHash 구간 버킷으로 후보를 좁힌 뒤, 후보 본문과의 shingle Jaccard 유사도가 min_jaccard 이상일 때만 중복으로 본다.
+    # 지문은 해밍 거리가 가까워도 내용이 꽤 다를 수 있어(표의 다른 행 등) 지문만으로는 버리지 않는다.
+    def __init__(
+        self,
+        *,
+        max_distance: int = 3,
+        shingle_size: int = 5,
+        min_jaccard: float = DEFAULT_MIN_JACCARD,
+    ) -> None:
+        self.max_distance = max(max_distance, 0)
+        self.shingle_size = shingle_size
+        self.min_jaccard = min_jaccard
+        # 해밍 거리가 max_distance 이하인 두 지문은 (max_distance + 1)개 구간 중 적어도 하나가 같다.
+        # 구간 값이 같은 지문만 후보로 비교해 전체 쌍을 비교하지 않는다.
+        self.bands = self.max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self._buckets: list[dict[int, list[tuple[int, int]]]] = [{} for _ in range(self.bands)]
+        self.checked = 0
+        self.removed = 0
+
+    def _band_keys(self, fingerprint: int) -> list[int]:
+        mask = (1 << self.band_bits) - 1
+        keys = [(fingerprint >> (band * self.band_bits)) & mask for band in range(self.bands - 1)]
+        # 마지막 구간은 나누어떨어지지 않고 남는 상위 비트까지 포함한다.
+        keys.append(fingerprint >> ((self.bands - 1) * self.band_bits))
+        return keys
+
+    def add(self, fingerprint: int, key: int) -> None:
+        # 본문은 들고 있지 않고 지문과 key만 기록한다. 확인이 필요하면 find의 lookup으로 본문을 다시 읽는다.
+        # 저장된 지문(chunk_store)을 그대로 등록할 수 있어 증분 실행에서 기존 청크를 다시 해시하지 않는다.
+        for bucket, band_key in zip(self._buckets, self._band_keys(fingerprint)):
+            bucket.setdefault(band_key, []).append((fingerprint, key))
+
+    def find(
+        self,
+        text: str,
+        lookup: Callable[[int], str | None],
+        *,
+        exact: bool = False,
+    ) -> tuple[int | None, int]:
+        # (앞서 add한 항목 중 중복으로 볼 항목의 key 또는 None, text의 지문)을 돌려준다.
+        # exact이면 본문이 완전히 같을 때만 중복으로 본다.
+        self.checked += 1
+        hashes = shingle_hashes(text, shingle_size=self.shingle_size)
+        fingerprint = _fingerprint(hashes)
+        seen: set[int] = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(fingerprint)):
+            for candidate, key in bucket.get(band_key, ()):
+                if key in seen or (candidate ^ fingerprint).bit_count() > self.max_distance:
+                    continue
+                seen.add(key)
+                # 삭제된 청크처럼 본문을 더 읽을 수 없는 항목은 후보에서 뺀다.
+                other = lookup(key)
+                if other is None:
+                    continue
+                if exact:
+                    duplicate = other == text
+                else:
+                    other_hashes = shingle_hashes(other, shingle_size=self.shingle_size)
+                    duplicate = jaccard(hashes, other_hashes) >= self.min_jaccard
+                if duplicate:
+                    self.removed += 1
+                    return key, fingerprint
+        return None, fingerprint
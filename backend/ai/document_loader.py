@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import os
+import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from pypdf import PdfReader
+from requests.adapters import HTTPAdapter
+
+from chunk_store import DocumentChunk
+
+SUPPORTED_EXTENSIONS = {".txt", ".csv", ".pdf", ".md"}
+WHITESPACE_RE = re.compile(r"\s+")
+PARAGRAPH_RE = re.compile(r"\n\s*\n")
+PDF_PAGES_PER_TASK = 32
+CSV_READ_ROWS = 100_000
+CSV_GROUP_CHARS = 1000
+
+T = TypeVar("T")
+R = TypeVar("R")
+LoadTask = tuple[Path, int, int | None]
+
+
+def _clean_text(text: str) -> str:
+    # 빈 줄로 나뉜 문단 경계는 청킹에서 쓰므로 남기고, 나머지 공백만 하나로 합친다.
+    paragraphs = (WHITESPACE_RE.sub(" ", paragraph).strip() for paragraph in PARAGRAPH_RE.split(text))
+    return "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+
+
+def _read_txt(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+
+def _read_md(path: Path) -> str:
+    return path.read_text(encoding="utf-8", errors="ignore")
+
+
+def _csv_lines(df: pd.DataFrame) -> np.ndarray:
+    values = df.to_numpy(dtype=object)
+    lines = np.full(len(df), "", dtype=object)
+    for position, col in enumerate(df.columns):
+        prefix = f"{col}: " if position == 0 else f" | {col}: "
+        lines = lines + (prefix + values[:, position])
+    return lines
+
+
+def _read_csv(path: Path) -> Iterator[DocumentChunk]:
+    row_offset = 0
+    # 값은 문자열 그대로 읽어 숫자 변환/재포맷 비용 없이 원본 표기를 유지한다.
+    for df in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=CSV_READ_ROWS):
+        lines = _csv_lines(df)
+        # 행 중간에서 잘리지 않도록 누적 길이 기준으로 CSV_GROUP_CHARS 안팎씩 행을 묶어 하나의 문서로 만든다.
+        lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+        groups = (np.cumsum(lengths + 1) - 1) // CSV_GROUP_CHARS
+        boundaries = np.flatnonzero(np.diff(groups)) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(lines)]):
+            source = f"{path}#rows={row_offset + start + 1}-{row_offset + end}"
+            yield DocumentChunk(text="\n".join(lines[start:end]), source=source)
+        row_offset += len(df)
+
+
+def _read_pdf(path: Path, start: int = 0, stop: int | None = None) -> list[str]:
+    reader = PdfReader(str(path))
+    pages = []
+    for page_index in range(start, min(stop, len(reader.pages)) if stop is not None else len(reader.pages)):
+        text = reader.pages[page_index].extract_text() or ""
+        pages.append(text)
+    return pages
+
+
+def _html_to_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style", "noscript"]):
+        script.decompose()
+    text = soup.get_text(separator=" ")
+    return text
+
+
+def iter_source_files(paths: Iterable[Path]) -> Iterator[Path]:
+    for path in paths:
+        if path.is_dir():
+            for file_path in sorted(path.rglob("*")):
+                if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
+                    yield file_path
+            continue
+        if path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            yield path
+
+
+def _pdf_documents(path: Path, start: int = 0, stop: int | None = None) -> Iterator[DocumentChunk]:
+    pages = _read_pdf(path, start, stop)
+    for page_index, page_text in enumerate(pages, start=start + 1):
+        source = f"{path}#page={page_index}"
+        yield DocumentChunk(text=page_text, source=source)
+
+
+def _read_source_file(path: Path) -> Iterator[DocumentChunk]:
+    suffix = path.suffix.lower()
+    if suffix == ".txt":
+        text = _read_txt(path)
+        yield DocumentChunk(text=text, source=str(path))
+    elif suffix == ".md":
+        text = _read_md(path)
+        yield DocumentChunk(text=text, source=str(path))
+    elif suffix == ".csv":
+        yield from _read_csv(path)
+    elif suffix == ".pdf":
+        yield from _pdf_documents(path)
+
+
+def _clean_documents(documents: Iterable[DocumentChunk]) -> Iterator[DocumentChunk]:
+    for chunk in documents:
+        cleaned_text = _clean_text(chunk.text)
+        if cleaned_text:
+            yield DocumentChunk(text=cleaned_text, source=chunk.source)
+
+
+def _load_task(task: LoadTask) -> tuple[LoadTask, list[DocumentChunk], list[LoadTask]]:
+    # 큰 PDF는 첫 작업이 페이지 수를 세어 첫 구간만 읽고, 나머지 페이지 구간은 작업으로 돌려줘 여러 프로세스가 나눠 읽게 한다.
+    # 페이지 수를 작업자에서 세므로 부모 프로세스는 PDF를 열지 않고 바로 작업을 나눠 준다.
+    path, start, stop = task
+    rest: list[LoadTask] = []
+    if stop is None and path.suffix.lower() == ".pdf":
+        page_count = len(PdfReader(str(path)).pages)
+        if page_count > PDF_PAGES_PER_TASK:
+            task = (path, 0, PDF_PAGES_PER_TASK)
+            stop = PDF_PAGES_PER_TASK
+            rest = [(path, page, page + PDF_PAGES_PER_TASK) for page in range(stop, page_count, PDF_PAGES_PER_TASK)]
+    documents = _read_source_file(path) if stop is None else _pdf_documents(path, start, stop)
+    return task, list(_clean_documents(documents)), rest
+
+
+def _bounded_as_completed(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    window: int,
+) -> Iterator[R]:
+    # 동시에 제출하는 작업 수를 window로 제한해 소비 속도보다 읽기가 앞서 나가도 메모리가 늘지 않게 한다.
+    pending: set[Future[R]] = set()
+    for item in items:
+        pending.add(executor.submit(fn, item))
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+
+def iter_loaded_files(
+    paths: Iterable[Path],
+    *,
+    workers: int | None = None,
+) -> Iterator[tuple[str, list[DocumentChunk]]]:
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if not any(path.suffix.lower() == ".pdf" for path in paths):
+        # PDF가 없으면 파일 하나가 작업 하나이므로 파일 수보다 많은 프로세스는 띄우지 않는다.
+        workers = min(workers, len(paths))
+    if workers <= 1:
+        for path in paths:
+            yield str(path), list(_clean_documents(_read_source_file(path)))
+        return
+
+    queue: deque[LoadTask] = deque((path, 0, None) for path in paths)
+    expected: dict[str, int] = {}
+    received: dict[str, dict[int, list[DocumentChunk]]] = {}
+    pending: set[Future[tuple[LoadTask, list[DocumentChunk], list[LoadTask]]]] = set()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while queue or pending:
+            # _bounded_as_completed와 같이 처리 중인 작업을 workers * 2개로 제한하되, 작업자가 돌려준 PDF 구간을 이어서 넣는다.
+            while queue and len(pending) < workers * 2:
+                pending.add(executor.submit(_load_task, queue.popleft()))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                (path, start, _), documents, rest = future.result()
+                source = str(path)
+                if start == 0:
+                    expected[source] = 1 + len(rest)
+                    # 나눠 읽는 PDF의 나머지 구간을 먼저 제출해 모아 둔 앞 구간을 빨리 내보낸다.
+                    queue.extendleft(reversed(rest))
+                parts = received.setdefault(source, {})
+                parts[start] = documents
+                if len(parts) == expected[source]:
+                    del received[source]
+                    yield source, [doc for key in sorted(parts) for doc in parts[key]]
+
+
+class HostLimitedSession:
+    def __init__(self, *, pool_size: int, per_host: int, timeout: float = 10) -> None:
+        self.per_host = max(per_host, 1)
+        self.timeout = timeout
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._lock = Lock()
+        self._host_limits: dict[str, BoundedSemaphore] = {}
+
+    def get_text(self, url: str) -> str:
+        host = urlsplit(url).netloc
+        with self._lock:
+            limit = self._host_limits.setdefault(host, BoundedSemaphore(self.per_host))
+        with limit:
+            response = self._session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        self._session.close()
+
+
+def _fetch_url(session: HostLimitedSession, url: str) -> tuple[str, list[DocumentChunk]]:
+    text = _html_to_text(session.get_text(url))
+    return url, list(_clean_documents([DocumentChunk(text=text, source=url)]))
+
+
+def iter_fetched_urls(
+    urls: Iterable[str],
+    *,
+    workers: int = 8,
+    per_host: int = 2,
+) -> Iterator[tuple[str, list[DocumentChunk]]]:
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return
+    workers = max(min(workers, len(urls)), 1)
+    session = HostLimitedSession(pool_size=workers, per_host=per_host)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            yield from _bounded_as_completed(executor, partial(_fetch_url, session), urls, window=workers * 2)
+    finally:
+        session.close()
+
+
+def iter_documents(
+    paths: Iterable[Path],
+    urls: Iterable[str],
+    *,
+    workers: int | None = None,
+    fetch_workers: int = 8,
+) -> Iterator[DocumentChunk]:
+    for _, documents in iter_loaded_files(iter_source_files(paths), workers=workers):
+        yield from documents
+    for _, documents in iter_fetched_urls(urls, workers=fetch_workers):
+        yield from documents
+
+
+def load_documents(
+    paths: Iterable[Path],
+    urls: Iterable[str],
+    *,
+    workers: int | None = None,
+    fetch_workers: int = 8,
+) -> list[DocumentChunk]:
+    return list(iter_documents(paths, urls, workers=workers, fetch_workers=fetch_workers))
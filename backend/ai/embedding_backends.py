@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx")
+DEFAULT_BACKEND = "torch"
+DEFAULT_ONNX_DIR = Path(__file__).resolve().parent / "cache" / "onnx"
+SAFE_NAME_RE = re.compile(r"[^0-9A-Za-z._-]+")
+
+
+def backend_namespace(model_name: str, backend: str) -> str:
+    # 백엔드마다 임베딩 값이 조금씩 달라 모델 레지스트리/임베딩 캐시 키를 분리한다. 기본(torch)은 기존 키를 유지한다.
+    return model_name if backend == DEFAULT_BACKEND else f"{model_name}@{backend}"
+
+
+def _quantize_int8(model: SentenceTransformer) -> SentenceTransformer:
+    import torch
+
+    # Linear 가중치를 int8로 바꾸고 활성값은 실행 중에 양자화한다(동적 양자화). CPU 전용이다.
+    model.to("cpu")
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEncoder:
+    def __init__(self, model_name: str, *, onnx_dir: Path = DEFAULT_ONNX_DIR) -> None:
+        try:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+        except ImportError as exc:
+            raise RuntimeError(
+                "onnx 백엔드를 쓰려면 optimum[onnxruntime]를 설치하세요: pip install 'optimum[onnxruntime]'"
+            ) from exc
+        # 토크나이저, 풀링 방식, 최대 길이는 원래 SentenceTransformer 설정을 그대로 쓴다.
+        reference = SentenceTransformer(model_name, device="cpu")
+        self.name_or_path = model_name
+        self.tokenizer = reference.tokenizer
+        self.max_seq_length = reference.max_seq_length
+        pooling = reference[1]
+        self._pooling_mode = "mean"
+        if pooling.pooling_mode_cls_token:
+            self._pooling_mode = "cls"
+        elif pooling.pooling_mode_max_tokens:
+            self._pooling_mode = "max"
+        self._dimension = reference.get_sentence_embedding_dimension()
+        export_dir = onnx_dir / SAFE_NAME_RE.sub("_", model_name)
+        if (export_dir / "model.onnx").exists():
+            self._session = ORTModelForFeatureExtraction.from_pretrained(export_dir)
+        else:
+            self._session = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+            self._session.save_pretrained(export_dir)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def _pool(self, hidden: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        if self._pooling_mode == "cls":
+            return hidden[:, 0]
+        mask = mask[:, :, None].astype(hidden.dtype)
+        if self._pooling_mode == "max":
+            return np.where(mask > 0, hidden, -np.inf).max(axis=1)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        texts: list[str],
+        *,
+        batch_size: int = 32,
+        normalize_embeddings: bool = True,
+        **_: Any,
+    ) -> np.ndarray:
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start : start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors="np",
+            )
+            hidden = self._session(**inputs).last_hidden_state
+            outputs.append(self._pool(np.asarray(hidden), inputs["attention_mask"]))
+        embeddings = np.concatenate(outputs) if outputs else np.zeros((0, self._dimension), dtype="float32")
+        if normalize_embeddings:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings.astype("float32")
+
+
+def load_embedding_model(model_name: str, backend: str = DEFAULT_BACKEND) -> Any:
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "torch-int8":
+        return _quantize_int8(SentenceTransformer(model_name, device="cpu"))
+    if backend == "onnx":
+        return OnnxEncoder(model_name)
+    raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend}")
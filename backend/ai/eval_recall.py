@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from chunker import split_sentences
+from rag_pipeline import IndexArtifacts, build_lexical_index, load_index, search_many
+
+
+def parse_args() -> argparse.Namespace:
+    default_index_dir = Path(__file__).resolve().parent / "index"
+    parser = argparse.ArgumentParser(description="검색 방식별 recall@k 비교 (dense / BM25 / hybrid)")
+    parser.add_argument("--index-dir", default=str(default_index_dir), help="인덱스 경로")
+    parser.add_argument(
+        "--queries",
+        help="평가 질의 파일 (한 줄에 '질문<TAB>정답 출처 일부', 없으면 청크 문장에서 자동 생성)",
+    )
+    parser.add_argument("--samples", type=int, default=200, help="자동 생성할 질의 수")
+    parser.add_argument("--min-query-chars", type=int, default=30, help="자동 질의로 쓸 문장의 최소 길이")
+    parser.add_argument("--top-k", type=int, default=4, help="recall@k의 k")
+    parser.add_argument("--overfetch", type=int, default=5, help="비교용 dense 과다 조회 배수 (k x 배수)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def _load_labeled_queries(path: Path) -> list[tuple[str, str]]:
+    pairs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        question, _, source = line.partition("\t")
+        if question.strip() and source.strip():
+            pairs.append((question.strip(), source.strip()))
+    return pairs
+
+
+def _sample_queries(artifacts: IndexArtifacts, count: int, min_chars: int, seed: int) -> list[tuple[str, str]]:
+    # 청크 안의 문장을 질의로 쓰고, 그 문장이 들어 있는 청크가 결과에 있으면 정답으로 본다.
+    sentences = [
+        sentence
+        for _, chunk in artifacts.chunks.items()
+        for sentence, _ in split_sentences(chunk.text)
+        if len(sentence) >= min_chars
+    ]
+    rng = random.Random(seed)
+    return [(sentence, sentence) for sentence in rng.sample(sorted(set(sentences)), min(count, len(set(sentences))))]
+
+
+def _is_hit(results: list, expected: str, by_source: bool) -> bool:
+    if by_source:
+        return any(expected in chunk.source for chunk in results)
+    return any(expected in chunk.text for chunk in results)
+
+
+def main() -> None:
+    args = parse_args()
+    artifacts = load_index(Path(args.index_dir))
+    if artifacts.lexical is None:
+        print("저장된 BM25 인덱스가 없어 청크로부터 새로 만듭니다.")
+        artifacts.lexical = build_lexical_index(artifacts)
+    by_source = bool(args.queries)
+    if args.queries:
+        pairs = _load_labeled_queries(Path(args.queries))
+    else:
+        pairs = _sample_queries(artifacts, args.samples, args.min_query_chars, args.seed)
+    if not pairs:
+        raise SystemExit("평가할 질의가 없습니다.")
+    queries = [question for question, _ in pairs]
+    top_k = args.top_k
+    search_many(artifacts, queries[:8], top_k=top_k)
+
+    def dense(k: int):
+        return lambda: search_many(artifacts, queries, top_k=k, hybrid=False)
+
+    def lexical():
+        return [[artifacts.chunks.get(chunk_id) for chunk_id, _ in artifacts.lexical.search(query, top_k)] for query in queries]
+
+    methods = [
+        (f"dense@{top_k}", dense(top_k)),
+        (f"dense@{top_k * args.overfetch}", dense(top_k * args.overfetch)),
+        (f"bm25@{top_k}", lexical),
+        (f"hybrid@{top_k}", lambda: search_many(artifacts, queries, top_k=top_k)),
+    ]
+    print(f"질의 {len(queries)}개 ({'라벨 파일' if by_source else '청크 문장 자동 생성'}), 청크 {len(artifacts.chunks)}개")
+    print(f"{'method':>12} {'recall':>8} {'ms/query':>9}")
+    for name, run in methods:
+        started = time.perf_counter()
+        results = run()
+        elapsed_ms = (time.perf_counter() - started) * 1000 / len(queries)
+        hits = sum(_is_hit(result, expected, by_source) for result, (_, expected) in zip(results, pairs))
+        print(f"{name:>12} {hits / len(pairs):>8.1%} {elapsed_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
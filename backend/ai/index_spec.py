@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+
+import faiss
+
+INDEX_KINDS = {"flat", "ivf", "ivfpq", "hnsw"}
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    kind: str = "flat"
+    nlist: int = 1024
+    m: int = 32
+    nbits: int = 8
+    ef_construction: int = 200
+    nprobe: int = 16
+    ef_search: int = 64
+
+    def __str__(self) -> str:
+        if self.kind == "ivf":
+            return f"ivf:nlist={self.nlist},nprobe={self.nprobe}"
+        if self.kind == "ivfpq":
+            return f"ivfpq:nlist={self.nlist},m={self.m},nbits={self.nbits},nprobe={self.nprobe}"
+        if self.kind == "hnsw":
+            return f"hnsw:m={self.m},ef_construction={self.ef_construction},ef_search={self.ef_search}"
+        return "flat"
+
+    @property
+    def build_signature(self) -> str:
+        # nprobe/ef_search는 검색 시점 값이라 인덱스 재생성 여부 판단에서는 제외한다.
+        return str(replace(self, nprobe=IndexSpec.nprobe, ef_search=IndexSpec.ef_search))
+
+    @property
+    def needs_training(self) -> bool:
+        return self.kind in {"ivf", "ivfpq"}
+
+    @property
+    def supports_removal(self) -> bool:
+        return self.kind != "hnsw"
+
+    @property
+    def min_train_size(self) -> int:
+        # 군집 수(IVF 중심점, PQ 코드북 항목)보다 학습 벡터가 적으면 FAISS가 학습을 거부한다.
+        if self.kind == "ivfpq":
+            return max(self.nlist, 2**self.nbits)
+        return self.nlist if self.needs_training else 0
+
+    @property
+    def train_size(self) -> int:
+        # FAISS는 군집당 최소 39개 학습 벡터를 권장한다.
+        return self.min_train_size * 40
+
+    def create(self, dimension: int) -> faiss.Index:
+        if self.kind == "ivf":
+            return faiss.index_factory(dimension, f"IVF{self.nlist},Flat", faiss.METRIC_INNER_PRODUCT)
+        if self.kind == "ivfpq":
+            return faiss.index_factory(
+                dimension, f"IVF{self.nlist},PQ{self.m}x{self.nbits}", faiss.METRIC_INNER_PRODUCT
+            )
+        if self.kind == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, self.m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = self.ef_construction
+            return index
+        return faiss.IndexFlatIP(dimension)
+
+    def search_parameters(
+        self,
+        *,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+    ) -> faiss.SearchParameters | None:
+        if self.needs_training:
+            return faiss.SearchParametersIVF(nprobe=nprobe or self.nprobe)
+        if self.kind == "hnsw":
+            return faiss.SearchParametersHNSW(efSearch=ef_search or self.ef_search)
+        return None
+
+
+def parse_index_spec(text: str | None) -> IndexSpec:
+    if not text:
+        return IndexSpec()
+    kind, _, raw_params = text.strip().lower().partition(":")
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"지원하지 않는 인덱스 형식입니다: {kind}")
+    params: dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in raw_params.split(","))):
+        name, _, value = item.partition("=")
+        if name not in IndexSpec.__dataclass_fields__ or name == "kind":
+            raise ValueError(f"알 수 없는 인덱스 옵션입니다: {name}")
+        params[name] = int(value)
+    return IndexSpec(kind=kind, **params)
@@ -1,37 +1,289 @@
 from __future__ import annotations
 
 import argparse
+import json
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Callable
 
-from rag_pipeline import build_index, load_documents, save_index
+from dedupe import DEFAULT_MIN_JACCARD
+from embedding_backends import DEFAULT_BACKEND, EMBEDDING_BACKENDS
+from embedding_cache import configure_embedding_cache, get_embedding_cache_stats
+from index_spec import parse_index_spec
+from rag_pipeline import (
+    IndexArtifacts,
+    UpdateStats,
+    chunk_options,
+    create_index_artifacts,
+    current_index_version,
+    index_spec_of,
+    is_compatible,
+    load_index,
+    save_index,
+    update_index,
+)
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent / "index"
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "embeddings"
+
+
+@dataclass
+class IngestOptions:
+    inputs: list[str] = field(default_factory=list)
+    urls: list[str] = field(default_factory=list)
+    output_dir: str = str(DEFAULT_OUTPUT_DIR)
+    model: str = "intfloat/multilingual-e5-small"
+    embedding_backend: str = DEFAULT_BACKEND
+    chunker: str = "chars"
+    max_chars: int = 1000
+    overlap: int = 200
+    max_tokens: int = 0
+    overlap_tokens: int = 64
+    batch_size: int = 256
+    index_spec: str = "flat"
+    dedupe_distance: int | None = 4
+    dedupe_jaccard: float = DEFAULT_MIN_JACCARD
+    incremental: bool = False
+    workers: int = 0
+    fetch_workers: int = 8
+    per_host: int = 2
+    embedding_cache_dir: str | None = str(DEFAULT_CACHE_DIR)
+    embedding_cache_size: int = 200_000
 
 
 def parse_args() -> argparse.Namespace:
-    default_output_dir = Path(__file__).resolve().parent / "index"
     parser = argparse.ArgumentParser(description="문서/URL 인덱싱")
     parser.add_argument("--input", action="append", default=[], help="파일 또는 디렉터리 경로")
     parser.add_argument("--url", action="append", default=[], help="웹페이지 URL")
-    parser.add_argument("--output-dir", default=str(default_output_dir), help="인덱스 저장 경로")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR), help="인덱스 저장 경로")
     parser.add_argument("--model", default="intfloat/multilingual-e5-small", help="임베딩 모델")
-    parser.add_argument("--max-chars", type=int, default=1000, help="청크 최대 길이")
-    parser.add_argument("--overlap", type=int, default=200, help="청크 겹침 길이")
+    parser.add_argument(
+        "--embedding-backend",
+        choices=EMBEDDING_BACKENDS,
+        default=DEFAULT_BACKEND,
+        help="임베딩 실행 방식 (torch: fp32, torch-int8: 동적 양자화, onnx: ONNX Runtime). 바꾸면 인덱스를 다시 생성",
+    )
+    parser.add_argument(
+        "--chunker",
+        choices=["chars", "tokens"],
+        default="chars",
+        help="청킹 방식 (chars: 글자 수 기준, tokens: 문장/문단 경계 + 토크나이저 토큰 수 기준)",
+    )
+    parser.add_argument("--max-chars", type=int, default=1000, help="청크 최대 길이 (chars)")
+    parser.add_argument("--overlap", type=int, default=200, help="청크 겹침 길이 (chars)")
+    parser.add_argument("--max-tokens", type=int, default=0, help="청크 최대 토큰 수 (tokens, 0이면 모델 입력 길이에 맞춤)")
+    parser.add_argument("--overlap-tokens", type=int, default=64, help="청크 겹침 토큰 수 (tokens)")
+    parser.add_argument("--batch-size", type=int, default=256, help="임베딩/인덱스 추가 배치 크기")
+    parser.add_argument(
+        "--index-spec",
+        default="flat",
+        help="인덱스 형식 (flat, ivf:nlist=1024,nprobe=16, ivfpq:nlist=1024,m=32,nbits=8, hnsw:m=32,ef_search=64)",
+    )
+    parser.add_argument(
+        "--dedupe-distance",
+        type=int,
+        default=4,
+        help="근접 중복으로 보고 제외할 청크 SimHash(64비트) 해밍 거리 상한",
+    )
+    parser.add_argument(
+        "--dedupe-jaccard",
+        type=float,
+        default=DEFAULT_MIN_JACCARD,
+        help="지문이 가까운 청크를 실제 중복으로 볼 5글자 shingle Jaccard 유사도 하한",
+    )
+    parser.add_argument("--no-dedupe", action="store_true", help="근접 중복 청크 제거 안 함")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="기존 인덱스를 재사용하고 변경/추가/삭제된 문서만 반영",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="문서 파싱 프로세스 수 (0이면 CPU 코어 수)")
+    parser.add_argument("--fetch-workers", type=int, default=8, help="URL 동시 수집 스레드 수")
+    parser.add_argument("--per-host", type=int, default=2, help="호스트별 동시 요청 수")
+    parser.add_argument("--embedding-cache-dir", default=str(DEFAULT_CACHE_DIR), help="임베딩 캐시 경로")
+    parser.add_argument("--embedding-cache-size", type=int, default=200_000, help="모델별 최대 캐시 항목 수")
+    parser.add_argument("--no-embedding-cache", action="store_true", help="임베딩 캐시 사용 안 함")
+    parser.add_argument(
+        "--progress-json",
+        action="store_true",
+        help="진행 상황을 한 줄짜리 JSON 이벤트로 출력 (관리자 학습 작업용)",
+    )
     return parser.parse_args()
 
 
+class ProgressReporter:
+    def __init__(self, sink: Callable[[dict[str, Any]], None] | None, *, interval: float = 0.5) -> None:
+        self.sink = sink
+        self.interval = interval
+        self._last_emit = 0.0
+
+    def emit(
+        self,
+        stage: str,
+        progress: int,
+        message: str,
+        stats: UpdateStats | None = None,
+        **extra: int,
+    ) -> dict[str, Any]:
+        event = {"event": "progress", "stage": stage, "progress": progress, "message": message}
+        if stats is not None:
+            event.update(
+                sources_total=stats.sources_total,
+                sources_done=stats.sources_done,
+                documents=stats.documents,
+                chunks=stats.stages["chunk"].items,
+                vectors=stats.chunks_embedded,
+                duplicates=stats.duplicates,
+            )
+        event.update(extra)
+        if self.sink is not None:
+            self.sink(event)
+        self._last_emit = time.monotonic()
+        return event
+
+    def update(self, stats: UpdateStats) -> None:
+        if time.monotonic() - self._last_emit < self.interval:
+            return
+        # 소스 단위로 진행률을 계산한다. 준비(0~5)와 저장(90~100) 구간을 제외한 나머지를 로드/임베딩에 배분한다.
+        done_ratio = stats.sources_done / stats.sources_total if stats.sources_total else 1.0
+        message = (
+            f"소스 {stats.sources_done}/{stats.sources_total} · 문서 {stats.documents}개 · "
+            f"임베딩 {stats.chunks_embedded}개 ({stats.stages['embed'].per_second:,.0f}개/초)"
+        )
+        self.emit("indexing", 5 + int(done_ratio * 85), message, stats)
+
+
+def _directory_size(path: Path) -> int:
+    return sum(file_path.stat().st_size for file_path in path.rglob("*") if file_path.is_file())
+
+
+def _load_existing(
+    output_dir: Path,
+    model_name: str,
+    build_options: dict,
+    log: Callable[[str], None],
+) -> IndexArtifacts | None:
+    if current_index_version(output_dir) is None:
+        return None
+    existing = load_index(output_dir, with_sources=True)
+    if not is_compatible(existing, model_name, build_options):
+        log("기존 인덱스와 설정이 달라 전체 인덱스를 다시 생성합니다.")
+        return None
+    if not index_spec_of(existing).supports_removal:
+        log("HNSW 인덱스는 벡터 삭제를 지원하지 않아 전체 인덱스를 다시 생성합니다.")
+        return None
+    return existing
+
+
+def run_ingest(
+    options: IngestOptions,
+    *,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+    log: Callable[[str], None] = print,
+) -> dict[str, Any]:
+    reporter = ProgressReporter(on_event)
+    reporter.emit("preparing", 0, "기존 인덱스와 문서 변경 여부를 확인하는 중")
+    paths = [Path(path_str) for path_str in options.inputs]
+    output_dir = Path(options.output_dir)
+    build_options = chunk_options(
+        options.chunker,
+        max_chars=options.max_chars,
+        overlap=options.overlap,
+        max_tokens=options.max_tokens,
+        overlap_tokens=options.overlap_tokens,
+    )
+    build_options["index_spec"] = str(parse_index_spec(options.index_spec))
+    # 백엔드마다 임베딩 값이 조금씩 달라, 기존 인덱스와 백엔드가 다르면 호환되지 않는 것으로 보고 전체를 다시 만든다.
+    if options.embedding_backend != DEFAULT_BACKEND:
+        build_options["embedding_backend"] = options.embedding_backend
+    # 상주 작업 프로세스에서 반복 호출되므로 캐시 설정도 실행마다 다시 적용한다.
+    if options.embedding_cache_dir:
+        configure_embedding_cache(Path(options.embedding_cache_dir), max_entries=options.embedding_cache_size)
+    else:
+        configure_embedding_cache(None)
+    artifacts = _load_existing(output_dir, options.model, build_options, log) if options.incremental else None
+    incremental = artifacts is not None
+    options_changed = False
+    if artifacts is not None:
+        options_changed = artifacts.build_options != build_options
+        artifacts.build_options = build_options
+    else:
+        artifacts = create_index_artifacts(options.model, build_options=build_options)
+    stats = update_index(
+        artifacts,
+        paths,
+        options.urls,
+        batch_size=options.batch_size,
+        workers=options.workers or None,
+        fetch_workers=options.fetch_workers,
+        per_host=options.per_host,
+        progress=reporter.update,
+        dedupe_distance=options.dedupe_distance,
+        dedupe_jaccard=options.dedupe_jaccard,
+    )
+    if not artifacts.chunks:
+        raise ValueError("인덱싱할 문서가 없습니다.")
+    log(
+        f"추가 {stats.added} / 변경 {stats.updated} / 삭제 {stats.removed} / 유지 {stats.unchanged} "
+        f"(임베딩 청크 {stats.chunks_embedded}, 근접 중복 제외 {stats.duplicates})"
+    )
+    log("단계별 처리량 (대기 시간 포함):")
+    for name, stage in stats.stages.items():
+        log(f"  {name:<6} {stage.items:>9}건 {stage.seconds:>9.2f}초 ({stage.per_second:,.1f}건/초)")
+    for cache_stats in get_embedding_cache_stats():
+        log(
+            f"임베딩 캐시[{cache_stats.model_name}] 적중 {cache_stats.hits} / 미스 {cache_stats.misses} "
+            f"/ 제거 {cache_stats.evictions} ({cache_stats.entries}/{cache_stats.capacity})"
+        )
+    if incremental and not (stats.added or stats.updated or stats.removed or options_changed):
+        log("변경된 문서가 없어 기존 인덱스를 유지합니다.")
+        return reporter.emit("done", 100, "변경된 문서가 없어 기존 인덱스를 유지합니다.", stats, bytes_written=0)
+    reporter.emit("saving", 90, f"인덱스 저장 중 (청크 {len(artifacts.chunks)}개)", stats)
+    version = save_index(artifacts, output_dir)
+    bytes_written = _directory_size(output_dir / version)
+    log(f"인덱스 저장 완료: {options.output_dir}")
+    return reporter.emit(
+        "done",
+        100,
+        f"학습 완료: 임베딩 {stats.chunks_embedded}개, 인덱스 {bytes_written / 1024 / 1024:.1f}MiB 저장",
+        stats,
+        bytes_written=bytes_written,
+    )
+
+
+def _print_event(event: dict[str, Any]) -> None:
+    print(json.dumps(event, ensure_ascii=False), flush=True)
+
+
 def main() -> None:
     args = parse_args()
-    paths = [Path(path_str) for path_str in args.input]
-    documents = load_documents(paths, args.url)
-    if not documents:
-        raise SystemExit("인덱싱할 문서가 없습니다.")
-    artifacts = build_index(
-        documents,
-        model_name=args.model,
+    options = IngestOptions(
+        inputs=args.input,
+        urls=args.url,
+        output_dir=args.output_dir,
+        model=args.model,
+        embedding_backend=args.embedding_backend,
+        chunker=args.chunker,
         max_chars=args.max_chars,
         overlap=args.overlap,
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens,
+        batch_size=args.batch_size,
+        index_spec=args.index_spec,
+        dedupe_distance=None if args.no_dedupe else args.dedupe_distance,
+        dedupe_jaccard=args.dedupe_jaccard,
+        incremental=args.incremental,
+        workers=args.workers,
+        fetch_workers=args.fetch_workers,
+        per_host=args.per_host,
+        embedding_cache_dir=None if args.no_embedding_cache else args.embedding_cache_dir,
+        embedding_cache_size=args.embedding_cache_size,
     )
-    save_index(artifacts, Path(args.output_dir))
-    print(f"인덱스 저장 완료: {args.output_dir}")
+    try:
+        run_ingest(options, on_event=_print_event if args.progress_json else None)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
 
 
 if __name__ == "__main__":
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import queue
+from multiprocessing.process import BaseProcess
+from threading import Lock
+from typing import Any, Callable
+from uuid import uuid4
+
+from embedding_backends import DEFAULT_BACKEND
+from ingest import IngestOptions, run_ingest
+from model_registry import get_model
+
+
+def _worker_main(jobs: Any, events: Any, warm_model: str | None, warm_backend: str) -> None:
+    if warm_model:
+        get_model(warm_model, warm_backend)
+    while True:
+        job = jobs.get()
+        if job is None:
+            return
+        job_id, options = job
+
+        def forward(event: dict[str, Any]) -> None:
+            events.put((job_id, event))
+
+        try:
+            result = run_ingest(options, on_event=forward, log=logging.info)
+            events.put((job_id, {"event": "completed", "result": result}))
+        except Exception as exc:
+            logging.exception("인덱싱 작업 실패: %s", job_id)
+            events.put((job_id, {"event": "failed", "message": str(exc)}))
+
+
+class IngestWorker:
+    def __init__(
+        self,
+        *,
+        warm_model: str | None = None,
+        warm_backend: str = DEFAULT_BACKEND,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.warm_model = warm_model
+        self.warm_backend = warm_backend
+        self.poll_interval = poll_interval
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = Lock()
+        self._process: BaseProcess | None = None
+        self._jobs: Any = None
+        self._events: Any = None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            self._ensure_started()
+
+    def _ensure_started(self) -> None:
+        if self.alive:
+            return
+        # 작업 프로세스는 문서 파싱용 프로세스 풀을 다시 띄우므로 daemon으로 만들지 않고 stop()에서 직접 종료한다.
+        self._jobs = self._context.Queue()
+        self._events = self._context.Queue()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(self._jobs, self._events, self.warm_model, self.warm_backend),
+            name="ingest-worker",
+        )
+        self._process.start()
+        logging.info("인덱싱 작업 프로세스 시작: pid=%s", self._process.pid)
+
+    def submit(
+        self,
+        options: IngestOptions,
+        *,
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        # 모델과 임베딩 캐시를 공유하는 프로세스 하나가 작업을 순서대로 처리한다.
+        with self._lock:
+            self._ensure_started()
+            job_id = uuid4().hex
+            self._jobs.put((job_id, options))
+            while True:
+                try:
+                    event_job_id, event = self._events.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    if not self.alive:
+                        self._process = None
+                        raise RuntimeError("인덱싱 작업 프로세스가 비정상 종료되었습니다.") from None
+                    continue
+                if event_job_id != job_id:
+                    continue
+                if event["event"] == "completed":
+                    return event["result"]
+                if event["event"] == "failed":
+                    raise RuntimeError(event["message"])
+                if on_event is not None:
+                    on_event(event)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        # 진행 중인 작업이 submit()의 잠금을 잡고 있을 수 있으므로 잠금 없이 종료 신호를 보낸다.
+        process = self._process
+        if process is None:
+            return
+        if process.is_alive():
+            self._jobs.put(None)
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._process = None
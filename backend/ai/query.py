@@ -6,7 +6,8 @@ from pathlib import Path
 
 from openai import OpenAI
 
-from rag_pipeline import load_index, search
+from rag_pipeline import DocumentChunk, load_index, search
+from reranker import DEFAULT_RERANK_MODEL, Reranker
 
 
 def parse_args() -> argparse.Namespace:
@@ -15,9 +16,17 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--question", required=True, help="질문")
     parser.add_argument("--index-dir", default=str(default_index_dir), help="인덱스 경로")
     parser.add_argument("--top-k", type=int, default=4, help="검색 결과 수")
+    parser.add_argument("--rerank", action="store_true", help="cross-encoder로 후보를 다시 정렬해 상위 top-k만 사용")
+    parser.add_argument("--rerank-model", default=DEFAULT_RERANK_MODEL, help="리랭크 cross-encoder 모델")
+    parser.add_argument("--candidates", type=int, default=20, help="리랭크 전에 가져올 후보 수")
+    parser.add_argument("--max-latency-ms", type=float, default=150.0, help="리랭크 지연 시간 예산 (ms)")
     return parser.parse_args()
 
 
+def format_contexts(results: list[DocumentChunk]) -> list[str]:
+    return [f"[출처: {item.source}]\n{item.text}" for item in results]
+
+
 def build_prompt(question: str, contexts: list[str]) -> list[dict[str, str]]:
     system_prompt = (
         "당신은 스포츠과학 전문가입니다. 한국어로 답변하되 '-습니다/했습니다' 체를 유지하십시오. "
@@ -35,8 +44,14 @@ def build_prompt(question: str, contexts: list[str]) -> list[dict[str, str]]:
 def main() -> None:
     args = parse_args()
     artifacts = load_index(Path(args.index_dir))
-    results = search(artifacts, args.question, top_k=args.top_k)
-    contexts = [f"[출처: {item.source}]\n{item.text}" for item in results]
+    if args.rerank:
+        reranker = Reranker(args.rerank_model, candidates=args.candidates, max_latency_ms=args.max_latency_ms)
+        reranker.warm()
+        candidates = search(artifacts, args.question, top_k=max(args.candidates, args.top_k))
+        results, _ = reranker.rerank(args.question, candidates, top_k=args.top_k)
+    else:
+        results = search(artifacts, args.question, top_k=args.top_k)
+    contexts = format_contexts(results)
 
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -6,7 +6,7 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from . import models, schemas
-from .db import get_db
+from .db import SessionLocal, get_db
 from .security import (
     create_access_token,
     create_refresh_token,
@@ -146,6 +146,16 @@ def get_current_user(
     return user
 
 
+def get_current_user_detached(token: str = Depends(oauth2_scheme)) -> models.User:
+    # LLM 호출/스트리밍처럼 오래 기다리는 핸들러용. 사용자만 읽고 세션을 바로 닫아 커넥션 풀을 붙잡지 않는다.
+    # 반환된 사용자는 세션에서 분리되므로 이미 읽힌 컬럼만 쓴다.
+    db = SessionLocal()
+    try:
+        return get_current_user(token, db)
+    finally:
+        db.close()
+
+
 def require_admin(current_user: models.User = Depends(get_current_user)) -> models.User:
     if current_user.role != "admin":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 권한이 필요합니다.")
@@ -1,17 +1,23 @@
+import asyncio
+import json
+import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Any, AsyncIterator, Callable, List, TypeVar
 
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from . import models, schemas
-from .auth import get_current_user
-from .db import get_db
-from .services import generate_chat_answer, sanitize_chat_text, summarize_chat
+from .auth import get_current_user, get_current_user_detached
+from .db import SessionLocal
+from .services import asummarize_chat, generate_chat_answer, sanitize_chat_text, stream_chat_answer
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+T = TypeVar("T")
+
 BASE_DIR = Path(__file__).resolve().parents[1]
 RECORD_DIR = BASE_DIR / "chat" / "record"
 SUMMARY_DIR = BASE_DIR / "chat" / "summation"
@@ -60,32 +66,99 @@ def _current_date_str() -> str:
     return datetime.utcnow().strftime("%Y-%m-%d")
 
 
-@router.post("/ask", response_model=schemas.ChatResponse)
-def ask_chat(
-    payload: schemas.ChatRequest,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    try:
-        answer, reference = generate_chat_answer(payload.message)
-    except Exception as exc:
-        raise HTTPException(status_code=502, detail="ChatGPT 응답을 불러오지 못했습니다.") from exc
+def _append_chat_record(
+    db: Session, user_pk: int, user_id: str, message: str, answer: str, reference: str
+) -> Path:
     date_str = _current_date_str()
-    user_dir = RECORD_DIR / current_user.user_id
+    user_dir = RECORD_DIR / user_id
     _ensure_dir(user_dir)
-    file_path = user_dir / f"{current_user.user_id}-{date_str}.txt"
+    file_path = user_dir / f"{user_id}-{date_str}.txt"
     with file_path.open("a", encoding="utf-8") as file:
-        file.write(f"나: {payload.message}\n")
+        file.write(f"나: {message}\n")
         file.write(f"GPT: {answer}\n")
         if reference:
             file.write(f"출처: {reference}\n")
         file.write("\n")
-    record = models.ChatRecord(user_id=current_user.id, file_path=str(file_path))
+    record = models.ChatRecord(user_id=user_pk, file_path=str(file_path))
     db.add(record)
     db.commit()
+    return file_path
+
+
+def _in_new_session(write: Callable[..., T], *args: Any) -> T:
+    # LLM 응답을 기다리는 동안 커넥션을 붙잡지 않도록 기록할 때만 짧게 세션을 연다.
+    db = SessionLocal()
+    try:
+        return write(db, *args)
+    finally:
+        db.close()
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+# LLM 응답을 기다리는 동안 스레드풀 작업자를 붙잡지 않도록 채팅/요약 핸들러는 async로 두고,
+# 파일/DB 작업만 스레드에서 실행한다. 사용자 인증 세션은 바로 닫고, 기록할 때만 새 세션을 연다.
+@router.post("/ask", response_model=schemas.ChatResponse)
+async def ask_chat(
+    payload: schemas.ChatRequest,
+    current_user: models.User = Depends(get_current_user_detached),
+):
+    try:
+        answer, reference = await generate_chat_answer(payload.message)
+    except Exception as exc:
+        raise HTTPException(status_code=502, detail="ChatGPT 응답을 불러오지 못했습니다.") from exc
+    file_path = await asyncio.to_thread(
+        _in_new_session,
+        _append_chat_record,
+        current_user.id,
+        current_user.user_id,
+        payload.message,
+        answer,
+        reference,
+    )
     return schemas.ChatResponse(answer=answer, reference=reference, file_path=str(file_path))
 
 
+@router.post("/ask/stream")
+async def ask_chat_stream(
+    payload: schemas.ChatRequest,
+    current_user: models.User = Depends(get_current_user_detached),
+):
+    # text/event-stream으로 답변 조각(delta)을 받는 즉시 보내고, 끝나면 정리된 전체 답변(done)을 보낸 뒤 기록한다.
+    user_pk, user_id = current_user.id, current_user.user_id
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in stream_chat_answer(payload.message):
+                if event["type"] == "delta":
+                    yield _sse("delta", {"text": event["text"]})
+                    continue
+                file_path = await asyncio.to_thread(
+                    _in_new_session,
+                    _append_chat_record,
+                    user_pk,
+                    user_id,
+                    payload.message,
+                    event["answer"],
+                    event["reference"],
+                )
+                yield _sse(
+                    "done",
+                    {"answer": event["answer"], "reference": event["reference"], "file_path": str(file_path)},
+                )
+        except Exception:
+            logging.exception("채팅 스트리밍 중 오류 발생")
+            yield _sse("error", {"detail": "ChatGPT 응답을 불러오지 못했습니다."})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/history", response_model=schemas.ChatHistoryDatesResponse)
 def get_chat_history_dates(
     current_user: models.User = Depends(get_current_user),
@@ -116,10 +189,21 @@ def get_chat_history(
     return schemas.ChatHistoryResponse(date=date_str, entries=entries, is_today=date_str == today)
 
 
+def _save_summary(db: Session, user_pk: int, user_id: str, date: datetime, summary: str) -> Path:
+    date_str = date.strftime("%Y-%m-%d")
+    user_summary_dir = SUMMARY_DIR / user_id
+    _ensure_dir(user_summary_dir)
+    summary_file = user_summary_dir / f"{user_id}-{date_str}_sum.txt"
+    summary_file.write_text(summary, encoding="utf-8")
+    summary_record = models.ChatSummary(user_id=user_pk, file_path=str(summary_file), summary_date=date)
+    db.add(summary_record)
+    db.commit()
+    return summary_file
+
+
 @router.post("/summarize", response_model=schemas.SummaryResponse)
-def summarize_day(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+async def summarize_day(
+    current_user: models.User = Depends(get_current_user_detached),
 ):
     date = datetime.utcnow()
     date_str = date.strftime("%Y-%m-%d")
@@ -127,15 +211,9 @@ def summarize_day(
     record_file = user_record_dir / f"{current_user.user_id}-{date_str}.txt"
     if not record_file.exists():
         raise HTTPException(status_code=404, detail="대화 기록이 없습니다.")
-    content = record_file.read_text(encoding="utf-8")
-    summary = summarize_chat(content, date)
-    user_summary_dir = SUMMARY_DIR / current_user.user_id
-    _ensure_dir(user_summary_dir)
-    summary_file = user_summary_dir / f"{current_user.user_id}-{date_str}_sum.txt"
-    summary_file.write_text(summary, encoding="utf-8")
-    summary_record = models.ChatSummary(
-        user_id=current_user.id, file_path=str(summary_file), summary_date=date
+    content = await asyncio.to_thread(record_file.read_text, encoding="utf-8")
+    summary = await asummarize_chat(content, date)
+    summary_file = await asyncio.to_thread(
+        _in_new_session, _save_summary, current_user.id, current_user.user_id, date, summary
     )
-    db.add(summary_record)
-    db.commit()
     return schemas.SummaryResponse(file_path=str(summary_file), summary=summary)
@@ -13,12 +13,40 @@ class Settings(BaseSettings):
     openai_token_budget: int = 128000
     openai_usage_endpoint: str = "https://api.openai.com/v1/usage"
     openai_api_key: str | None = None
+    openai_timeout_seconds: float = 60.0
+    openai_long_timeout_seconds: float = 180.0
+    openai_connect_timeout_seconds: float = 5.0
+    openai_max_connections: int = 100
+    openai_max_keepalive_connections: int = 20
+    openai_keepalive_expiry_seconds: float = 30.0
+    openai_http2: bool = True
     gemini_api_key: str | None = None
     # gemini_model: str = "gemini-2.5-pro"
     gemini_model: str = "gemini-2.5-flash" # gemini-flash-latest
     cors_allow_origins: list[str] = []
     cors_allow_origin_regex: str | None = r"^https?://(localhost|127\\.0\\.0\\.1)(:\\d+)?$"
     cors_allow_credentials: bool = False
+    retrieval_warmup: bool = False
+    ingest_worker_warmup: bool = False
+    rag_chat_enabled: bool = False
+    rag_top_k: int = 4
+    retrieval_cache_size: int = 1024
+    retrieval_cache_ttl_seconds: float = 0
+    rerank_enabled: bool = False
+    rerank_model: str = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+    rerank_candidates: int = 20
+    rerank_batch_size: int = 16
+    rerank_max_latency_ms: float = 150.0
+    embedding_backend: str = "torch"
+    response_cache_enabled: bool = False
+    response_cache_model: str = "intfloat/multilingual-e5-small"
+    response_cache_threshold: float = 0.95
+    response_cache_size: int = 1024
+    response_cache_ttl_seconds: float = 86400
+    prompt_cache_backend: str = "memory"
+    prompt_cache_size: int = 256
+    prompt_cache_ttl_seconds: float = 86400
+    prompt_cache_redis_url: str = "redis://localhost:6379/2"
 
     class Config:
         env_file = ".env"
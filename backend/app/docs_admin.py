@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import asyncio
 import re
-import subprocess
-import sys
 from pathlib import Path
 from threading import Lock
-from typing import Iterable
+from typing import Any
 
 from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile, status
 from pydantic import BaseModel, HttpUrl
 
 from .auth import require_admin
+from .retrieval import (
+    refresh_retrieval,
+    retrieval_cache_stats,
+    retrieval_model_stats,
+    retrieval_rerank_stats,
+    run_ingest_in_worker,
+)
 
 
 class WebDocumentPayload(BaseModel):
@@ -24,6 +29,32 @@ class LearnStatus(BaseModel):
     message: str
 
 
+class RetrievalCacheStats(BaseModel):
+    name: str
+    entries: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+
+class RerankStats(BaseModel):
+    model_name: str
+    reranked: int
+    partial: int
+    skipped: int
+    pair_ms: float
+
+
+class ModelLoadStats(BaseModel):
+    model_name: str
+    load_seconds: float
+    parameter_bytes: int
+    rss_delta_bytes: int | None
+
+
 DOCS_ROOT = Path(__file__).resolve().parents[1] / "ai" / "docs"
 DOCS_WEB_URLS = DOCS_ROOT / "web" / "urls.txt"
 DOCS_FOLDERS = {
@@ -78,37 +109,6 @@ def _current_status() -> LearnStatus:
         return LearnStatus(**_learn_status.model_dump())
 
 
-async def _run_ingest(paths: Iterable[Path], urls: Iterable[str]) -> None:
-    command = [sys.executable, "ai/ingest.py"]
-    for path in paths:
-        command.extend(["--input", str(path)])
-    for url in urls:
-        command.extend(["--url", url])
-    command.extend(["--output-dir", "ai/index"])
-
-    await asyncio.to_thread(
-        subprocess.run,
-        command,
-        check=True,
-        capture_output=True,
-        text=True,
-        cwd=Path(__file__).resolve().parents[1],
-    )
-
-
-async def _simulate_progress(start: int, end: int, message: str, steps: int = 8) -> None:
-    _update_learn_status("running", start, message)
-    if steps <= 0:
-        _update_learn_status("running", end, message)
-        return
-    increment = max(1, (end - start) // steps)
-    current = start
-    while current < end:
-        await asyncio.sleep(0.35)
-        current = min(end, current + increment)
-        _update_learn_status("running", current, message)
-
-
 async def _run_learning_job() -> None:
     try:
         _ensure_docs_dirs()
@@ -119,13 +119,12 @@ async def _run_learning_job() -> None:
             _update_learn_status("failed", 100, "학습할 문서가 없습니다.")
             return
 
-        ingest_task = asyncio.create_task(_run_ingest(paths, urls))
-        await _simulate_progress(0, 20, "문서/URL 수집 중", steps=6)
-        await _simulate_progress(20, 45, "문서 정제 및 청킹 중", steps=8)
-        await _simulate_progress(45, 80, "임베딩 생성 및 인덱스 구성 중", steps=10)
-        await ingest_task
-        await _simulate_progress(80, 100, "인덱스 저장 중", steps=6)
-        _update_learn_status("completed", 100, "학습 완료")
+        def report(event: dict[str, Any]) -> None:
+            _update_learn_status("running", min(int(event["progress"]), 99), event["message"])
+
+        result = await asyncio.to_thread(run_ingest_in_worker, paths, urls, on_progress=report)
+        refresh_retrieval()
+        _update_learn_status("completed", 100, result.get("message", "학습 완료"))
     except Exception as exc:  # noqa: BLE001 - 운영 환경에서 실패 메시지 전달 필요
         _update_learn_status("failed", 100, f"학습 실패: {exc}")
 
@@ -174,3 +173,18 @@ async def start_learning(
 @router.get("/learn/status", response_model=LearnStatus)
 async def get_learning_status(current_user=Depends(require_admin)):
     return _current_status()
+
+
+@router.get("/retrieval/cache", response_model=list[RetrievalCacheStats])
+async def get_retrieval_cache_stats(current_user=Depends(require_admin)):
+    return retrieval_cache_stats()
+
+
+@router.get("/retrieval/rerank", response_model=RerankStats | None)
+async def get_retrieval_rerank_stats(current_user=Depends(require_admin)):
+    return retrieval_rerank_stats()
+
+
+@router.get("/retrieval/models", response_model=list[ModelLoadStats])
+async def get_retrieval_model_stats(current_user=Depends(require_admin)):
+    return retrieval_model_stats()
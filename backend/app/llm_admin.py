@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
@@ -7,8 +8,23 @@ from pydantic import BaseModel
 
 from .auth import require_admin
 from .config import settings
+from .llm_client import llm_pool_stats
 from .llm_usage import get_usage_snapshot
 from .openai_usage import fetch_openai_usage
+from .prompt_cache import prompt_cache_stats
+from .response_cache import response_cache_stats
+
+
+class LlmCacheStatsResponse(BaseModel):
+    name: str
+    entries: int
+    capacity: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    tokens_saved: int
+    hit_rate: float
 
 
 class LlmUsageResponse(BaseModel):
@@ -20,6 +36,20 @@ class LlmUsageResponse(BaseModel):
     prompt_tokens: int
     completion_tokens: int
     last_updated: datetime | None
+    caches: list[LlmCacheStatsResponse] = []
+
+
+class LlmPoolStatsResponse(BaseModel):
+    name: str
+    http2: bool
+    max_connections: int
+    connections_open: int
+    connections_idle: int
+    requests_in_flight: int
+    requests_waiting: int
+    requests: int
+    connections_created: int
+    connections_reused: int
 
 
 router = APIRouter(prefix="/admin/llm", tags=["admin-llm"])
@@ -40,4 +70,10 @@ def get_llm_usage(current_user=Depends(require_admin)):
         prompt_tokens=snapshot.prompt_tokens,
         completion_tokens=snapshot.completion_tokens,
         last_updated=snapshot.updated_at,
+        caches=response_cache_stats() + prompt_cache_stats(),
     )
+
+
+@router.get("/pool", response_model=list[LlmPoolStatsResponse])
+def get_llm_pool_stats(current_user=Depends(require_admin)):
+    return [asdict(stats) for stats in llm_pool_stats()]
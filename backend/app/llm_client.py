@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+_lock = Lock()
+_options: dict[str, Any] = {
+    "timeout_seconds": 60.0,
+    "connect_timeout_seconds": 5.0,
+    "max_connections": 100,
+    "max_keepalive_connections": 20,
+    "keepalive_expiry_seconds": 30.0,
+    "http2": True,
+}
+_clients: dict[str, Any] = {}
+_counters: dict[str, dict[str, int]] = {}
+
+
+@dataclass
+class LlmPoolStats:
+    name: str
+    http2: bool
+    max_connections: int
+    connections_open: int
+    connections_idle: int
+    requests_in_flight: int
+    requests_waiting: int
+    requests: int
+    connections_created: int
+    connections_reused: int
+
+
+def configure_llm_client(
+    *,
+    timeout_seconds: float,
+    connect_timeout_seconds: float,
+    max_connections: int,
+    max_keepalive_connections: int,
+    keepalive_expiry_seconds: float,
+    http2: bool,
+) -> None:
+    # 클라이언트가 처음 만들어질 때 적용되므로 서버 시작 시 호출한다.
+    _options.update(
+        timeout_seconds=timeout_seconds,
+        connect_timeout_seconds=connect_timeout_seconds,
+        max_connections=max(max_connections, 1),
+        max_keepalive_connections=max(max_keepalive_connections, 0),
+        keepalive_expiry_seconds=keepalive_expiry_seconds,
+        http2=http2,
+    )
+
+
+def _http2_enabled() -> bool:
+    # HTTP/2는 h2 패키지가 있을 때만 켠다(pip install 'httpx[http2]').
+    return bool(_options["http2"]) and importlib.util.find_spec("h2") is not None
+
+
+def call_timeout(seconds: float | None = None) -> httpx.Timeout:
+    return httpx.Timeout(seconds or _options["timeout_seconds"], connect=_options["connect_timeout_seconds"])
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_options["max_connections"],
+        max_keepalive_connections=_options["max_keepalive_connections"],
+        keepalive_expiry=_options["keepalive_expiry_seconds"],
+    )
+
+
+def _count(name: str, key: str) -> None:
+    with _lock:
+        _counters[name][key] += 1
+
+
+def _sync_hooks(name: str) -> dict[str, list]:
+    # httpcore trace 이벤트로 새 TCP 연결을 맺은 요청과 기존 연결을 재사용한 요청을 구분한다.
+    def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            _count(name, "connections_created")
+
+    def on_request(request: httpx.Request) -> None:
+        _count(name, "requests")
+        request.extensions["trace"] = trace
+
+    return {"request": [on_request]}
+
+
+def _async_hooks(name: str) -> dict[str, list]:
+    async def trace(event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            _count(name, "connections_created")
+
+    async def on_request(request: httpx.Request) -> None:
+        _count(name, "requests")
+        request.extensions["trace"] = trace
+
+    return {"request": [on_request]}
+
+
+def _get_or_create(name: str, api_key: str, factory: Any) -> Any:
+    # 프로세스마다 클라이언트(연결 풀) 하나를 재사용한다. Celery처럼 fork된 자식은 부모의 소켓을 쓰지 않도록 새로 만든다.
+    key = (api_key, os.getpid())
+    entry = _clients.get(name)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    with _lock:
+        entry = _clients.get(name)
+        if entry is None or entry[0] != key:
+            _counters[name] = {"requests": 0, "connections_created": 0}
+            entry = _clients[name] = (key, factory())
+    return entry[1]
+
+
+def get_openai_client(api_key: str) -> OpenAI:
+    def factory() -> OpenAI:
+        http_client = httpx.Client(
+            limits=_limits(),
+            timeout=call_timeout(),
+            http2=_http2_enabled(),
+            event_hooks=_sync_hooks("sync"),
+        )
+        return OpenAI(api_key=api_key, http_client=http_client, timeout=call_timeout())
+
+    return _get_or_create("sync", api_key, factory)
+
+
+def get_async_openai_client(api_key: str) -> AsyncOpenAI:
+    def factory() -> AsyncOpenAI:
+        http_client = httpx.AsyncClient(
+            limits=_limits(),
+            timeout=call_timeout(),
+            http2=_http2_enabled(),
+            event_hooks=_async_hooks("async"),
+        )
+        return AsyncOpenAI(api_key=api_key, http_client=http_client, timeout=call_timeout())
+
+    return _get_or_create("async", api_key, factory)
+
+
+async def close_llm_clients() -> None:
+    with _lock:
+        entries = list(_clients.items())
+        _clients.clear()
+    for name, (_, client) in entries:
+        if name == "async":
+            await client.close()
+        else:
+            client.close()
+
+
+def _pool_state(client: Any) -> tuple[int, int, int, int]:
+    # httpx가 풀 상태를 공개 API로 노출하지 않아 httpcore 연결 풀을 직접 들여다본다.
+    pool = getattr(getattr(client._client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    requests = list(getattr(pool, "_requests", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    waiting = sum(1 for request in requests if getattr(request, "connection", None) is None)
+    return len(connections), idle, len(requests) - waiting, waiting
+
+
+def llm_pool_stats() -> list[LlmPoolStats]:
+    stats = []
+    for name, (_, client) in list(_clients.items()):
+        opened, idle, in_flight, waiting = _pool_state(client)
+        counters = dict(_counters.get(name, {}))
+        requests = counters.get("requests", 0)
+        created = counters.get("connections_created", 0)
+        stats.append(
+            LlmPoolStats(
+                name=name,
+                http2=_http2_enabled(),
+                max_connections=_options["max_connections"],
+                connections_open=opened,
+                connections_idle=idle,
+                requests_in_flight=in_flight,
+                requests_waiting=waiting,
+                requests=requests,
+                connections_created=created,
+                connections_reused=max(requests - created, 0),
+            )
+        )
+    return stats
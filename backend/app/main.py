@@ -12,11 +12,51 @@ from .config import settings
 from .docs_admin import router as docs_admin_router
 from .db import Base, engine
 from .llm_admin import router as llm_admin_router
+from .llm_client import close_llm_clients, configure_llm_client
 from .logging_utils import log_error
 from .quiz import router as quiz_router
+from .prompt_cache import configure_prompt_cache
+from .response_cache import configure_response_cache
+from .retrieval import (
+    configure_retrieval,
+    get_ingest_worker,
+    stop_ingest_worker,
+    warm_embedding_models,
+    warm_retrieval,
+)
 from .security import hash_password
 
 app = FastAPI(title="SS-AI Sports Science")
+configure_retrieval(
+    cache_size=settings.retrieval_cache_size,
+    cache_ttl_seconds=settings.retrieval_cache_ttl_seconds,
+    rerank_model=settings.rerank_model if settings.rerank_enabled else None,
+    rerank_candidates=settings.rerank_candidates,
+    rerank_batch_size=settings.rerank_batch_size,
+    rerank_max_latency_ms=settings.rerank_max_latency_ms,
+    embedding_backend=settings.embedding_backend,
+)
+configure_llm_client(
+    timeout_seconds=settings.openai_timeout_seconds,
+    connect_timeout_seconds=settings.openai_connect_timeout_seconds,
+    max_connections=settings.openai_max_connections,
+    max_keepalive_connections=settings.openai_max_keepalive_connections,
+    keepalive_expiry_seconds=settings.openai_keepalive_expiry_seconds,
+    http2=settings.openai_http2,
+)
+configure_response_cache(
+    enabled=settings.response_cache_enabled,
+    model_name=settings.response_cache_model,
+    threshold=settings.response_cache_threshold,
+    max_entries=settings.response_cache_size,
+    ttl_seconds=settings.response_cache_ttl_seconds,
+)
+configure_prompt_cache(
+    backend=settings.prompt_cache_backend,
+    max_entries=settings.prompt_cache_size,
+    ttl_seconds=settings.prompt_cache_ttl_seconds,
+    redis_url=settings.prompt_cache_redis_url,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -155,6 +195,12 @@ def _ensure_role_tables() -> None:
 
 @app.on_event("startup")
 async def startup() -> None:
+    if settings.retrieval_warmup:
+        query_models = [settings.response_cache_model] if settings.response_cache_enabled else []
+        asyncio.create_task(asyncio.to_thread(warm_embedding_models, query_models))
+        asyncio.create_task(asyncio.to_thread(warm_retrieval))
+    if settings.ingest_worker_warmup:
+        asyncio.create_task(asyncio.to_thread(get_ingest_worker().start))
     for attempt in range(1, settings.database_connect_max_retries + 1):
         try:
             Base.metadata.create_all(bind=engine)
@@ -171,6 +217,12 @@ async def startup() -> None:
             await asyncio.sleep(settings.database_connect_retry_seconds)
 
 
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    await asyncio.to_thread(stop_ingest_worker)
+    await close_llm_clients()
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     log_error(request, exc, status_code=exc.status_code)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Any
+
+from .response_cache import LlmCacheStats
+
+PROMPT_CACHE_BACKENDS = ("memory", "redis")
+COUNTER_FIELDS = ("hits", "misses", "evictions", "expirations", "tokens_saved")
+
+
+def prompt_cache_key(model: str, messages: list[dict[str, str]], temperature: float) -> str:
+    # 모델, 시스템/사용자 프롬프트, temperature가 모두 같은 호출만 같은 키가 된다.
+    payload = json.dumps(
+        {"model": model, "temperature": temperature, "messages": messages},
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedPrompt:
+    content: str
+    tokens: int
+
+
+class MemoryPromptCacheBackend:
+    def __init__(self, *, max_entries: int, ttl_seconds: float | None) -> None:
+        self.capacity = max(max_entries, 0)
+        self.ttl_seconds = ttl_seconds or None
+        self._lock = Lock()
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._counters = dict.fromkeys(COUNTER_FIELDS, 0)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self._counters["expirations"] += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        if not self.capacity:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[field] += amount
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisPromptCacheBackend:
+    # 웹 프로세스와 Celery 워커가 같은 항목과 통계를 보도록 Redis에 둔다. 만료는 Redis TTL에 맡긴다.
+    capacity = 0
+
+    def __init__(self, url: str, *, ttl_seconds: float | None, prefix: str = "ss-ai:prompt:") -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("redis 프롬프트 캐시를 쓰려면 redis 패키지를 설치하세요: pip install redis") from exc
+        self._client = redis.Redis.from_url(url, socket_timeout=1.0, socket_connect_timeout=1.0)
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds else None
+        self._key_prefix = f"{prefix}key:"
+        self._stats_key = f"{prefix}stats"
+
+    def get(self, key: str) -> str | None:
+        value = self._client.get(self._key_prefix + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        self._client.set(self._key_prefix + key, value, ex=self.ttl_seconds)
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self._key_prefix + key)
+
+    def incr(self, field: str, amount: int = 1) -> None:
+        self._client.hincrby(self._stats_key, field, amount)
+
+    def counters(self) -> dict[str, int]:
+        values = self._client.hgetall(self._stats_key)
+        return {field.decode("utf-8"): int(value) for field, value in values.items()}
+
+    def size(self) -> int:
+        return sum(1 for _ in self._client.scan_iter(match=f"{self._key_prefix}*", count=1000))
+
+
+class PromptCache:
+    # 캐시 저장소 오류는 경고만 남기고 캐시 미스로 처리해 LLM 호출이 막히지 않게 한다.
+    def __init__(self, backend: MemoryPromptCacheBackend | RedisPromptCacheBackend) -> None:
+        self.backend = backend
+
+    def get(self, key: str) -> CachedPrompt | None:
+        try:
+            raw = self.backend.get(key)
+            if raw is None:
+                self.backend.incr("misses")
+                return None
+            value = CachedPrompt(**json.loads(raw))
+            self.backend.incr("hits")
+            self.backend.incr("tokens_saved", value.tokens)
+            return value
+        except Exception as exc:
+            logging.warning("프롬프트 캐시 조회 실패: %s", exc)
+            return None
+
+    def set(self, key: str, value: CachedPrompt) -> None:
+        try:
+            self.backend.set(key, json.dumps(asdict(value), ensure_ascii=False))
+        except Exception as exc:
+            logging.warning("프롬프트 캐시 저장 실패: %s", exc)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as exc:
+            logging.warning("프롬프트 캐시 삭제 실패: %s", exc)
+
+    def stats(self, name: str) -> LlmCacheStats:
+        counters = dict.fromkeys(COUNTER_FIELDS, 0)
+        try:
+            counters.update(self.backend.counters())
+            entries = self.backend.size()
+        except Exception as exc:
+            logging.warning("프롬프트 캐시 통계 조회 실패: %s", exc)
+            entries = 0
+        return LlmCacheStats(name=name, entries=entries, capacity=self.backend.capacity, **counters)
+
+
+_lock = Lock()
+_cache: PromptCache | None = None
+_cache_options: dict[str, Any] = {}
+
+
+def configure_prompt_cache(
+    *,
+    backend: str,
+    max_entries: int,
+    ttl_seconds: float,
+    redis_url: str,
+) -> None:
+    # 캐시가 처음 쓰일 때 적용되므로 서버 시작 시 호출한다. backend가 비어 있으면 캐시를 끈다.
+    _cache_options.clear()
+    if not backend:
+        return
+    if backend not in PROMPT_CACHE_BACKENDS:
+        raise ValueError(f"지원하지 않는 프롬프트 캐시 백엔드입니다: {backend}")
+    _cache_options.update(backend=backend, max_entries=max_entries, ttl_seconds=ttl_seconds, redis_url=redis_url)
+
+
+def get_prompt_cache() -> PromptCache | None:
+    global _cache
+    if not _cache_options:
+        return None
+    if _cache is not None:
+        return _cache
+    with _lock:
+        if _cache is None and _cache_options:
+            try:
+                if _cache_options["backend"] == "redis":
+                    backend = RedisPromptCacheBackend(
+                        _cache_options["redis_url"],
+                        ttl_seconds=_cache_options["ttl_seconds"],
+                    )
+                else:
+                    backend = MemoryPromptCacheBackend(
+                        max_entries=_cache_options["max_entries"],
+                        ttl_seconds=_cache_options["ttl_seconds"],
+                    )
+            except RuntimeError:
+                logging.exception("프롬프트 캐시를 만들지 못해 캐시 없이 동작합니다.")
+                _cache_options.clear()
+                return None
+            _cache = PromptCache(backend)
+    return _cache
+
+
+def prompt_cache_stats() -> list[dict[str, Any]]:
+    # Redis 백엔드는 다른 프로세스(Celery 워커)의 통계도 담고 있으므로 이 프로세스에서 아직 안 썼어도 연결한다.
+    cache = get_prompt_cache()
+    if cache is None:
+        return []
+    stats = cache.stats("prompt_exact")
+    return [{**asdict(stats), "hit_rate": round(stats.hit_rate, 4)}]
@@ -178,7 +178,8 @@ def _generate_quiz_for_user(
     invalid_attempts = 0
     quiz_payloads: list[dict[str, object]] = []
     for attempt_index in range(attempts):
-        candidate_payloads = generate_quiz(summary)
+        # 첫 시도만 같은 요약의 이전 응답을 재사용하고, 재시도는 새 문제를 받아야 하므로 캐시를 건너뛴다.
+        candidate_payloads = generate_quiz(summary, use_cache=attempt_index == 0)
         for candidate_payload in candidate_payloads:
             if len(quiz_payloads) >= 5:
                 break
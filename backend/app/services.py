@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import random
@@ -7,14 +8,18 @@ import re
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import uuid4
 
 import requests
-from openai import APIStatusError, OpenAI, RateLimitError
+from openai import APIStatusError, AsyncOpenAI, OpenAI, RateLimitError
 
 from .config import settings
+from .llm_client import call_timeout, get_async_openai_client, get_openai_client
 from .llm_usage import record_usage
+from .prompt_cache import CachedPrompt, get_prompt_cache, prompt_cache_key
+from .response_cache import CachedAnswer, get_response_cache
+from .retrieval import build_rag_messages, format_rag_references, get_retrieval_service
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 ISSUE_LOG_DIR = BASE_DIR / "logs" / "issues"
@@ -24,6 +29,11 @@ LIST_REGEX = re.compile(r"(?m)^\s*[-*+]\s+")
 NUMBERED_LIST_REGEX = re.compile(r"(?m)^\s*\d+\.\s+")
 BLOCKQUOTE_REGEX = re.compile(r"(?m)^\s*>\s?")
 HR_REGEX = re.compile(r"(?m)^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+REFERENCE_MARKER = "출처:"
+# 검색 문맥의 [출처: ...] 태그를 인용한 문장에서 답변이 잘리지 않도록 줄 머리의 '출처:'만 출처 목록의 시작으로 본다.
+MARKDOWN_LINE_MARKS = " \t>#*_-"
+REFERENCE_LINE_REGEX = re.compile(rf"(?m)^[{re.escape(MARKDOWN_LINE_MARKS)}]*{REFERENCE_MARKER}")
+LLM_TEMPERATURE = 0.2
 
 
 def _strip_markdown(text: str) -> str:
@@ -44,6 +54,78 @@ def _strip_markdown(text: str) -> str:
     return cleaned.strip()
 
 
+def _split_reference(content: str) -> tuple[str, str | None]:
+    match = REFERENCE_LINE_REGEX.search(content)
+    if match is None:
+        return content, None
+    return content[: match.start()], content[match.end() :]
+
+
+def _has_open_inline_mark(text: str) -> bool:
+    if text.count("`") % 2:
+        return True
+    singles = text.replace("**", "").replace("__", "")
+    return bool(text.count("**") % 2 or text.count("__") % 2 or singles.count("*") % 2 or singles.count("_") % 2)
+
+
+class MarkdownStreamCleaner:
+    # 스트리밍 중에도 지금까지 확정된 본문에 _strip_markdown을 그대로 적용하고, 이미 보낸 결과에 이어지는 부분만 내보낸다.
+    # 끝난 줄과 현재 줄에서 강조 기호가 닫힌 마지막 공백까지를 확정된 본문으로 보며, '출처:'로 시작하는 줄부터는 보내지 않는다.
+    # 목록/인용 앞 빈 줄처럼 뒤따르는 줄에 따라 지워지는 공백은 _strip_markdown이 끝에서 잘라내므로 다음 내용이 올 때까지 보류된다.
+    def __init__(self) -> None:
+        self.content = ""
+        self._body = ""
+        self._line = ""
+        self._stable = ""
+        self._sent = ""
+        self._in_reference = False
+
+    def feed(self, delta: str) -> str:
+        self.content += delta
+        if self._in_reference:
+            return ""
+        self._line += delta
+        while not self._in_reference:
+            if REFERENCE_LINE_REGEX.match(self._line):
+                self._in_reference = True
+                self._line = ""
+                break
+            newline = self._line.find("\n")
+            if newline == -1:
+                break
+            self._body += self._line[: newline + 1]
+            self._line = self._line[newline + 1 :]
+        # 아직 '출처:'가 될 수 있는 줄 머리는 다음 조각을 볼 때까지 보내지 않는다.
+        if self._in_reference or REFERENCE_MARKER.startswith(self._line.lstrip(MARKDOWN_LINE_MARKS)):
+            return self._send(self._body)
+        return self._send(self._body + self._stable_prefix())
+
+    def finish(self) -> str:
+        self._body += self._line
+        self._line = ""
+        return self._send(self._body)
+
+    def _stable_prefix(self) -> str:
+        # 줄 머리 기호는 뒤따르는 공백까지 봐야 지워지므로 마지막 공백까지만 확정된 것으로 본다.
+        cut = self._line.rfind(" ")
+        if cut <= 0 or self._line.lstrip().startswith("```"):
+            return ""
+        prefix = self._line[: cut + 1]
+        return "" if _has_open_inline_mark(prefix) else prefix
+
+    def _send(self, stable: str) -> str:
+        if stable == self._stable:
+            return ""
+        self._stable = stable
+        cleaned = _strip_markdown(stable)
+        # 뒤에 온 내용이 앞부분의 정리 결과를 바꾼 경우(줄을 넘는 코드 표시 등)에는 done의 전체 답변에 맡긴다.
+        if not cleaned.startswith(self._sent):
+            return ""
+        delta = cleaned[len(self._sent) :]
+        self._sent = cleaned
+        return delta
+
+
 def sanitize_chat_text(text: str) -> str:
     return _strip_markdown(text)
 
@@ -52,7 +134,14 @@ def _client() -> OpenAI:
     api_key = settings.openai_api_key
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
-    return OpenAI(api_key=api_key)
+    return get_openai_client(api_key)
+
+
+def _async_client() -> AsyncOpenAI:
+    api_key = settings.openai_api_key
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY가 설정되지 않았습니다.")
+    return get_async_openai_client(api_key)
 
 
 def _log_issue(
@@ -137,51 +226,162 @@ def _filter_references(reference: str) -> str:
     return " ".join(valid_urls)
 
 
+def _retry_delay(exc: Exception, attempt: int, max_retries: int, base_delay: float) -> float | None:
+    # 다시 시도할 429 응답이면 대기 시간을, 그 밖의 오류나 재시도 소진이면 None을 돌려준다.
+    if attempt >= max_retries:
+        return None
+    delay = base_delay * (2**attempt)
+    if isinstance(exc, RateLimitError):
+        logging.warning("Rate limit 발생. %.1f초 후 재시도합니다.", delay, exc_info=exc)
+        return delay
+    if not isinstance(exc, APIStatusError) or exc.status_code != 429:
+        return None
+    if _extract_error_code(exc) == "insufficient_quota" and attempt >= max_retries - 2:
+        return None
+    logging.warning("API 429 응답. %.1f초 후 재시도합니다.", delay, exc_info=exc)
+    return delay
+
+
+def _record_response_usage(usage: Any) -> int:
+    if not usage:
+        return 0
+    record_usage(
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        total_tokens=usage.total_tokens or 0,
+    )
+    return usage.total_tokens or 0
+
+
+def _prompt_cache_key(messages: list[dict[str, str]]) -> str:
+    return prompt_cache_key(settings.openai_model, messages, LLM_TEMPERATURE)
+
+
+def _discard_cached_prompt(messages: list[dict[str, str]]) -> None:
+    # 호출은 성공했지만 쓸 수 없는 응답(예: JSON 파싱 실패)이 다음 호출에 재사용되지 않게 지운다.
+    cache = get_prompt_cache()
+    if cache is not None:
+        cache.delete(_prompt_cache_key(messages))
+
+
 def _call_chatgpt(
     messages: list[dict[str, str]],
     max_retries: int = 5,
     base_delay: float = 1.0,
-) -> str:
+    timeout: float | None = None,
+    use_cache: bool = False,
+) -> tuple[str, int]:
+    # 응답 본문과 이번 호출에 쓴 전체 토큰 수를 함께 돌려준다(응답 캐시의 절감량 계산용).
+    # use_cache이면 모델/프롬프트/temperature가 같은 이전 응답을 그대로 돌려주고, 이때 토큰은 0이다.
+    cache = get_prompt_cache() if use_cache else None
+    key = _prompt_cache_key(messages) if cache is not None else ""
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached.content, 0
     client = _client()
     for attempt in range(max_retries + 1):
         try:
             response = client.chat.completions.create(
                 model=settings.openai_model,
                 messages=messages,
-                temperature=0.2,
+                temperature=LLM_TEMPERATURE,
+                timeout=call_timeout(timeout),
             )
-            if response.usage:
-                record_usage(
-                    prompt_tokens=response.usage.prompt_tokens or 0,
-                    completion_tokens=response.usage.completion_tokens or 0,
-                    total_tokens=response.usage.total_tokens or 0,
-                )
-            return response.choices[0].message.content or ""
-        except RateLimitError as exc:
-            if attempt >= max_retries:
+            tokens = _record_response_usage(response.usage)
+            content = response.choices[0].message.content or ""
+            if cache is not None and content:
+                cache.set(key, CachedPrompt(content, tokens))
+            return content, tokens
+        except APIStatusError as exc:
+            delay = _retry_delay(exc, attempt, max_retries, base_delay)
+            if delay is None:
                 raise
-            delay = base_delay * (2**attempt)
-            logging.warning("Rate limit 발생. %.1f초 후 재시도합니다.", delay, exc_info=exc)
             time.sleep(delay)
+    return "", 0
+
+
+async def _acall_chatgpt(
+    messages: list[dict[str, str]],
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    timeout: float | None = None,
+    use_cache: bool = False,
+) -> tuple[str, int]:
+    # 응답을 기다리는 동안 스레드를 붙잡지 않아 작업자 하나가 많은 대화를 동시에 처리할 수 있다.
+    cache = get_prompt_cache() if use_cache else None
+    key = _prompt_cache_key(messages) if cache is not None else ""
+    if cache is not None:
+        # Redis 백엔드는 네트워크 I/O라 이벤트 루프를 막지 않도록 스레드에서 조회/저장한다.
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached.content, 0
+    client = _async_client()
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.chat.completions.create(
+                model=settings.openai_model,
+                messages=messages,
+                temperature=LLM_TEMPERATURE,
+                timeout=call_timeout(timeout),
+            )
+            tokens = _record_response_usage(response.usage)
+            content = response.choices[0].message.content or ""
+            if cache is not None and content:
+                await asyncio.to_thread(cache.set, key, CachedPrompt(content, tokens))
+            return content, tokens
         except APIStatusError as exc:
-            if exc.status_code != 429 or attempt >= max_retries:
+            delay = _retry_delay(exc, attempt, max_retries, base_delay)
+            if delay is None:
                 raise
-            error_code = _extract_error_code(exc)
-            if error_code == "insufficient_quota" and attempt >= max_retries - 2:
-                raise
-            delay = base_delay * (2**attempt)
-            logging.warning("API 429 응답. %.1f초 후 재시도합니다.", delay, exc_info=exc)
-            time.sleep(delay)
-    return ""
+            await asyncio.sleep(delay)
+    return "", 0
 
 
-def generate_chat_answer(message: str) -> tuple[str, str]:
-    if not settings.openai_api_key:
-        return (
-            "OPENAI_API_KEY가 설정되지 않았습니다. 관리자에게 문의해주세요.",
-            "OpenAI API 키 미설정",
-        )
+async def _astream_chatgpt(
+    messages: list[dict[str, str]],
+    max_retries: int = 5,
+    base_delay: float = 1.0,
+    timeout: float | None = None,
+    usage: dict[str, int] | None = None,
+) -> AsyncIterator[str]:
+    # 429는 첫 토큰을 받기 전(요청 생성 시점)에만 발생하므로 재시도도 그 구간에서만 한다.
+    client = _async_client()
+    for attempt in range(max_retries + 1):
+        try:
+            stream = await client.chat.completions.create(
+                model=settings.openai_model,
+                messages=messages,
+                temperature=LLM_TEMPERATURE,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=call_timeout(timeout),
+            )
+            break
+        except APIStatusError as exc:
+            delay = _retry_delay(exc, attempt, max_retries, base_delay)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+    else:
+        return
+    async for chunk in stream:
+        tokens = _record_response_usage(chunk.usage)
+        if tokens and usage is not None:
+            usage["total_tokens"] = tokens
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def _retrieve_chunks(message: str) -> list:
+    try:
+        return get_retrieval_service().search(message, top_k=settings.rag_top_k)
+    except Exception:
+        logging.exception("문서 검색 중 오류 발생")
+        return []
+
 
+def _chat_messages(message: str) -> tuple[list[dict[str, str]], list]:
     system_prompt = (
         "당신은 '스포츠과학 전문가'입니다. 답변 첫 줄은 반드시 '스포츠과학 전문가:'로 시작하십시오. "
         "한국어로 전문적이고 성의 있게 답변해야 합니다. "
@@ -197,13 +397,29 @@ def generate_chat_answer(message: str) -> tuple[str, str]:
         "추가 확인이 필요하다고 안내하십시오. "
         "링크는 클릭 가능한 URL 형태로 제공하고, 마지막 줄에 '출처:' 형식으로 정리하십시오."
     )
+    chunks = _retrieve_chunks(message) if settings.rag_chat_enabled else []
+    if chunks:
+        return build_rag_messages(message, chunks), chunks
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": message},
     ]
-    try:
-        content = _call_chatgpt(messages)
-    except (RateLimitError, APIStatusError) as exc:
+    return messages, chunks
+
+
+def _finalize_chat_answer(content: str, chunks: list) -> tuple[str, str]:
+    answer, reference = _split_reference(content)
+    if chunks:
+        # 검색 문서가 곧 출처이므로 외부 링크 확인 없이 문서 경로를 그대로 돌려준다.
+        return _strip_markdown(answer), format_rag_references(chunks)
+    if reference is not None:
+        filtered_reference = _filter_references(reference.strip())
+        return _strip_markdown(answer), filtered_reference or "출처 정보 없음"
+    return _strip_markdown(content), "출처 정보 없음"
+
+
+def _chat_failure(messages: list[dict[str, str]], exc: Exception) -> tuple[str, str]:
+    if isinstance(exc, (RateLimitError, APIStatusError)):
         issue_path = _log_issue(
             "chat_rate_limit",
             messages=messages,
@@ -211,35 +427,105 @@ def generate_chat_answer(message: str) -> tuple[str, str]:
             metadata={"error_code": _extract_error_code(exc)},
         )
         logging.exception("ChatGPT 호출 중 429/Rate limit 발생 (로그: %s)", issue_path)
-        return ("요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", "")
-    except Exception as exc:
+    else:
         issue_path = _log_issue("chat_error", messages=messages, error=exc)
         logging.exception("ChatGPT 호출 중 오류 발생 (로그: %s)", issue_path)
-        return ("요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", "")
+    return ("요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.", "")
 
-    if "출처:" in content:
-        answer, reference = content.split("출처:", 1)
-        filtered_reference = _filter_references(reference.strip())
-        return _strip_markdown(answer), filtered_reference or "출처 정보 없음"
-    return _strip_markdown(content), "출처 정보 없음"
 
+def _response_cache_namespace() -> str:
+    # RAG 여부에 따라 프롬프트가 달라지므로 모델과 함께 namespace로 나눈다. RAG 답변은 검색한 문서에 따라 달라지므로
+    # 검색 서비스가 읽고 있는 인덱스 버전도 붙여, 인덱스가 바뀌면 이전 버전의 답변을 돌려주지 않는다.
+    if not settings.rag_chat_enabled:
+        return f"{settings.openai_model}:chat"
+    return f"{settings.openai_model}:rag:{get_retrieval_service().current_version()}"
 
-def summarize_chat(content: str, date: datetime) -> str:
+
+def _lookup_cached_answer(message: str) -> tuple[CachedAnswer | None, Any]:
+    cache = get_response_cache()
+    if cache is None:
+        return None, None
+    try:
+        return cache.lookup(_response_cache_namespace(), message)
+    except Exception:
+        logging.exception("응답 캐시 조회 중 오류 발생")
+        return None, None
+
+
+def _store_cached_answer(embedding: Any, answer: str, reference: str, tokens: int) -> None:
+    # 실제로 LLM을 호출해 얻은 답변만 저장하고, 오류 안내 문구는 저장하지 않는다.
+    cache = get_response_cache()
+    if cache is not None and embedding is not None and tokens:
+        cache.store(_response_cache_namespace(), embedding, CachedAnswer(answer, reference, tokens))
+
+
+async def generate_chat_answer(message: str) -> tuple[str, str]:
     if not settings.openai_api_key:
-        return "OPENAI_API_KEY가 설정되지 않아 요약을 생성할 수 없습니다."
+        return (
+            "OPENAI_API_KEY가 설정되지 않았습니다. 관리자에게 문의해주세요.",
+            "OpenAI API 키 미설정",
+        )
+    # 질문 임베딩, 문서 검색, 출처 링크 확인은 블로킹 작업이라 스레드에서 실행한다.
+    cached, embedding = await asyncio.to_thread(_lookup_cached_answer, message)
+    if cached is not None:
+        return cached.answer, cached.reference
+    messages, chunks = await asyncio.to_thread(_chat_messages, message)
+    try:
+        content, tokens = await _acall_chatgpt(messages)
+    except Exception as exc:
+        return _chat_failure(messages, exc)
+    answer, reference = await asyncio.to_thread(_finalize_chat_answer, content, chunks)
+    _store_cached_answer(embedding, answer, reference, tokens)
+    return answer, reference
+
+
+async def stream_chat_answer(message: str) -> AsyncIterator[dict[str, str]]:
+    # 본문 조각은 {"type": "delta"}로 도착하는 대로 내보내고, 마지막 {"type": "done"}에
+    # generate_chat_answer와 같은 규칙으로 정리한 전체 답변과 출처를 담는다.
+    if not settings.openai_api_key:
+        answer, reference = await generate_chat_answer(message)
+        yield {"type": "done", "answer": answer, "reference": reference}
+        return
+    cached, embedding = await asyncio.to_thread(_lookup_cached_answer, message)
+    if cached is not None:
+        yield {"type": "delta", "text": cached.answer}
+        yield {"type": "done", "answer": cached.answer, "reference": cached.reference}
+        return
+    messages, chunks = await asyncio.to_thread(_chat_messages, message)
+    cleaner = MarkdownStreamCleaner()
+    usage: dict[str, int] = {}
+    try:
+        async for delta in _astream_chatgpt(messages, usage=usage):
+            text = cleaner.feed(delta)
+            if text:
+                yield {"type": "delta", "text": text}
+        text = cleaner.finish()
+        if text:
+            yield {"type": "delta", "text": text}
+    except Exception as exc:
+        answer, reference = _chat_failure(messages, exc)
+        yield {"type": "done", "answer": answer, "reference": reference}
+        return
+    answer, reference = await asyncio.to_thread(_finalize_chat_answer, cleaner.content, chunks)
+    _store_cached_answer(embedding, answer, reference, usage.get("total_tokens", 0))
+    yield {"type": "done", "answer": answer, "reference": reference}
+
+
+def _summary_messages(content: str, date: datetime) -> list[dict[str, str]]:
     system_prompt = (
         "다음 대화 기록을 하루 단위로 요약하세요. 핵심 개념과 학습 포인트만 간결하게 정리하세요."
     )
-    messages = [
+    return [
         {"role": "system", "content": system_prompt},
         {
             "role": "user",
             "content": "날짜: " + str(date.date()) + "\n대화 기록:\n" + content,
         },
     ]
-    try:
-        return _call_chatgpt(messages)
-    except (RateLimitError, APIStatusError) as exc:
+
+
+def _summary_failure(messages: list[dict[str, str]], exc: Exception) -> str:
+    if isinstance(exc, (RateLimitError, APIStatusError)):
         issue_path = _log_issue(
             "summary_rate_limit",
             messages=messages,
@@ -247,14 +533,38 @@ def summarize_chat(content: str, date: datetime) -> str:
             metadata={"error_code": _extract_error_code(exc)},
         )
         logging.exception("요약 생성 중 429/Rate limit 발생 (로그: %s)", issue_path)
-        return "요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
-    except Exception as exc:
+    else:
         issue_path = _log_issue("summary_error", messages=messages, error=exc)
         logging.exception("요약 생성 중 오류 발생 (로그: %s)", issue_path)
-        return "요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+    return "요청을 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+
+
+def summarize_chat(content: str, date: datetime) -> str:
+    if not settings.openai_api_key:
+        return "OPENAI_API_KEY가 설정되지 않아 요약을 생성할 수 없습니다."
+    messages = _summary_messages(content, date)
+    try:
+        summary, _ = _call_chatgpt(messages, timeout=settings.openai_long_timeout_seconds, use_cache=True)
+        return summary
+    except Exception as exc:
+        return _summary_failure(messages, exc)
+
+
+async def asummarize_chat(content: str, date: datetime) -> str:
+    if not settings.openai_api_key:
+        return "OPENAI_API_KEY가 설정되지 않아 요약을 생성할 수 없습니다."
+    messages = _summary_messages(content, date)
+    try:
+        summary, _ = await _acall_chatgpt(
+            messages, timeout=settings.openai_long_timeout_seconds, use_cache=True
+        )
+        return summary
+    except Exception as exc:
+        return _summary_failure(messages, exc)
 
 
-def generate_quiz(summary: str) -> list[dict]:
+def generate_quiz(summary: str, use_cache: bool = True) -> list[dict]:
+    # 같은 요약으로 다시 만들 때(중복 문제 재시도 등)는 use_cache=False로 새 응답을 받는다.
     if not settings.openai_api_key:
         return [
             {
@@ -290,7 +600,7 @@ def generate_quiz(summary: str) -> list[dict]:
         {"role": "user", "content": summary},
     ]
     try:
-        content = _call_chatgpt(messages)
+        content, _ = _call_chatgpt(messages, timeout=settings.openai_long_timeout_seconds, use_cache=use_cache)
     except (RateLimitError, APIStatusError) as exc:
         issue_path = _log_issue(
             "quiz_rate_limit",
@@ -329,6 +639,8 @@ def generate_quiz(summary: str) -> list[dict]:
     payloads = _extract_quiz_payloads(content)
     if not payloads:
         _log_issue("quiz_response_parse", messages=messages, response=content)
+        if use_cache:
+            _discard_cached_prompt(messages)
         return [
             {
                 "question": content.strip(),
@@ -6,6 +6,18 @@ import { authorizedFetch } from '../api'
 import { API_BASE_URL } from '../config'
 import { useAdminStatus } from '../hooks/useAdminStatus'
 
+type LlmCacheStats = {
+  name: string
+  entries: number
+  capacity: number
+  hits: number
+  misses: number
+  evictions: number
+  expirations: number
+  tokens_saved: number
+  hit_rate: number
+}
+
 type LlmUsageResponse = {
   provider: string
   model: string
@@ -15,6 +27,7 @@ type LlmUsageResponse = {
   prompt_tokens: number
   completion_tokens: number
   last_updated: string | null
+  caches?: LlmCacheStats[]
 }
 
 const AdminLlmTokensPage = () => {
@@ -152,6 +165,29 @@ const AdminLlmTokensPage = () => {
           </div>
         </div>
       </div>
+
+      {usage?.caches?.map((cache) => (
+        <div className="card admin-token-bar" key={cache.name}>
+          <div className="admin-token-bar-header">
+            <span>응답 캐시 ({cache.name})</span>
+            <span>{`${Math.round(cache.hit_rate * 100)}%`}</span>
+          </div>
+          <div className="admin-token-breakdown">
+            <div>
+              <span className="admin-token-label">적중 / 미적중</span>
+              <strong>{`${formatTokens(cache.hits)} / ${formatTokens(cache.misses)}`}</strong>
+            </div>
+            <div>
+              <span className="admin-token-label">절감 토큰</span>
+              <strong>{formatTokens(cache.tokens_saved)}</strong>
+            </div>
+            <div>
+              <span className="admin-token-label">저장 항목</span>
+              <strong>{`${formatTokens(cache.entries)} / ${formatTokens(cache.capacity)}`}</strong>
+            </div>
+          </div>
+        </div>
+      ))}
     </section>
   )
 }
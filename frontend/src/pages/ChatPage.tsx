@@ -20,6 +20,21 @@ type ChatHistoryDatesResponse = {
   today: string
 }
 
+type ChatStreamEvent = {
+  event: string
+  data: Record<string, string>
+}
+
+const parseSseEvent = (block: string): ChatStreamEvent => {
+  let event = 'message'
+  const dataLines: string[] = []
+  block.split('\n').forEach((line) => {
+    if (line.startsWith('event:')) event = line.slice(6).trim()
+    else if (line.startsWith('data:')) dataLines.push(line.slice(5).trimStart())
+  })
+  return { event, data: dataLines.length ? JSON.parse(dataLines.join('\n')) : {} }
+}
+
 const ChatPage = () => {
   const [message, setMessage] = useState('')
   const [entries, setEntries] = useState<ChatEntry[]>([])
@@ -103,26 +118,58 @@ const ChatPage = () => {
     if (today && !historySummaries[today]) {
       setHistorySummaries((prev) => ({ ...prev, [today]: message }))
     }
+    let streamStarted = false
+    const updateAnswer = (content: string) =>
+      setEntries((prev) => [...prev.slice(0, -1), { role: 'gpt', content }])
     try {
-      const response = await authorizedFetch(`${API_BASE_URL}/chat/ask`, {
+      // 답변 조각(delta)을 받는 대로 말풍선에 이어 붙이고, 마지막 done 이벤트의 정리된 답변으로 교체한다.
+      const response = await authorizedFetch(`${API_BASE_URL}/chat/ask/stream`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({ message }),
       })
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
+        throw new Error('답변을 불러오지 못했습니다.')
+      }
+      setEntries((prev) => [...prev, { role: 'gpt', content: '' }])
+      streamStarted = true
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ''
+      let streamed = ''
+      let finished = false
+      while (!finished) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+        let boundary = buffer.indexOf('\n\n')
+        while (boundary !== -1) {
+          const { event, data } = parseSseEvent(buffer.slice(0, boundary))
+          buffer = buffer.slice(boundary + 2)
+          if (event === 'delta') {
+            streamed += data.text
+            updateAnswer(streamed)
+          } else if (event === 'done') {
+            updateAnswer(`${data.answer}\n출처: ${data.reference}`)
+            finished = true
+          } else if (event === 'error') {
+            throw new Error(data.detail)
+          }
+          boundary = buffer.indexOf('\n\n')
+        }
+      }
+      if (!finished) {
         throw new Error('답변을 불러오지 못했습니다.')
       }
-      const data = await response.json()
-      setEntries((prev) => [...prev, { role: 'gpt', content: `${data.answer}\n출처: ${data.reference}` }])
       if (today && !historyDates.includes(today)) {
         setHistoryDates((prev) => [today, ...prev])
       }
     } catch (error) {
       setErrorMessage('오류가 발생했습니다. 로그인 상태를 확인해주세요.')
       setEntries((prev) => [
-        ...prev,
+        ...(streamStarted ? prev.slice(0, -1) : prev),
         { role: 'gpt', content: '오류가 발생했습니다. 다시 시도해주세요.' },
       ])
     } finally {